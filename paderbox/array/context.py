@@ -3,57 +3,159 @@ import numpy as np
 from paderbox.array.rearrange import tbf_to_tbchw
 
 
-def stack_context(X, left_context=0, right_context=0, step_width=1):
+def stack_context(X, left_context=0, right_context=0, step_width=1,
+                  pad_mode='symmetric', pad_kwargs=None):
     """ Stack TxBxF format with left and right context.
 
     There is a notebook, which illustrates this feature with many details in
     the example notebooks repository.
 
+    The stacked features are a read-only view (stride tricks) on the padded
+    data in BxTxF layout, i.e. the memory does not grow with the context
+    size. At most one copy of X is made (for the padding or the layout, see
+    `_pad_time_axis`). Copy the result, if you need a writeable array.
+
+    >>> X = np.arange(12).reshape(4, 1, 3)
+    >>> stack_context(X, 1, 1)[:, 0]
+    array([[ 0,  1,  2,  0,  1,  2,  3,  4,  5],
+           [ 0,  1,  2,  3,  4,  5,  6,  7,  8],
+           [ 3,  4,  5,  6,  7,  8,  9, 10, 11],
+           [ 6,  7,  8,  9, 10, 11,  9, 10, 11]])
+    >>> stack_context(X, 1, 0, step_width=2)[:, 0]
+    array([[0, 1, 2, 0, 1, 2],
+           [3, 4, 5, 6, 7, 8]])
+    >>> X = np.random.normal(size=(100, 4, 20))
+    >>> stack_context(X, 5, 5).shape
+    (100, 4, 220)
+    >>> Y = np.random.normal(size=(4, 100, 20)).transpose(1, 0, 2)
+    >>> np.shares_memory(stack_context(Y, step_width=2), Y)  # No copy
+    True
+
     :param X: Data with TxBxF format.
     :param left_context: Length of left context.
     :param right_context: Length of right context.
     :param step_width: Step width.
+    :param pad_mode: Mode for padding. See :numpy.pad for details
+    :param pad_kwargs: Kwargs for pad call
     :return: Stacked features with symmetric padding and head and tail.
     """
-    X_stacked = tbf_to_tbchw(
+    if pad_kwargs is None:
+        pad_kwargs = dict()
+    X = np.asarray(X)
+    T, B, F = X.shape
+
+    # B x T x F layout, then the context of one frame is contiguous.
+    X = X.transpose(1, 0, 2)
+    if left_context or right_context:
+        X = _pad_time_axis(
+            X, left_context, right_context, pad_mode, pad_kwargs)
+    else:
+        X = np.ascontiguousarray(X)
+
+    window_size = left_context + right_context + 1
+    frames = max((X.shape[1] - window_size) // step_width + 1, 0)
+    item = X.itemsize
+    return np.lib.stride_tricks.as_strided(
         X,
-        left_context=left_context,
-        right_context=right_context,
-        step_width=step_width
-    )[:, :, 0, :].transpose((0, 1, 3, 2))
+        shape=(frames, B, window_size * F),
+        strides=(step_width * F * item, X.shape[1] * F * item, item),
+        writeable=False,
+    )
 
-    T, B, F, W = X_stacked.shape
-    X_stacked = X_stacked.reshape(T, B, F * W)
 
-    return X_stacked
+def _pad_time_axis(X, left, right, pad_mode, pad_kwargs):
+    """
+    Same as np.pad of the B x T x F array X along the T axis, but the result
+    is always C-contiguous. np.pad keeps a Fortran order (e.g. for a Fortran
+    ordered X with B == 1), then np.ascontiguousarray would be a second copy.
+    Hence, for the modes, that depend only on the values close to the
+    border, X is copied once into a C-contiguous array and only the
+    borders are padded separately.
+
+    >>> X = np.asfortranarray(np.arange(12).reshape(1, 6, 2))
+    >>> padded = _pad_time_axis(X, 2, 1, 'symmetric', {})
+    >>> padded.flags.c_contiguous
+    True
+    >>> np.testing.assert_equal(
+    ...     padded, np.pad(X, ((0, 0), (2, 1), (0, 0)), mode='symmetric'))
+    """
+    pad_width = ((0, 0), (left, right), (0, 0))
+    B, T, F = X.shape
+    margin = left + right + 1
+    if (
+            X.flags.c_contiguous or not X.flags.f_contiguous
+            or pad_mode not in ['constant', 'edge', 'reflect', 'symmetric']
+            or T <= 2 * margin
+    ):
+        # np.pad allocates a C-contiguous array or X is short.
+        return np.ascontiguousarray(
+            np.pad(X, pad_width, mode=pad_mode, **pad_kwargs))
+
+    padded = np.empty((B, left + T + right, F), dtype=X.dtype)
+    padded[:, left:left + T] = X
+    padded[:, :left] = np.pad(
+        X[:, :margin], ((0, 0), (left, 0), (0, 0)),
+        mode=pad_mode, **pad_kwargs,
+    )[:, :left]
+    padded[:, left + T:] = np.pad(
+        X[:, T - margin:], ((0, 0), (0, right), (0, 0)),
+        mode=pad_mode, **pad_kwargs,
+    )[:, margin:]
+    return padded
 
 
 def unstack_context(X, mode, left_context=0, right_context=0, step_width=1):
     """ Unstacks stacked features.
 
-    This only works in special cases. Right now, only mode='center'
-    is supported. It will return just the center frame and drop the remaining
-    parts.
-
-    Other options are related to combining overlapping context frames.
+    Supported modes:
+     - 'center': Returns just the center frame of each context window and
+       drops the remaining parts (a view). With a step_width larger than
+       one, only every step_width-th frame is returned.
+     - 'mean': Combines the overlapping context frames, i.e. each frame is
+       the mean of all its copies in the context windows. The frames of the
+       padding are dropped. Needs a step_width, that is not larger than the
+       context length.
+
+    >>> X = np.random.normal(size=(10, 2, 3))
+    >>> stacked = stack_context(X, 2, 1)
+    >>> np.testing.assert_equal(unstack_context(stacked, 'center', 2, 1), X)
+    >>> np.testing.assert_allclose(unstack_context(stacked, 'mean', 2, 1), X)
+    >>> stacked = stack_context(X, 2, 1, step_width=3)
+    >>> unstack_context(stacked, 'mean', 2, 1, step_width=3).shape
+    (10, 2, 3)
 
     :param X: Stacked features (or output of your network)
-    :param X: mode
+    :param mode: 'center' or 'mean'
     :param left_context: Length of left context.
     :param right_context: Length of right context.
     :param step_width: Step width.
     :return: Data with TxBxF format.
     """
 
-    assert step_width == 1
     context_length = left_context + 1 + right_context
     assert X.shape[2] % context_length == 0
     F = X.shape[2] // context_length
 
     if mode == 'center':
         return X[:, :, left_context * F:(left_context + 1) * F]
+    elif mode == 'mean':
+        assert step_width <= context_length, (step_width, context_length)
+        frames, B, _ = X.shape
+        if frames == 0:
+            return np.zeros((0, B, F), dtype=X.dtype)
+        padded_frames = (frames - 1) * step_width + context_length
+        stop = (frames - 1) * step_width + 1
+        # Keep the precision of floating point input, as np.mean.
+        dtype = X.dtype if X.dtype.kind in 'fc' else np.dtype(np.float64)
+        summed = np.zeros((padded_frames, B, F), dtype=dtype)
+        counts = np.zeros((padded_frames, 1, 1), dtype=summed.real.dtype)
+        for w in range(context_length):
+            summed[w:w + stop:step_width] += X[:, :, w * F:(w + 1) * F]
+            counts[w:w + stop:step_width] += 1
+        return (summed / counts)[
+            left_context:padded_frames - right_context]
     else:
-        NotImplementedError(
+        raise NotImplementedError(
             'All other unstack methods are not yet implemented.'
         )
 
@@ -74,7 +176,6 @@ def add_context(data, left_context=0, right_context=0, step=1,
         data = stack_context(data, left_context=left_context,
                              right_context=right_context, step_width=step)
         if not sequence_output:
-            data = np.concatenate(
-                [data[:, i, ...].reshape((-1, data.shape[-1])) for
-                 i in range(data.shape[1])], axis=0)
+            # Same as the concatenation of the batches, but with one copy.
+            data = data.transpose(1, 0, 2).reshape((-1, data.shape[-1]))
     return data
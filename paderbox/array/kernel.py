@@ -1,3 +1,5 @@
+import dataclasses
+import heapq
 import typing
 import numpy as np
 import paderbox as pb
@@ -11,6 +13,7 @@ __all__ = [
     'min_kernel',
     'mean_kernel',
     'median_kernel',
+    'StreamingMedianKernel1d',
 ]
 
 
@@ -94,6 +97,12 @@ def np_kernel1d(
     '▄██▄'
     '  ▄█'
 
+    For max and min kernels (np.amax, np.max, np.amin, np.min) the
+    van Herk/Gil-Werman algorithm is used, hence the cost is independent of
+    the kernel size (see `_running_max_min`). For np.median of real values
+    and large kernels (see `_running_median_min_kernel_size`) a running
+    median is used (see `_running_median`).
+
     """
     assert kernel_size % 2 == 1, (kernel_size, 'kernel size has to be odd.')
     assert pad_position in ['pre', 'post', None], pad_position
@@ -103,13 +112,37 @@ def np_kernel1d(
         # axis for segment_axis and kernel
         axis = axis - x.ndim
 
+    if pad_position == 'pre' and not (
+            kernel in _running_max_min_ufuncs
+            or _use_running_median(x, kernel, kernel_size)
+    ) and padding_mode in ['constant', 'edge', 'reflect', 'symmetric']:
+        # Pad only the first and last frames instead of a copy of x.
+        shift = kernel_size // 2
+        parts = pb.array.segment_axis_parts(
+            x, kernel_size, 1, axis=axis, end='pad', pad_mode=padding_mode,
+            pad_width=(shift, shift),
+        )
+        return np.concatenate(
+            [kernel(p, axis=axis) for p in parts if p.shape[axis - 1] > 0],
+            axis=axis,
+        )
+
     if pad_position == 'pre':
         shift = kernel_size // 2
         x = pb.array.pad_axis(x, (shift, shift), axis=axis, mode=padding_mode)
 
-    y = kernel(
-        pb.array.segment_axis(x, kernel_size, 1, axis=axis, end='pad'),
-        axis=axis)
+    if kernel in _running_max_min_ufuncs and x.shape[axis] >= kernel_size:
+        y = _running_max_min(
+            x, kernel_size, axis=axis, ufunc=_running_max_min_ufuncs[kernel])
+    elif (
+            _use_running_median(x, kernel, kernel_size)
+            and x.shape[axis] >= kernel_size
+    ):
+        y = _running_median(x, kernel_size, axis=axis)
+    else:
+        y = kernel(
+            pb.array.segment_axis(x, kernel_size, 1, axis=axis, end='pad'),
+            axis=axis)
 
     if pad_position == 'post':
         shift = kernel_size // 2
@@ -117,6 +150,397 @@ def np_kernel1d(
     return y
 
 
+def _running_max_min(x, kernel_size, *, axis=-1, ufunc=np.maximum):
+    """
+    Running maximum (or minimum) without padding with the van Herk/Gil-Werman
+    algorithm, i.e. `y[i] = max(x[i:i + kernel_size])` for all windows that
+    fit into x.
+
+    The signal is split into blocks of kernel_size. Each window covers the
+    end of one block and the beginning of the next block, hence the result
+    is the maximum of a backward cumulative maximum (within the blocks) and
+    a forward cumulative maximum (within the blocks). The cost is O(n),
+    independent of the kernel size.
+
+    Args:
+        x: np.array with `x.shape[axis] >= kernel_size`.
+        kernel_size:
+        axis:
+        ufunc: np.maximum or np.minimum
+
+    Returns:
+        np.array with `x.shape[axis] - kernel_size + 1` values along axis.
+
+    >>> a = np.array([3, 1, 4, 1, 5, 9, 2, 6, 5])
+    >>> _running_max_min(a, 3)
+    array([4, 4, 5, 9, 9, 9, 6])
+    >>> _running_max_min(a, 3, ufunc=np.minimum)
+    array([1, 1, 1, 1, 2, 2, 2])
+    >>> _running_max_min(np.stack([a, -a]), 5, axis=-1)
+    array([[ 5,  9,  9,  9,  9],
+           [-1, -1, -1, -1, -2]])
+    """
+    x = np.moveaxis(np.asarray(x), axis, -1)
+    size = x.shape[-1]
+    assert size >= kernel_size, (size, kernel_size)
+
+    blocks = -(-size // kernel_size)
+    # The padded values are never used for a window that fits into x.
+    x = pb.array.pad_axis(
+        x, (0, blocks * kernel_size - size), axis=-1, mode='edge')
+    x = x.reshape(*x.shape[:-1], blocks, kernel_size)
+
+    forward = ufunc.accumulate(x, axis=-1).reshape(*x.shape[:-2], -1)
+    backward = ufunc.accumulate(x[..., ::-1], axis=-1)[..., ::-1]
+    backward = backward.reshape(*x.shape[:-2], -1)
+
+    valid = size - kernel_size + 1
+    y = ufunc(
+        backward[..., :valid],
+        forward[..., kernel_size - 1:kernel_size - 1 + valid],
+    )
+    return np.moveaxis(y, -1, axis)
+
+
+_running_max_min_ufuncs = {
+    np.amax: np.maximum,
+    np.max: np.maximum,
+    np.amin: np.minimum,
+    np.min: np.minimum,
+}
+
+
+# The running median is a Python loop with a cost that grows slowly with the
+# kernel size, while the median of a segment_axis view is vectorized but
+# grows linearly. Below this kernel size the vectorized median is faster
+# (see scripts/benchmark_median_kernel.py).
+_running_median_min_kernel_size = 161
+
+
+def _use_running_median(x, kernel, kernel_size):
+    return (
+        kernel is np.median
+        and x.dtype.kind in 'biuf'
+        and kernel_size >= _running_median_min_kernel_size
+    )
+
+
+def _median_dtype(dtype):
+    # Same as np.median: floats keep their precision, everything else is
+    # float64.
+    return dtype if dtype.kind == 'f' else np.dtype(np.float64)
+
+
+class _MedianWindow:
+    """
+    Multiset of real values, that supports the insertion and the removal of
+    a value with O(log(size)) comparisons and the median in O(1).
+
+    The smaller half of the values is kept in a max-heap (`_low`, negated
+    values) and the larger half in a min-heap (`_high`), so that the median
+    is the top of `_low`, when the size is odd. A removed value is only
+    counted in `_removed` and dropped from the heap, when it reaches the top
+    (lazy deletion). When the heaps contain more removed than valid values,
+    they are rebuilt, hence the heaps stay in O(size).
+
+    NaNs are only counted, because they have no order. As with np.median,
+    the median is NaN, when a NaN is in the window.
+
+    >>> window = _MedianWindow([3, 1, 4, 1, 5])
+    >>> window.median()
+    3
+    >>> window.remove(3)
+    >>> window.insert(9)
+    >>> window.median()
+    4
+    >>> window.insert(float('nan'))
+    >>> window.remove(1)
+    >>> window.median()
+    nan
+    >>> len(window)
+    4
+    """
+    def __init__(self, values=()):
+        self._low = []
+        self._high = []
+        self._low_size = 0
+        self._high_size = 0
+        self._removed = {}
+        self.nans = 0
+        for value in values:
+            self.insert(value)
+
+    def __len__(self):
+        """Number of values without the NaNs."""
+        return self._low_size + self._high_size
+
+    def _prune(self, heap, sign):
+        # Drops the removed values from the top of the heap.
+        removed = self._removed
+        while heap:
+            value = sign * heap[0]
+            count = removed.get(value, 0)
+            if count == 0:
+                return
+            if count == 1:
+                del removed[value]
+            else:
+                removed[value] = count - 1
+            heapq.heappop(heap)
+
+    def _balance(self):
+        # Keeps _low_size == _high_size or _low_size == _high_size + 1.
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._low_size += 1
+            self._high_size -= 1
+            self._prune(self._high, 1)
+
+    def _rebuild(self):
+        removed = self._removed
+        values = []
+        for value in sorted([-v for v in self._low] + self._high):
+            count = removed.get(value, 0)
+            if count == 0:
+                values.append(value)
+            elif count == 1:
+                del removed[value]
+            else:
+                removed[value] = count - 1
+        self._low_size = (len(values) + 1) // 2
+        self._high_size = len(values) - self._low_size
+        # Sorted lists are valid heaps.
+        self._low = [-v for v in reversed(values[:self._low_size])]
+        self._high = values[self._low_size:]
+
+    def insert(self, value):
+        if value != value:
+            self.nans += 1
+        elif not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+            self._balance()
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+            self._balance()
+
+    def remove(self, value):
+        """Removes a value, that has been inserted before."""
+        if value != value:
+            self.nans -= 1
+            return
+        self._removed[value] = self._removed.get(value, 0) + 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            self._prune(self._low, -1)
+        else:
+            self._high_size -= 1
+            self._prune(self._high, 1)
+        self._balance()
+        if len(self._low) + len(self._high) > 2 * len(self) + 16:
+            self._rebuild()
+
+    def median(self):
+        """The median, if the number of values (without NaNs) is odd."""
+        if self.nans:
+            return float('nan')
+        return -self._low[0]
+
+
+def _running_median_core(values, kernel_size, window):
+    """
+    Slides a window over the list `values` and returns the medians of all
+    windows that fit into `values`.
+
+    `window` is the _MedianWindow of the values `values[:kernel_size - 1]`.
+    It is updated inplace, afterwards it contains the last `kernel_size - 1`
+    values. Each step needs O(log kernel_size) comparisons. The kernel size
+    is odd, hence the median is an element of the window and the result is
+    exact.
+    """
+    insert = window.insert
+    remove = window.remove
+    median = window.median
+    medians = []
+    append = medians.append
+    for old, new in zip(values, values[kernel_size - 1:]):
+        insert(new)
+        append(median())
+        remove(old)
+    return medians
+
+
+def _running_median(x, kernel_size, *, axis=-1):
+    """
+    Running median without padding, i.e.
+    `y[i] = np.median(x[i:i + kernel_size])` for all windows that fit into
+    x. In contrast to the median of a segment_axis view, the cost grows only
+    slowly with the kernel size (see `_running_median_core`) and only one
+    window per channel is kept in memory. Because of the Python loop, it is
+    only faster for large kernel sizes.
+
+    Args:
+        x: Real valued np.array with `x.shape[axis] >= kernel_size`.
+        kernel_size: An odd number.
+        axis:
+
+    Returns:
+        np.array with `x.shape[axis] - kernel_size + 1` values along axis.
+
+    >>> a = np.array([3, 1, 4, 1, 5, 9, 2, 6, 5])
+    >>> _running_median(a, 3)
+    array([3., 1., 4., 5., 5., 6., 5.])
+    >>> _running_median(np.stack([a, -a], axis=-1), 5, axis=0)
+    array([[ 3., -3.],
+           [ 4., -4.],
+           [ 4., -4.],
+           [ 5., -5.],
+           [ 5., -5.]])
+    >>> _running_median(np.array([1., np.nan, 3., 4., 5.]), 3)
+    array([nan, nan,  4.])
+    """
+    assert kernel_size % 2 == 1, (kernel_size, 'kernel size has to be odd.')
+    x = np.moveaxis(np.asarray(x), axis, -1)
+    size = x.shape[-1]
+    assert size >= kernel_size, (size, kernel_size)
+
+    y = np.empty((*x.shape[:-1], size - kernel_size + 1),
+                 dtype=_median_dtype(x.dtype))
+    y_rows = y.reshape(-1, y.shape[-1])
+    for index, values in enumerate(x.reshape(-1, size).tolist()):
+        window = _MedianWindow(values[:kernel_size - 1])
+        y_rows[index] = _running_median_core(values, kernel_size, window)
+    return np.moveaxis(y, -1, axis)
+
+
+@dataclasses.dataclass()
+class StreamingMedianKernel1d:
+    """
+    Stateful median kernel for signals that arrive in chunks along the last
+    axis (e.g. frame level posteriors of a live stream).
+
+    Each call consumes an arbitrary number of new samples and returns the
+    medians of all windows that are completed by these samples. Only the
+    last `kernel_size - 1` samples (and their _MedianWindow) are kept as
+    state, each sample costs O(log(kernel_size)) comparisons (see
+    `_running_median_core`).
+
+    The concatenation of all returned values (including `flush`) is the same
+    as `median_kernel1d` (or `np_kernel1d` with `kernel=np.median` and
+    `pad_position='pre'`) applied to the concatenated chunks.
+
+    Args:
+        kernel_size: An odd number.
+        padding_mode: 'edge' (default of median_kernel1d), 'constant' (zero
+            padding, the same as `pb.transform.module_filter.median`) or
+            None (no padding, i.e. `pad_position=None`). Modes that need
+            future samples (e.g. 'reflect') are not supported.
+
+    >>> x = np.random.normal(size=(2, 100))
+    >>> streaming_median = StreamingMedianKernel1d(5)
+    >>> y = [streaming_median(c) for c in np.split(x, [1, 3, 50], axis=-1)]
+    >>> [y_.shape for y_ in y]
+    [(2, 0), (2, 1), (2, 47), (2, 50)]
+    >>> y.append(streaming_median.flush())
+    >>> y[-1].shape
+    (2, 2)
+    >>> np.testing.assert_equal(
+    ...     np.concatenate(y, axis=-1), median_kernel1d(x, 5))
+    """
+    kernel_size: int
+    padding_mode: 'typing.Literal["edge", "constant", None]' = 'edge'
+
+    def __post_init__(self):
+        assert self.kernel_size % 2 == 1, (
+            self.kernel_size, 'kernel size has to be odd.')
+        assert self.padding_mode in ['edge', 'constant', None], (
+            self.padding_mode)
+        self.reset()
+
+    def reset(self):
+        """Drops the buffered samples, i.e. starts a new signal."""
+        self._shape = None
+        self._dtype = None
+        # For each channel: The last kernel_size - 1 samples and their
+        # _MedianWindow.
+        self._history = None
+        self._windows = None
+
+    def _push(self, rows):
+        k = self.kernel_size
+        medians = []
+        for index, new in enumerate(rows):
+            history = self._history[index]
+            values = history + new
+            fill = min(len(values), k - 1) - len(history)
+            for value in new[:max(fill, 0)]:
+                self._windows[index].insert(value)
+            if len(values) >= k:
+                m = _running_median_core(values, k, self._windows[index])
+            else:
+                m = []
+            medians.append(m)
+            self._history[index] = values[max(len(values) - (k - 1), 0):]
+        return np.array(medians, dtype=self._dtype).reshape(*self._shape, -1)
+
+    def __call__(self, chunk):
+        """
+        Args:
+            chunk: Real valued chunk with shape (..., samples). The leading
+                dimensions have to be the same for all chunks of a signal.
+
+        Returns:
+            Medians of the windows that are completed by this chunk with
+            shape (..., frames).
+
+        """
+        chunk = np.asarray(chunk)
+        channels = int(np.prod(chunk.shape[:-1]))
+        rows = chunk.reshape(channels, chunk.shape[-1]).tolist()
+        if self._history is None:
+            if chunk.shape[-1] == 0:
+                return np.zeros((*chunk.shape[:-1], 0),
+                                dtype=_median_dtype(chunk.dtype))
+            self._shape = chunk.shape[:-1]
+            self._dtype = _median_dtype(chunk.dtype)
+            self._history = [[] for _ in rows]
+            self._windows = [_MedianWindow() for _ in rows]
+            half = self.kernel_size // 2
+            if self.padding_mode == 'edge':
+                rows = [[row[0]] * half + row for row in rows]
+            elif self.padding_mode == 'constant':
+                rows = [[0] * half + row for row in rows]
+        return self._push(rows)
+
+    def flush(self):
+        """
+        Signals the end of the signal and returns the remaining medians (i.e.
+        the medians of the padded end). Afterwards, the object is reset.
+
+        Returns:
+            Medians with shape (..., frames).
+
+        """
+        if self._history is None:
+            return np.zeros((0,))
+        half = self.kernel_size // 2
+        if self.padding_mode == 'edge' and half > 0:
+            rows = [[history[-1]] * half for history in self._history]
+        elif self.padding_mode == 'constant' and half > 0:
+            rows = [[0] * half for _ in self._history]
+        else:
+            rows = [[] for _ in self._history]
+        medians = self._push(rows)
+        self.reset()
+        return medians
+
+
 def _ai_dilate_erode(ai, khalf):
     """
 
@@ -181,7 +605,14 @@ def ai_erode(ai, kernel_size):
     return _ai_dilate_erode(ai, -(kernel_size//2))
 
 
-def max_kernel1d(x, kernel_size):
+def max_kernel1d(
+        x,
+        kernel_size,
+        *,
+        axis=-1,
+        padding_mode='edge',
+        pad_position='pre',
+):
     """
     Apply a max kernel to x.
     In case of a boolean arrays, this operation is known as dilation.
@@ -192,14 +623,24 @@ def max_kernel1d(x, kernel_size):
     '   ██████   '
     """
     if isinstance(x, np.ndarray):
-        return np_kernel1d(x, kernel_size, kernel=np.amax)
+        return np_kernel1d(
+            x, kernel_size, kernel=np.amax, axis=axis,
+            padding_mode=padding_mode, pad_position=pad_position,
+        )
     elif hasattr(x, 'normalized_intervals'):
         return ai_dilate(x, kernel_size)
     else:
         raise TypeError(x)
 
 
-def min_kernel1d(x, kernel_size):
+def min_kernel1d(
+        x,
+        kernel_size,
+        *,
+        axis=-1,
+        padding_mode='edge',
+        pad_position='pre',
+):
     """
     Apply a max kernel to x.
     In case of a boolean arrays, this operation is known as dilation.
@@ -210,7 +651,10 @@ def min_kernel1d(x, kernel_size):
     '     ██     '
     """
     if isinstance(x, np.ndarray):
-        return np_kernel1d(x, kernel_size, kernel=np.amin)
+        return np_kernel1d(
+            x, kernel_size, kernel=np.amin, axis=axis,
+            padding_mode=padding_mode, pad_position=pad_position,
+        )
     elif hasattr(x, 'normalized_intervals'):
         return ai_erode(x, kernel_size)
     else:
@@ -232,9 +676,17 @@ def mean_kernel1d(x, kernel_size):
         raise TypeError(x)
 
 
-def median_kernel1d(x, kernel_size):
+def median_kernel1d(
+        x,
+        kernel_size,
+        *,
+        axis=-1,
+        padding_mode='edge',
+        pad_position='pre',
+):
     """
     Apply a median kernel to x.
+    For chunked input see `StreamingMedianKernel1d`.
 
     >>> a = np.array([0, 1, 0, 0, 1, 1, 0, 1, 1, 0, 0, 1, 0,])
     >>> _plot(a); _plot(median_kernel1d(a, 3))
@@ -242,6 +694,12 @@ def median_kernel1d(x, kernel_size):
     '    █████    '
     """
     if isinstance(x, np.ndarray):
-        return np_kernel1d(x, kernel_size, kernel=np.median)
+        if x.shape[axis] == 0 and pad_position != 'post':
+            # np.pad cannot extend an empty axis with the mode 'edge'.
+            return np.zeros(x.shape, dtype=_median_dtype(x.dtype))
+        return np_kernel1d(
+            x, kernel_size, kernel=np.median, axis=axis,
+            padding_mode=padding_mode, pad_position=pad_position,
+        )
     else:
         raise TypeError(x)
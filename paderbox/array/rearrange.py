@@ -1,3 +1,4 @@
+import functools
 import re
 import numpy as np
 from numpy.core.einsumfunc import _parse_einsum_input
@@ -10,6 +11,8 @@ __all__ = [
     'merge_complex_features',
     'tbf_to_tbchw',
     'morph',
+    'compile_morph',
+    'MorphPlan',
 ]
 
 
@@ -76,12 +79,14 @@ def _normalize(op):
     return op
 
 
-def _shrinking_reshape(array, source, target):
-    source, target = source.split(), target.replace(' * ', '*').split()
-
+def _expand_ellipsis(source, target, ndim):
+    """
+    Replaces the ellipsis in source and target (lists of tokens) with unused
+    letters, such that source has ndim tokens.
+    """
     if '...' in source:
         assert '...' in target, (source, target)
-        independent_dims = array.ndim - len(source) + 1
+        independent_dims = ndim - len(source) + 1
         import string
         ascii_letters = [
             s
@@ -92,30 +97,49 @@ def _shrinking_reshape(array, source, target):
         source[index:index + 1] = ascii_letters[:independent_dims]
         index = target.index('...')
         target[index:index + 1] = ascii_letters[:independent_dims]
+    return source, target
 
-    input_shape = {key: array.shape[index] for index, key in enumerate(source)}
 
-    output_shape = []
-    for t in target:
-        product = 1
-        if not t == '1':
-            t = t.split('*')
-            for t_ in t:
-                product *= input_shape[t_]
-        output_shape.append(product)
+def _shrinking_reshape_template(ndim, source, target):
+    """
+    Returns for each output axis the tuple of input axes, that are flattened
+    into this axis (an empty tuple is a new axis with length one).
+
+    >>> _shrinking_reshape_template(3, 'a b c', 'a 1 b*c')
+    ((0,), (), (1, 2))
+    """
+    source, target = source.split(), target.replace(' * ', '*').split()
+    source, target = _expand_ellipsis(source, target, ndim)
 
-    return array.reshape(output_shape)
+    input_axis = {key: index for index, key in enumerate(source)}
 
+    template = []
+    for t in target:
+        if t == '1':
+            template.append(())
+        else:
+            template.append(tuple(input_axis[t_] for t_ in t.split('*')))
+    return tuple(template)
 
-def _expanding_reshape(array, source, target, **shape_hints):
+
+def _expanding_reshape_template(ndim, source, target, shape_hints):
+    """
+    Returns the target shape for the unflatten operations in source. Each
+    entry is an input axis (int), whose length is kept, or a tuple with
+    the length (a value from the shape hints or -1).
+
+    >>> _expanding_reshape_template(2, 'a*b c', 'a b c', {'a': 2})
+    ((2,), (-1,), 1)
+    >>> _expanding_reshape_template(2, 'a c', 'c a', {}) is None
+    True
+    """
 
     try:  # Check number of inputs for unflatten operations
-        assert len(re.sub(r'.\*', '', source.replace(' ', ''))) == array.ndim, \
-            (array.shape, source, target)
+        assert len(re.sub(r'.\*', '', source.replace(' ', ''))) == ndim, \
+            (ndim, source, target)
     except AssertionError:  # Check number of inputs for ellipses operations
         assert len(re.sub(r'(\.\.\.)|(.\*)', '', source.replace(' ', ''))) <= \
-               array.ndim,(array.shape, source, target)
-        
+               ndim, (ndim, source, target)
 
     def _get_source_grouping(source):
         """
@@ -129,89 +153,224 @@ def _expanding_reshape(array, source, target, **shape_hints):
         return groups
 
     if '*' not in source:
-        return array
+        return None
 
     source, target = source.split(), target.replace(' * ', '*').split()
+    source, target = _expand_ellipsis(source, target, ndim)
 
-    if '...' in source:
-        assert '...' in target, (source, target)
-        independent_dims = array.ndim - len(source) + 1
-        import string
-        ascii_letters = [
-            s
-            for s in string.ascii_letters
-            if s not in source and s not in target
-        ]
-        index = source.index('...')
-        source[index:index + 1] = ascii_letters[:independent_dims]
-        index = target.index('...')
-        target[index:index + 1] = ascii_letters[:independent_dims]
-
-    target_shape = []
+    template = []
 
     for axis, group in enumerate(_get_source_grouping(source)):
         if len(group) == 1:
-            target_shape.append(array.shape[axis:axis + 1])
+            template.append(axis)
         else:
             shape_wildcard_remaining = True
             for member in group:
                 if member in shape_hints:
-                    target_shape.append([shape_hints[member]])
+                    template.append((shape_hints[member],))
                 else:
                     if shape_wildcard_remaining:
                         shape_wildcard_remaining = False
-                        target_shape.append([-1])
+                        template.append((-1,))
                     else:
                         raise ValueError('Not enough shape hints provided.')
+    return tuple(template)
+
+
+class _MorphSteps:
+    """The reshape and transpose operations of a MorphPlan for one ndim."""
+    __slots__ = [
+        'expand', 'squeeze', 'reduce_axis', 'transpose', 'einsum', 'shrink']
+
+    def __init__(self, operation, ndim, reduce, shape_hints):
+        source, target = operation.split('->')
+
+        # Expanding reshape
+        self.expand = _expanding_reshape_template(
+            ndim, source, target, shape_hints)
+        if self.expand is not None:
+            ndim = len(self.expand)
+
+        # Initial squeeze
+        squeeze_operation = operation.split('->')[0].split()
+        self.squeeze = tuple([
+            axis
+            for axis, op in reversed(list(enumerate(squeeze_operation)))
+            if op == '1'
+        ])
+        ndim -= len(self.squeeze)
+
+        # Transpose
+        transposition_operation = operation.replace('1', ' ').replace('*', ' ')
+        dummy = np.empty((1,) * ndim)
+        in_shape, out_shape = None, None
+        try:
+            in_shape, out_shape, (dummy, ) = _parse_einsum_input(
+                [transposition_operation.replace(' ', ''), dummy])
+
+            self.reduce_axis = None
+            if len(set(in_shape) - set(out_shape)) > 0:
+                assert reduce is not None, (
+                    'Missing reduce function', reduce, transposition_operation)
+
+                self.reduce_axis = tuple([
+                    i for i, s in enumerate(in_shape) if s not in out_shape])
+                dummy = dummy.squeeze(axis=self.reduce_axis)
+                in_shape = ''.join([s for s in in_shape if s in out_shape])
+
+            # Raises the errors of an invalid operation.
+            np.einsum(f'{in_shape}->{out_shape}', dummy)
+        except ValueError as e:
+            msg = (
+                f'op: {transposition_operation} ({in_shape}->{out_shape}), '
+                f'ndim: {ndim}'
+            )
+
+            if len(e.args) == 1:
+                e.args = (e.args[0] + '\n\n' + msg,)
+            else:
+                print(msg)
+            raise
+
+        if len(set(in_shape)) == len(in_shape) == len(out_shape):
+            self.transpose = tuple([in_shape.index(s) for s in out_shape])
+            if self.transpose == tuple(range(len(out_shape))):
+                self.transpose = None
+            self.einsum = None
+        else:
+            # e.g. a diagonal
+            self.transpose = None
+            self.einsum = f'{in_shape}->{out_shape}'
+
+        # Final reshape
+        self.shrink = _shrinking_reshape_template(
+            len(out_shape),
+            transposition_operation.split('->')[-1],
+            operation.split('->')[-1],
+        )
+        if self.shrink == tuple([(i,) for i in range(len(out_shape))]):
+            self.shrink = None
 
-    target_shape = np.concatenate(target_shape, 0)
-    array = array.reshape(target_shape)
-    return array
 
+class MorphPlan:
+    """
+    Compiled version of `morph`: The operation is parsed once and each call
+    applies only the reshapes and the transpose (i.e. `np.reshape`,
+    `np.squeeze` and `np.transpose`).
+
+    Use `compile_morph` to get a cached plan.
+
+    >>> plan = MorphPlan('t b f -> t b*f')
+    >>> plan
+    MorphPlan('t b f -> t b*f')
+    >>> x = np.ones((4, 3, 2))
+    >>> plan(x).shape
+    (4, 6)
+    >>> plan.apply(x)[1]  # the result is a view on x
+    True
+    >>> MorphPlan('t b f -> b t*f').apply(x)[1]  # the result is a copy
+    False
+    >>> MorphPlan('...f -> ...', reduce=np.sum)(x).shape
+    (4, 3)
+    """
 
-def morph(operation, array, reduce=None, **shape_hints):
-    """ This is an experimental version of a generalized reshape.
-    See test cases for examples.
+    def __init__(self, operation, reduce=None, **shape_hints):
+        self.operation = operation
+        self._operation = _normalize(operation)
+        self.reduce = reduce
+        self.shape_hints = shape_hints
+        # The steps depend on the number of dimensions, when the operation
+        # contains an ellipsis.
+        self._steps = {}
+
+    def __repr__(self):
+        args = [repr(self.operation)]
+        if self.reduce is not None:
+            args.append(f'reduce={self.reduce!r}')
+        args += [f'{k}={v!r}' for k, v in self.shape_hints.items()]
+        return f'{self.__class__.__name__}({", ".join(args)})'
+
+    def __call__(self, array):
+        """
+        Applies the operation to the array.
+
+        Returns:
+            The morphed array. It is a view on the array, when possible (see
+            `apply`).
+        """
+        array = np.asarray(array)
+        try:
+            steps = self._steps[array.ndim]
+        except KeyError:
+            steps = self._steps[array.ndim] = _MorphSteps(
+                self._operation, array.ndim, self.reduce, self.shape_hints)
+
+        if steps.expand is not None:
+            shape = array.shape
+            array = array.reshape([
+                shape[e] if e.__class__ is int else e[0]
+                for e in steps.expand
+            ])
+        if steps.squeeze:
+            array = array.squeeze(axis=steps.squeeze)
+        if steps.reduce_axis is not None:
+            array = self.reduce(array, axis=steps.reduce_axis)
+        if steps.transpose is not None:
+            array = array.transpose(steps.transpose)
+        elif steps.einsum is not None:
+            array = np.einsum(steps.einsum, array)
+        if steps.shrink is not None:
+            shape = array.shape
+            new_shape = []
+            for axes in steps.shrink:
+                size = 1
+                for axis in axes:
+                    size *= shape[axis]
+                new_shape.append(size)
+            array = array.reshape(new_shape)
+        return array
+
+    def apply(self, array):
+        """
+        Applies the operation to the array and reports whether the result is
+        a view on the array (True) or a copy (False). A reshape has to copy,
+        when the flattened axes are not contiguous in memory (e.g. after a
+        transpose).
+
+        Returns:
+            Tuple of the morphed array and a bool, whether it is a view.
+        """
+        result = self(array)
+        return result, np.may_share_memory(result, array)
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_morph(operation, reduce, shape_hints):
+    return MorphPlan(operation, reduce, **dict(shape_hints))
+
+
+def compile_morph(operation, reduce=None, **shape_hints) -> MorphPlan:
     """
-    operation = _normalize(operation)
-    source, target = operation.split('->')
-
-    # Expanding reshape
-    array = _expanding_reshape(array, source, target, **shape_hints)
-
-    # Initial squeeze
-    squeeze_operation = operation.split('->')[0].split()
-    for axis, op in reversed(list(enumerate(squeeze_operation))):
-        if op == '1':
-            array = np.squeeze(array, axis=axis)
-
-    # Transpose
-    transposition_operation = operation.replace('1', ' ').replace('*', ' ')
-    try:
-        in_shape, out_shape, (array, ) = _parse_einsum_input([transposition_operation.replace(' ', ''), array])
-
-        if len(set(in_shape) - set(out_shape)) > 0:
-            assert reduce is not None, ('Missing reduce function', reduce, transposition_operation)
-
-            reduce_axis = tuple([i for i, s in enumerate(in_shape) if s not in out_shape])
-            array = reduce(array, axis=reduce_axis)
-            in_shape = ''.join([s for s in in_shape if s in out_shape])
-
-        array = np.einsum(f'{in_shape}->{out_shape}', array)
-    except ValueError as e:
-        msg = (
-            f'op: {transposition_operation} ({in_shape}->{out_shape}), '
-            f'shape: {np.shape(array)}'
-        )
+    Returns a (cached) compiled plan for `morph`, to parse the operation once
+    and apply it many times, e.g. in a collate function.
 
-        if len(e.args) == 1:
-            e.args = (e.args[0] + '\n\n' + msg,)
-        else:
-            print(msg)
-        raise
+    The plans are cached with the operation, the reduce function and the
+    shape hints as key.
+
+    >>> plan = compile_morph('t b f -> t*b f')
+    >>> plan is compile_morph('t b f -> t*b f')
+    True
+    >>> plan(np.ones((4, 3, 2))).shape
+    (12, 2)
+    """
+    return _compile_morph(
+        operation, reduce, tuple(sorted(shape_hints.items())))
 
-    # Final reshape
-    source = transposition_operation.split('->')[-1]
-    target = operation.split('->')[-1]
 
-    return _shrinking_reshape(array, source, target)
+def morph(operation, array, reduce=None, **shape_hints):
+    """ This is an experimental version of a generalized reshape.
+    See test cases for examples.
+
+    The parsed operation is cached, see `compile_morph`.
+    """
+    return compile_morph(operation, reduce=reduce, **shape_hints)(array)
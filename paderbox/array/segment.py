@@ -280,3 +280,161 @@ def segment_axis(x, length: int, shift: int, axis: int=-1,
         return xp.flip(x, axis=axis)
     else:
         return x
+
+
+def segment_axis_parts(
+        x, length: int, shift: int, axis: int = -1,
+        end='pad', pad_mode='constant', pad_value=0, pad_width=(0, 0),
+):
+    """
+    Same frames as `segment_axis(np.pad(x, pad_width), ..., end=end)`, but
+    without a copy of x. The frames are returned in three parts:
+    head, body and tail, where
+     - body is a view on x (like `segment_axis` with `end='cut'`) and
+       contains all frames that are inside of x and
+     - head and tail are small materialized arrays with the frames, that
+       overlap with the padding at the beginning (`pad_width[0]`) and the
+       end (`pad_width[1]` and the padding of `end='pad'`).
+
+    Hence the memory and the time for the padding do not grow with the
+    length of x. `np.concatenate(parts, axis=axis)` yields the same as
+    `segment_axis` (for numpy arrays and a positive shift).
+
+    Args:
+        x: np.ndarray to segment.
+        length: The length of each frame.
+        shift: The number of array elements by which to step forward. Has to
+            be positive.
+        axis: The axis to operate on.
+        end: 'pad', 'cut' or None, see `segment_axis`.
+        pad_mode: see numpy.pad. Only modes that depend on the values close
+            to the border are supported ('constant', 'edge', 'reflect' and
+            'symmetric').
+        pad_value: The value to use for `pad_mode='constant'`.
+        pad_width: Tuple with the number of elements, that are padded at
+            the beginning and the end of x before the segmentation. A
+            negative width removes elements.
+
+    Returns:
+        List of the three arrays [head, body, tail].
+
+    >>> head, body, tail = segment_axis_parts(np.arange(10), 4, 2)
+    >>> head.shape, body, tail.shape
+    ((0, 4), array([[0, 1, 2, 3],
+           [2, 3, 4, 5],
+           [4, 5, 6, 7],
+           [6, 7, 8, 9]]), (0, 4))
+    >>> x = np.arange(11)
+    >>> head, body, tail = segment_axis_parts(x, 4, 2, pad_width=(2, 0))
+    >>> head
+    array([[0, 0, 0, 1]])
+    >>> np.shares_memory(body, x)
+    True
+    >>> tail
+    array([[ 8,  9, 10,  0]])
+    >>> np.concatenate([head, body, tail])
+    array([[ 0,  0,  0,  1],
+           [ 0,  1,  2,  3],
+           [ 2,  3,  4,  5],
+           [ 4,  5,  6,  7],
+           [ 6,  7,  8,  9],
+           [ 8,  9, 10,  0]])
+    >>> x = np.arange(14).reshape(2, 7)
+    >>> parts = segment_axis_parts(x, 4, 2, pad_mode='edge')
+    >>> [p.shape for p in parts]
+    [(2, 0, 4), (2, 2, 4), (2, 1, 4)]
+    >>> np.testing.assert_equal(
+    ...     np.concatenate(parts, axis=-2),
+    ...     segment_axis(x, 4, 2, pad_mode='edge'))
+    >>> parts = segment_axis_parts(np.arange(10), 4, 2, pad_width=(-2, -2))
+    >>> np.concatenate(parts)
+    array([[2, 3, 4, 5],
+           [4, 5, 6, 7]])
+    """
+    assert shift > 0, shift
+    assert end in ['pad', 'cut', None], end
+    assert pad_mode in ['constant', 'edge', 'reflect', 'symmetric'], pad_mode
+    x = np.asarray(x)
+    axis = axis % x.ndim
+    size = x.shape[axis]
+    pad_front, pad_end = pad_width
+
+    if pad_front < 0 or pad_end < 0:
+        # A negative pad width removes elements, e.g. the fading of an STFT
+        # with a shift larger than the window length.
+        start = min(max(-pad_front, 0), size)
+        stop = max(size + min(pad_end, 0), start)
+        x = x[(slice(None),) * axis + (slice(start, stop),)]
+        size = x.shape[axis]
+        pad_front, pad_end = max(pad_front, 0), max(pad_end, 0)
+
+    # Length of the padded signal, that segment_axis would see and the
+    # additional padding of end='pad'
+    padded_size = pad_front + size + pad_end
+    end_pad = 0
+    if end == 'pad':
+        if padded_size < length:
+            end_pad = length - padded_size
+        elif shift != 1 and (padded_size + shift - length) % shift != 0:
+            end_pad = shift - ((padded_size + shift - length) % shift)
+        padded_size += end_pad
+    elif end is None:
+        assert (padded_size + shift - length) % shift == 0, (
+            padded_size, shift, length)
+    frames = max((padded_size + shift - length) // shift, 0)
+
+    # Frames that are completely inside of x
+    body_start = min(-(-pad_front // shift), frames)
+    body_stop = min(max((pad_front + size - length) // shift + 1, body_start),
+                    frames)
+
+    def index(start, stop):
+        return (slice(None),) * axis + (slice(start, stop),)
+
+    def materialize(start, stop):
+        # Frames [start, stop) of the padded signal.
+        lo, hi = start * shift, (stop - 1) * shift + length
+        # Keep a margin, so that the padding of the local copy is the
+        # same as the padding of the whole signal.
+        margin = length + pad_front + pad_end + end_pad
+        data_lo = max(min(lo - pad_front, size) - margin, 0)
+        data_hi = min(max(hi - pad_front, 0) + margin, size)
+        if pad_mode == 'constant':
+            kwargs = {'constant_values': pad_value}
+        else:
+            kwargs = {}
+        # Same two steps as np.pad followed by segment_axis.
+        npad = np.zeros([x.ndim, 2], dtype=int)
+        npad[axis] = [
+            pad_front if data_lo == 0 else 0,
+            pad_end if data_hi == size else 0,
+        ]
+        local = np.pad(
+            x[index(data_lo, data_hi)], npad, mode=pad_mode, **kwargs)
+        offset = data_lo + pad_front - npad[axis, 0]
+        if data_hi == size and end_pad > 0:
+            npad[axis] = [0, end_pad]
+            local = np.pad(local, npad, mode=pad_mode, **kwargs)
+        return segment_axis(
+            local[index(lo - offset, hi - offset)], length, shift, axis=axis,
+            end=None,
+        )
+
+    def empty():
+        shape = list(x.shape)
+        shape[axis:axis + 1] = [0, length]
+        return np.zeros(shape, dtype=x.dtype)
+
+    if body_start == body_stop:
+        # No frame is completely inside of x, e.g. a short signal.
+        head = materialize(0, frames) if frames > 0 else empty()
+        return [head, empty(), empty()]
+
+    body = segment_axis(
+        x[index(body_start * shift - pad_front,
+                (body_stop - 1) * shift + length - pad_front)],
+        length, shift, axis=axis, end=None,
+    )
+    head = materialize(0, body_start) if body_start > 0 else empty()
+    tail = materialize(body_stop, frames) if body_stop < frames else empty()
+    return [head, body, tail]
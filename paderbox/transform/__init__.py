@@ -4,13 +4,25 @@ This module deals with all sorts of acoustic features and transforms.
 from .module_stft import (
     stft,
     istft,
+    stft_batch,
+    stft_frame_range,
+    stft_frame_range_to_sample_range,
+    stft_to_npy,
     STFT,
+    StreamingSTFT,
+    StreamingISTFT,
     spectrogram,
     stft_to_spectrogram,
     spectrogram_to_energy_per_frame,
     get_stft_center_frequencies,
 )
 
+from .module_fft import (
+    fft_backend,
+    get_fft_backend,
+    register_fft_backend,
+)
+
 from .module_filter import (
     preemphasis,
     inverse_preemphasis,
@@ -18,7 +30,9 @@ from .module_filter import (
     preemphasis_with_offset_compensation,
 )
 
-from .module_fbank import fbank, logfbank
+from .module_fbank import fbank, logfbank, MelFeatureExtractor
 from .module_mfcc import mfcc, mfcc_velocity_acceleration
 from .module_normalize import normalize_mean_variance
 from .module_resample import resample_sox
+from .module_resample import resample_polyphase
+from .module_resample import StreamingResampler
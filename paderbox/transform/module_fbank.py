@@ -2,6 +2,7 @@
 Provides fbank features and the fbank filterbank.
 """
 
+import functools
 from typing import Optional, Union, Callable
 
 from cached_property import cached_property
@@ -9,6 +10,9 @@ import numpy as np
 import scipy.signal
 
 from paderbox.transform.module_filter import preemphasis_with_offset_compensation
+from paderbox.transform.module_fft import get_fft_backend
+from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_stft import _num_stft_frames
 from paderbox.transform.module_stft import stft
 from paderbox.transform.module_stft import stft_to_spectrogram
 import dataclasses
@@ -30,6 +34,8 @@ class MelTransform:
             *,
             warping_fn: Optional[Callable] = None,
             independent_axis: tuple = (0,),
+            banded: bool = False,
+            warp_pool_size: Optional[int] = None,
     ):
         """Transforms linear spectrogram to (log) mel spectrogram.
 
@@ -46,6 +52,17 @@ class MelTransform:
             warping_fn: function to (randomly) remap fbank center frequencies
             independent_axis: independent axis for which independently warped
                 filter banks are used.
+            banded: If True, apply the filter bank with BandedFilterbank,
+                i.e. skip the zeros outside of the triangular filters, else
+                use a dense matrix product. The results are the same up to
+                floating point rounding (the warped filter banks are
+                normalized in single precision, see get_banded_fbanks).
+            warp_pool_size: If not None (requires warping_fn and banded),
+                sample warp_pool_size warped filter banks once and draw the
+                filter banks of each call uniformly from this pool instead
+                of warping new filter banks. For a large pool the
+                distribution of the filter banks approaches the one of
+                warping_fn.
 
         >>> sample_rate = 16000
         >>> highest_frequency = sample_rate/2
@@ -69,6 +86,9 @@ class MelTransform:
         >>> mel_transform = MelTransform(16000, 512, 40, warping_fn=warping_fn, independent_axis=(0,1,2))
         >>> mel_transform(spec).shape
         (3, 1, 100, 40)
+        >>> mel_transform = MelTransform(16000, 512, 40, warping_fn=warping_fn, banded=True, warp_pool_size=100)
+        >>> mel_transform(spec).shape
+        (3, 1, 100, 40)
         """
         self.sample_rate = sample_rate
         self.stft_size = stft_size
@@ -83,6 +103,11 @@ class MelTransform:
             [independent_axis] if np.isscalar(independent_axis)
             else independent_axis
         )
+        self.banded = banded
+        if warp_pool_size is not None and (warping_fn is None or not banded):
+            raise ValueError(
+                'warp_pool_size requires a warping_fn and banded=True.')
+        self.warp_pool_size = warp_pool_size
 
     @cached_property
     def fbanks(self):
@@ -98,6 +123,42 @@ class MelTransform:
         fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
         return fbanks.T
 
+    @cached_property
+    def banded_fbanks(self):
+        """Banded representation of fbanks, see BandedFilterbank."""
+        return _get_banded_filterbank_cached(
+            self.sample_rate, self.stft_size, self.number_of_filters,
+            self.lowest_frequency, self.highest_frequency, self.htk_mel,
+            self.eps,
+        )
+
+    @cached_property
+    def warped_fbank_pool(self):
+        """Pool of warp_pool_size warped filter banks, see warp_pool_size."""
+        return self._get_warped_banded_fbanks((self.warp_pool_size,))
+
+    def _sample_warped_banded_fbanks(self, size):
+        """Warped filter banks with shape (*size, F, N) in banded form."""
+        if self.warp_pool_size is None:
+            return self._get_warped_banded_fbanks(tuple(size))
+        else:
+            return self.warped_fbank_pool.take(
+                np.random.randint(self.warp_pool_size, size=tuple(size)))
+
+    def _get_warped_banded_fbanks(self, size):
+        return get_banded_fbanks(
+            sample_rate=self.sample_rate,
+            stft_size=self.stft_size,
+            number_of_filters=self.number_of_filters,
+            lowest_frequency=self.lowest_frequency,
+            highest_frequency=self.highest_frequency,
+            htk_mel=self.htk_mel,
+            warping_fn=self.warping_fn,
+            size=size,
+            dtype=np.float32,
+            eps=self.eps,
+        )
+
     @cached_property
     def ifbanks(self):
         """Create (pseudo)-inverse of filterbank matrix."""
@@ -105,7 +166,10 @@ class MelTransform:
 
     def __call__(self, x: np.ndarray):
         if self.warping_fn is None:
-            x = x @ self.fbanks
+            if self.banded:
+                x = self.banded_fbanks(x)
+            else:
+                x = x @ self.fbanks
         else:
             independent_axis = [ax if ax >= 0 else x.ndim+ax for ax in self.independent_axis]
             assert all([0 <= ax < x.ndim-1 for ax in independent_axis]), self.independent_axis
@@ -113,23 +177,30 @@ class MelTransform:
                 x.shape[i] if i in independent_axis else 1
                 for i in range(x.ndim-1)
             ]
-            fbanks = get_fbanks(
-                sample_rate=self.sample_rate,
-                stft_size=self.stft_size,
-                number_of_filters=self.number_of_filters,
-                lowest_frequency=self.lowest_frequency,
-                highest_frequency=self.highest_frequency,
-                htk_mel=self.htk_mel,
-                warping_fn=self.warping_fn,
-                size=tuple(size),
-            ).astype(np.float32)
-            fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
-            fbanks = fbanks.swapaxes(-2, -1)
-            # The following is the same as `np.einsum('...F,...FN->...N', x, fbanks)`, but much faster (see https://github.com/fgnt/paderbox/pull/35).
-            if fbanks.shape[-3] == 1:
-                x = x @ fbanks.squeeze(-3)
+            if self.banded:
+                if size[-1] == 1:
+                    x = self._sample_warped_banded_fbanks(size[:-1])(x)
+                else:
+                    x = self._sample_warped_banded_fbanks(size)(
+                        x[..., None, :]).squeeze(-2)
             else:
-                x = (x[..., None, :] @ fbanks).squeeze(-2)
+                fbanks = get_fbanks(
+                    sample_rate=self.sample_rate,
+                    stft_size=self.stft_size,
+                    number_of_filters=self.number_of_filters,
+                    lowest_frequency=self.lowest_frequency,
+                    highest_frequency=self.highest_frequency,
+                    htk_mel=self.htk_mel,
+                    warping_fn=self.warping_fn,
+                    size=tuple(size),
+                ).astype(np.float32)
+                fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
+                fbanks = fbanks.swapaxes(-2, -1)
+                # The following is the same as `np.einsum('...F,...FN->...N', x, fbanks)`, but much faster (see https://github.com/fgnt/paderbox/pull/35).
+                if fbanks.shape[-3] == 1:
+                    x = x @ fbanks.squeeze(-3)
+                else:
+                    x = (x[..., None, :] @ fbanks).squeeze(-2)
         if self.log:
             x = np.log(x + self.eps)
         return x
@@ -141,6 +212,296 @@ class MelTransform:
         return np.maximum(np.dot(x, self.ifbanks), 0.)
 
 
+@dataclasses.dataclass
+class MelFeatureExtractor:
+    """
+    Fused (log) mel or MFCC feature extraction from the time signal.
+
+    Yields the same features as `MelTransform(...)(stft_to_spectrogram(
+    STFT(...)(x)))` (followed by an orthonormal DCT-II for MFCCs), but
+    processes the frames in blocks of block_frames frames. Only the output
+    is allocated for the full signal, the complex STFT and the power
+    spectrogram exist only for one block.
+
+    The STFT frames of a block are identical to the frames of the full STFT.
+    The mel filter bank is applied with a BLAS matrix product, whose
+    rounding may depend on the number of rows. The features are identical,
+    when the signal fits into one block or block_frames is a multiple of
+    the BLAS block size (e.g. the default), else they differ at most by
+    floating point rounding.
+
+    Args:
+        sample_rate: sample rate of audio signal
+        stft_size: fft_length used in stft
+        stft_shift: shift of the stft
+        number_of_filters: number of mel filters
+        window_length: See STFT.
+        window: See STFT.
+        symmetric_window: See STFT.
+        fading: See STFT.
+        pad: See STFT.
+        lowest_frequency: See MelTransform.
+        highest_frequency: See MelTransform.
+        htk_mel: See MelTransform.
+        log: apply log to mel spectrogram
+        eps: See MelTransform.
+        number_of_cepstral_coefficients: If not None, return this number of
+            MFCCs (DCT-II of the log mel spectrogram), requires log.
+        block_frames: number of frames that are processed at once.
+        dtype: See STFT.
+
+    >>> extractor = MelFeatureExtractor(16000, 512, 160, 40, window_length=400)
+    >>> x = np.random.normal(size=(2, 16000))
+    >>> extractor(x).shape
+    (2, 102, 40)
+    >>> stft = STFT(160, 512, window_length=400)
+    >>> mel_transform = MelTransform(16000, 512, 40)
+    >>> np.testing.assert_equal(
+    ...     extractor(x), mel_transform(stft_to_spectrogram(stft(x))))
+    >>> extractor = MelFeatureExtractor(
+    ...     16000, 512, 160, 40, window_length=400,
+    ...     number_of_cepstral_coefficients=13)
+    >>> extractor(x).shape
+    (2, 102, 13)
+    >>> np.testing.assert_equal(extractor(x), get_fft_backend().dct(
+    ...     mel_transform(stft_to_spectrogram(stft(x))), norm='ortho',
+    ... )[..., :13])
+
+    A signal, that is shorter than the window, yields one frame (as stft):
+
+    >>> extractor = MelFeatureExtractor(
+    ...     16000, 512, 160, 40, window_length=400, fading=False)
+    >>> extractor(x[:, :200]).shape
+    (2, 1, 40)
+    """
+    sample_rate: int
+    stft_size: int
+    stft_shift: int
+    number_of_filters: int
+    window_length: Optional[int] = None
+    window: str = 'blackman'
+    symmetric_window: bool = False
+    fading: Optional[Union[bool, str]] = 'full'
+    pad: bool = True
+    lowest_frequency: Optional[float] = 50
+    highest_frequency: Optional[float] = None
+    htk_mel: bool = True
+    log: bool = True
+    eps: float = 1e-18
+    number_of_cepstral_coefficients: Optional[int] = None
+    block_frames: int = 256
+    dtype: Optional[np.dtype] = None
+
+    def __post_init__(self):
+        if self.number_of_cepstral_coefficients is not None and not self.log:
+            raise ValueError(
+                'number_of_cepstral_coefficients requires log=True.')
+        self.stft = STFT(
+            shift=self.stft_shift,
+            size=self.stft_size,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            pad=self.pad,
+            fading=self.fading,
+            dtype=self.dtype,
+        )
+        self.mel_transform = MelTransform(
+            sample_rate=self.sample_rate,
+            stft_size=self.stft_size,
+            number_of_filters=self.number_of_filters,
+            lowest_frequency=self.lowest_frequency,
+            highest_frequency=self.highest_frequency,
+            htk_mel=self.htk_mel,
+            log=self.log,
+            eps=self.eps,
+        )
+
+    def __call__(self, x: np.ndarray, out: Optional[np.ndarray] = None):
+        """
+        Args:
+            x: time signal with shape (..., T)
+            out: optional output array with shape (..., frames, features)
+
+        Returns:
+            features with shape (..., frames, features)
+        """
+        x = np.asarray(x)
+        frames = _num_stft_frames(
+            x.shape[-1], self.stft.window_length, self.stft.shift,
+            pad=self.pad, fading=self.fading,
+        )
+        if self.number_of_cepstral_coefficients is None:
+            features = self.number_of_filters
+        else:
+            features = self.number_of_cepstral_coefficients
+        shape = (*x.shape[:-1], frames, features)
+        if out is None:
+            out = np.empty(shape, dtype=np.result_type(
+                self.stft._plan.window, self.mel_transform.fbanks))
+        elif out.shape != shape:
+            raise ValueError(
+                f'out.shape {out.shape} does not match the shape of the '
+                f'features {shape}.'
+            )
+
+        for start in range(0, frames, self.block_frames):
+            stop = min(start + self.block_frames, frames)
+            feature = self.mel_transform(stft_to_spectrogram(
+                self.stft.frame_range(x, start, stop)))
+            if self.number_of_cepstral_coefficients is not None:
+                feature = get_fft_backend().dct(
+                    feature, type=2, axis=-1, norm='ortho',
+                )[..., :self.number_of_cepstral_coefficients]
+            out[..., start:stop, :] = feature
+        return out
+
+
+class BandedFilterbank:
+    """
+    Banded representation of a filter bank matrix with shape (..., F, N),
+    e.g. MelTransform.fbanks.
+
+    Each filter n is stored as its first and stop frequency bin
+    (start[n], stop[n]) and the weights in between. The leading dimensions
+    (e.g. independently warped filter banks) share the bins, i.e. the bins
+    are the union of the non-zero bins of all filter banks.
+    Applying the filter bank (`x @ fbanks`) considers only the bins in the
+    band of each filter, which are for triangular filters only a small
+    fraction of all F bins. The result is the same as with the dense matrix
+    product up to floating point rounding.
+
+    Args:
+        fbanks: Filter bank matrix with shape (..., F, N).
+
+    >>> fbanks = MelTransform(16000, 512, 40).fbanks
+    >>> fbanks.shape
+    (257, 40)
+    >>> banded = BandedFilterbank(fbanks)
+    >>> banded.start[:5], banded.stop[:5]
+    (array([2, 4, 5, 7, 9]), array([ 5,  7,  9, 10, 12]))
+    >>> x = np.random.uniform(size=(3, 100, 257))
+    >>> banded(x).shape
+    (3, 100, 40)
+    >>> np.testing.assert_allclose(banded(x), x @ fbanks, rtol=1e-12)
+    """
+    def __init__(self, fbanks: np.ndarray):
+        fbanks = np.asarray(fbanks)
+        assert fbanks.ndim >= 2, fbanks.shape
+        self.shape = fbanks.shape
+        self.dtype = fbanks.dtype
+        nonzero = np.any(
+            fbanks != 0, axis=tuple(range(fbanks.ndim - 2))
+        ) if fbanks.ndim > 2 else fbanks != 0
+        frequencies = fbanks.shape[-2]
+        empty = ~np.any(nonzero, axis=0)
+        self.start = np.where(empty, 0, np.argmax(nonzero, axis=0))
+        self.stop = np.where(
+            empty, 0, frequencies - np.argmax(nonzero[::-1], axis=0))
+        self.weights = [
+            np.ascontiguousarray(fbanks[..., start:stop, n])
+            for n, (start, stop) in enumerate(zip(self.start, self.stop))
+        ]
+
+    def __call__(self, x: np.ndarray):
+        """Calculates `x @ fbanks` with x of shape (..., T, F)."""
+        x = np.asarray(x)
+        assert x.shape[-1] == self.shape[-2], (x.shape, self.shape)
+        out = np.zeros(
+            (
+                *np.broadcast_shapes(x.shape[:-2], self.shape[:-2]),
+                x.shape[-2], self.shape[-1],
+            ),
+            dtype=np.result_type(x, self.dtype),
+        )
+        for n, (start, stop, weights) in enumerate(
+                zip(self.start, self.stop, self.weights)):
+            if start == stop:
+                continue
+            if weights.ndim == 1:
+                out[..., n] = x[..., start:stop] @ weights
+            else:
+                out[..., n] = (x[..., start:stop] @ weights[..., None])[..., 0]
+        return out
+
+    @classmethod
+    def matmul(cls, x, fbanks):
+        """Banded version of `x @ fbanks`."""
+        return cls(fbanks)(x)
+
+    @classmethod
+    def from_bands(cls, start, stop, weights, shape):
+        """
+        Args:
+            start: First frequency bin of each filter with shape (N,).
+            stop: Stop frequency bin (exclusive) of each filter.
+            weights: List with the weights of each filter with shape
+                (..., stop[n] - start[n]).
+            shape: Shape of the dense filter bank matrix (..., F, N).
+        """
+        self = cls.__new__(cls)
+        self.shape = tuple(shape)
+        self.start = np.asarray(start)
+        self.stop = np.asarray(stop)
+        self.weights = list(weights)
+        self.dtype = np.result_type(*self.weights)
+        return self
+
+    def take(self, index):
+        """
+        Selects filter banks along the first independent axis, e.g. from a
+        pool of warped filter banks with shape (P, F, N).
+
+        Args:
+            index: Integer array.
+
+        Returns:
+            BandedFilterbank with shape (*index.shape, *shape[1:]).
+        """
+        index = np.asarray(index)
+        return self.from_bands(
+            self.start, self.stop,
+            [weights[index] for weights in self.weights],
+            (*index.shape, *self.shape[1:]),
+        )
+
+    def todense(self):
+        """Returns the dense filter bank matrix with shape (..., F, N)."""
+        fbanks = np.zeros(self.shape, dtype=self.dtype)
+        for n, (start, stop, weights) in enumerate(
+                zip(self.start, self.stop, self.weights)):
+            fbanks[..., start:stop, n] = weights
+        return fbanks
+
+
+@functools.lru_cache(maxsize=128)
+def _get_banded_filterbank_cached(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, eps,
+):
+    """
+    BandedFilterbank of MelTransform.fbanks, cached, because fbank and
+    logfbank create a new MelTransform for each call.
+
+    >>> banded = _get_banded_filterbank_cached(16000, 512, 40, 50, None, True, 1e-18)
+    >>> banded is MelTransform(16000, 512, 40).banded_fbanks
+    True
+    """
+    fbanks = get_fbanks(
+        sample_rate=sample_rate,
+        stft_size=stft_size,
+        number_of_filters=number_of_filters,
+        lowest_frequency=lowest_frequency,
+        highest_frequency=highest_frequency,
+        htk_mel=htk_mel,
+    )
+    fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + eps)
+    banded = BandedFilterbank(fbanks.T)
+    for weights in banded.weights:
+        weights.setflags(write=False)
+    return banded
+
+
 def get_fbanks(
         sample_rate: int, stft_size: int, number_of_filters: int,
         lowest_frequency: float = 0.,
@@ -193,7 +554,93 @@ def get_fbanks(
         )).shape
     (2, 3, 10, 17)
 
+    Without warping_fn, the filter banks are a pure function of the
+    arguments and the last ones are cached (thread-safe). The cached arrays
+    are read-only. See `fbank_cache_info` and `fbank_cache_clear` for the
+    statistics and to empty the cache:
+
+    >>> fbank_cache_clear()
+    >>> fbanks = get_fbanks(sample_rate, 32, 10)
+    >>> fbanks is get_fbanks(sample_rate, 32, 10)
+    True
+    >>> fbank_cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=128, currsize=1)
+    >>> fbanks[0, 0] = 1
+    Traceback (most recent call last):
+    ...
+    ValueError: assignment destination is read-only
     """
+    if warping_fn is None:
+        return _get_fbanks_cached(
+            sample_rate, stft_size, number_of_filters, lowest_frequency,
+            highest_frequency, htk_mel, tuple(size),
+        )
+    return _get_fbanks(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, warping_fn, size,
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _get_fbanks_cached(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, size,
+):
+    return _get_fbanks(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, None, size,
+    )
+
+
+def fbank_cache_info():
+    """
+    Statistics of the cache of `get_fbanks` (without warping_fn) as a
+    `functools.lru_cache` CacheInfo, i.e. hits, misses, maxsize and
+    currsize.
+    """
+    return _get_fbanks_cached.cache_info()
+
+
+def fbank_cache_clear():
+    """
+    Empties the cache of `get_fbanks` and the cache of the banded filter
+    banks of `MelTransform`, that are derived from it.
+    """
+    _get_fbanks_cached.cache_clear()
+    _get_banded_filterbank_cached.cache_clear()
+
+
+def _get_fbanks(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, warping_fn, size,
+):
+    onsets, centers, offsets = _get_filter_bins(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, warping_fn, size,
+    )
+    idx = np.arange(stft_size // 2 + 1)
+    fbanks = _triangle(
+        idx, onsets[..., None], centers[..., None], offsets[..., None])
+    fbanks.setflags(write=False)
+    return np.broadcast_to(fbanks, (*size, *fbanks.shape[-2:]))
+
+
+def _triangle(idx, onsets, centers, offsets):
+    return np.maximum(
+        np.minimum(
+            (idx-onsets)/(centers-onsets),
+            (idx-offsets)/(centers-offsets)
+        ),
+        0
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _get_filter_frequencies(
+        sample_rate, number_of_filters, lowest_frequency, highest_frequency,
+        htk_mel,
+):
+    """Unwarped onset, center and offset frequencies of the filters."""
     highest_frequency = sample_rate / 2 if highest_frequency is None else highest_frequency
     if highest_frequency < 0:
         highest_frequency = highest_frequency % sample_rate / 2
@@ -205,21 +652,103 @@ def get_fbanks(
         ),
         htk_mel=htk_mel,
     )
+    f.setflags(write=False)
+    return f
+
+
+def _get_filter_bins(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, warping_fn, size,
+):
+    """
+    (Warped) onset, center and offset of the filters in (soft) frequency
+    bins, each with shape (*size, number_of_filters) when warped, else
+    (number_of_filters,).
+    """
+    f = _get_filter_frequencies(
+        sample_rate, number_of_filters, lowest_frequency, highest_frequency,
+        htk_mel,
+    )
     if warping_fn is not None:
-        f = warping_fn(f, size=size)
+        f = warping_fn(np.array(f), size=size)
     k = hz2bin(f, sample_rate, stft_size)
-    centers = k[..., 1:-1, None]
-    onsets = np.minimum(k[..., :-2, None], centers - 1)
-    offsets = np.maximum(k[..., 2:, None], centers + 1)
-    idx = np.arange(stft_size // 2 + 1)
-    fbanks = np.maximum(
-        np.minimum(
-            (idx-onsets)/(centers-onsets),
-            (idx-offsets)/(centers-offsets)
-        ),
-        0
+    centers = k[..., 1:-1]
+    onsets = np.minimum(k[..., :-2], centers - 1)
+    offsets = np.maximum(k[..., 2:], centers + 1)
+    return onsets, centers, offsets
+
+
+def get_banded_fbanks(
+        sample_rate: int, stft_size: int, number_of_filters: int,
+        lowest_frequency: float = 0.,
+        highest_frequency: Optional[float] = None,
+        htk_mel=True,
+        warping_fn: Optional[Callable] = None,
+        size: tuple = (),
+        dtype=np.float64,
+        eps: Optional[float] = None,
+) -> BandedFilterbank:
+    """
+    Computes the mel filter banks directly in the banded representation,
+    i.e. `BandedFilterbank(get_fbanks(...).swapaxes(-2, -1))`, but the
+    weights are only calculated in the bands of the filters.
+
+    This is much faster for warped filter banks with many independent
+    filter banks (e.g. VTLP with a filter bank for each example), because
+    the (warped) onset and offset of each filter are calculated first and
+    only the frequency bins between them are evaluated.
+
+    Args:
+        sample_rate: See get_fbanks.
+        stft_size: See get_fbanks.
+        number_of_filters: See get_fbanks.
+        lowest_frequency: See get_fbanks.
+        highest_frequency: See get_fbanks.
+        htk_mel: See get_fbanks.
+        warping_fn: See get_fbanks. It is called in the same way as by
+            get_fbanks, i.e. the warps have the same distribution.
+        size: See get_fbanks.
+        dtype: dtype of the weights.
+        eps: If not None, normalize each filter to the sum one (as
+            MelTransform does), i.e. divide by `sum + eps`.
+
+    Returns:
+        BandedFilterbank with shape (*size, stft_size // 2 + 1,
+        number_of_filters).
+
+    >>> banded = get_banded_fbanks(8000, 32, 10)
+    >>> banded.shape
+    (17, 10)
+    >>> np.testing.assert_equal(
+    ...     BandedFilterbank(get_fbanks(8000, 32, 10).T).todense(),
+    ...     banded.todense())
+    """
+    onsets, centers, offsets = _get_filter_bins(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, warping_fn, size,
     )
-    return np.broadcast_to(fbanks, (*size, *fbanks.shape[-2:]))
+    frequencies = stft_size // 2 + 1
+    # Union of the bands of all independent filter banks.
+    independent_axis = tuple(range(onsets.ndim - 1))
+    start = np.clip(
+        np.floor(np.min(onsets, axis=independent_axis)), 0, frequencies
+    ).astype(int)
+    stop = np.clip(
+        np.floor(np.max(offsets, axis=independent_axis)) + 1, 0, frequencies
+    ).astype(int)
+
+    weights = []
+    for n in range(number_of_filters):
+        w = _triangle(
+            np.arange(start[n], stop[n]),
+            onsets[..., n, None], centers[..., n, None], offsets[..., n, None],
+        )
+        w = np.broadcast_to(w, (*size, w.shape[-1])).astype(dtype)
+        if eps is not None:
+            w = w / (w.sum(axis=-1, keepdims=True) + eps)
+        weights.append(w)
+    return BandedFilterbank.from_bands(
+        start, stop, weights, (*size, frequencies, number_of_filters))
 
 
 def hz2mel(frequency: Union[float, np.ndarray], htk_mel=True):
@@ -0,0 +1,284 @@
+"""
+Registry of FFT backends for the transforms in this package (e.g. stft,
+istft, the phase reconstruction that is based on them and mfcc).
+
+The backend is selected with the context manager `fft_backend` or with the
+environment variable `PADERBOX_FFT_BACKEND`. The context manager has a
+higher priority.
+
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> with fft_backend('scipy'):
+    ...     X = pb.transform.stft(x, 512, 128)
+    >>> np.testing.assert_allclose(X, pb.transform.stft(x, 512, 128))
+
+Available backends:
+ - 'default': numpy.fft for double precision (keeps the results of older
+   versions) and scipy.fft for single precision or when `workers` is given.
+ - 'numpy': numpy.fft, single-threaded. Single precision inputs are
+   transformed in double precision and converted back.
+ - 'scipy': scipy.fft, supports `workers` and single precision.
+ - 'pyfftw': FFTW via pyfftw (optional dependency). Supports `workers`,
+   single precision and caches the FFTW plans (wisdom) optionally in a
+   file, see `PyFFTWBackend`.
+
+Further backends can be added with `register_fft_backend`.
+"""
+import contextlib
+import contextvars
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import numpy.fft
+import scipy.fft
+import scipy.fftpack
+
+import paderbox as pb
+from paderbox.io.atomic import open_atomic
+
+__all__ = [
+    'fft_backend',
+    'get_fft_backend',
+    'register_fft_backend',
+    'FFTBackend',
+    'NumpyFFTBackend',
+    'ScipyFFTBackend',
+    'DefaultFFTBackend',
+    'PyFFTWBackend',
+]
+
+
+class FFTBackend:
+    """Interface of an FFT backend.
+
+    All functions follow the signature of scipy.fft. `workers` is the number
+    of threads (None means the default of the backend). The output precision
+    follows the input precision, i.e. float32 -> complex64 for rfft and
+    complex64 -> float32 for irfft.
+    """
+    name = None
+
+    def rfft(self, x, n=None, axis=-1, workers=None):
+        raise NotImplementedError(self)
+
+    def irfft(self, x, n=None, axis=-1, workers=None):
+        raise NotImplementedError(self)
+
+    def dct(self, x, type=2, axis=-1, norm=None, workers=None):
+        # scipy.fftpack.dct was used before the backends were introduced.
+        return scipy.fftpack.dct(x, type=type, axis=axis, norm=norm)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
+
+
+class NumpyFFTBackend(FFTBackend):
+    """numpy.fft, always single-threaded, `workers` is ignored."""
+    name = 'numpy'
+
+    def rfft(self, x, n=None, axis=-1, workers=None):
+        x = np.asarray(x)
+        y = numpy.fft.rfft(x, n=n, axis=axis)
+        if x.dtype == np.float32:
+            y = y.astype(np.complex64)
+        return y
+
+    def irfft(self, x, n=None, axis=-1, workers=None):
+        x = np.asarray(x)
+        y = numpy.fft.irfft(x, n=n, axis=axis)
+        if x.dtype == np.complex64:
+            y = y.astype(np.float32)
+        return y
+
+
+class ScipyFFTBackend(FFTBackend):
+    """scipy.fft, that supports `workers` and single precision."""
+    name = 'scipy'
+
+    def rfft(self, x, n=None, axis=-1, workers=None):
+        return scipy.fft.rfft(x, n=n, axis=axis, workers=workers)
+
+    def irfft(self, x, n=None, axis=-1, workers=None):
+        return scipy.fft.irfft(x, n=n, axis=axis, workers=workers)
+
+    def dct(self, x, type=2, axis=-1, norm=None, workers=None):
+        return scipy.fft.dct(x, type=type, axis=axis, norm=norm,
+                             workers=workers)
+
+
+class DefaultFFTBackend(FFTBackend):
+    """
+    numpy.fft for double precision without workers (same results as older
+    versions of this package), else scipy.fft.
+    """
+    name = 'default'
+
+    def __init__(self):
+        self._numpy = NumpyFFTBackend()
+        self._scipy = ScipyFFTBackend()
+
+    def rfft(self, x, n=None, axis=-1, workers=None):
+        if workers is None and np.asarray(x).dtype != np.float32:
+            return self._numpy.rfft(x, n=n, axis=axis)
+        else:
+            return self._scipy.rfft(x, n=n, axis=axis, workers=workers)
+
+    def irfft(self, x, n=None, axis=-1, workers=None):
+        if workers is None and np.asarray(x).dtype != np.complex64:
+            return self._numpy.irfft(x, n=n, axis=axis)
+        else:
+            return self._scipy.irfft(x, n=n, axis=axis, workers=workers)
+
+
+class PyFFTWBackend(FFTBackend):
+    """
+    FFTW via the pyfftw interfaces (optional dependency).
+
+    FFTW plans a transform before it is executed. The plans are kept in the
+    pyfftw interface cache and the accumulated planning knowledge (wisdom)
+    can be saved to a file and loaded in a later process.
+
+    Args:
+        wisdom_file: Optional file to load the wisdom from (if it exists).
+            `save_wisdom` writes the wisdom to this file.
+            Default: Environment variable `PADERBOX_FFTW_WISDOM`.
+        planner_effort: See pyfftw, e.g. 'FFTW_ESTIMATE' or 'FFTW_MEASURE'.
+        cache_keepalive_time: Seconds to keep unused plans in the cache.
+    """
+    name = 'pyfftw'
+
+    def __init__(
+            self,
+            wisdom_file=None,
+            planner_effort='FFTW_ESTIMATE',
+            cache_keepalive_time=60,
+    ):
+        import pyfftw
+        import pyfftw.interfaces.cache
+        import pyfftw.interfaces.scipy_fft
+        self._pyfftw = pyfftw
+        self._fft = pyfftw.interfaces.scipy_fft
+
+        if wisdom_file is None:
+            wisdom_file = os.environ.get('PADERBOX_FFTW_WISDOM')
+        self.wisdom_file = (
+            None if wisdom_file is None else Path(wisdom_file).expanduser())
+        self.planner_effort = planner_effort
+
+        pyfftw.interfaces.cache.enable()
+        pyfftw.interfaces.cache.set_keepalive_time(cache_keepalive_time)
+        if self.wisdom_file is not None and self.wisdom_file.exists():
+            self.load_wisdom()
+
+    def load_wisdom(self, file=None):
+        file = self.wisdom_file if file is None else Path(file)
+        with open(file, 'rb') as fd:
+            self._pyfftw.import_wisdom(pickle.load(fd))
+
+    def save_wisdom(self, file=None):
+        file = self.wisdom_file if file is None else Path(file)
+        with open_atomic(file, 'wb') as fd:
+            pickle.dump(self._pyfftw.export_wisdom(), fd)
+
+    def rfft(self, x, n=None, axis=-1, workers=None):
+        return self._fft.rfft(
+            x, n=n, axis=axis, workers=workers,
+            planner_effort=self.planner_effort,
+        )
+
+    def irfft(self, x, n=None, axis=-1, workers=None):
+        return self._fft.irfft(
+            x, n=n, axis=axis, workers=workers,
+            planner_effort=self.planner_effort,
+        )
+
+    def dct(self, x, type=2, axis=-1, norm=None, workers=None):
+        return self._fft.dct(
+            x, type=type, axis=axis, norm=norm, workers=workers,
+            planner_effort=self.planner_effort,
+        )
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(wisdom_file={self.wisdom_file!r}, '
+            f'planner_effort={self.planner_effort!r})'
+        )
+
+
+_fft_backend_factories = {
+    'default': DefaultFFTBackend,
+    'numpy': NumpyFFTBackend,
+    'scipy': ScipyFFTBackend,
+    'pyfftw': PyFFTWBackend,
+}
+_fft_backend_instances = {}
+_current_fft_backend = contextvars.ContextVar(
+    'paderbox_fft_backend', default=None)
+
+
+def register_fft_backend(name, factory):
+    """
+    Registers a new FFT backend.
+
+    Args:
+        name: Name to select the backend, e.g. in `fft_backend(name)`.
+        factory: Callable without arguments that returns an `FFTBackend`
+            (e.g. the class). It is called on the first use of the backend.
+    """
+    _fft_backend_factories[name] = factory
+    _fft_backend_instances.pop(name, None)
+
+
+def get_fft_backend(name=None) -> FFTBackend:
+    """
+    Returns an FFT backend.
+
+    Args:
+        name: Name of the backend or an FFTBackend instance. If None, the
+            current backend is returned, i.e. the one selected with
+            `fft_backend`, else the one from the environment variable
+            `PADERBOX_FFT_BACKEND`, else 'default'.
+
+    >>> get_fft_backend('scipy')
+    ScipyFFTBackend()
+    >>> with fft_backend('numpy'):
+    ...     get_fft_backend()
+    NumpyFFTBackend()
+    """
+    if name is None:
+        name = _current_fft_backend.get()
+    if name is None:
+        name = os.environ.get('PADERBOX_FFT_BACKEND', 'default')
+    if isinstance(name, FFTBackend):
+        return name
+    if name not in _fft_backend_instances:
+        try:
+            factory = _fft_backend_factories[name]
+        except KeyError:
+            raise ValueError(
+                f'Unknown FFT backend {name!r}. '
+                f'Available: {list(_fft_backend_factories.keys())}'
+            ) from None
+        _fft_backend_instances[name] = factory()
+    return _fft_backend_instances[name]
+
+
+@contextlib.contextmanager
+def fft_backend(name):
+    """
+    Context manager to select the FFT backend.
+
+    Args:
+        name: Name of a registered backend or an FFTBackend instance.
+
+    >>> with fft_backend('scipy') as backend:
+    ...     backend
+    ScipyFFTBackend()
+    """
+    backend = get_fft_backend(name)
+    token = _current_fft_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _current_fft_backend.reset(token)
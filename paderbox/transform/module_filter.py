@@ -1,8 +1,11 @@
 """
 Provides general filters, for example preemphasis filter.
 """
+import numpy as np
 from scipy.signal import lfilter, medfilt
 
+from paderbox.array.kernel import np_kernel1d
+
 
 def preemphasis(time_signal, p=0.95):
     """Default Pre-emphasis filter.
@@ -48,11 +51,32 @@ def preemphasis_with_offset_compensation(time_signal, p=0.95):
     return lfilter([1, -(1+p), p], [1, -0.999], time_signal)
 
 
-def median(input_signal, window_size=3):
+def median(input_signal, window_size=3, axis=None):
     """ Median Filter
 
+    Without axis, `scipy.signal.medfilt` is used. With axis, the signal is
+    filtered along this axis with `pb.array.kernel.np_kernel1d` (a running
+    median for large window sizes). The borders are zero padded, as in
+    `scipy.signal.medfilt`. For chunked signals see
+    `pb.array.kernel.StreamingMedianKernel1d(window_size, 'constant')`.
+
+    >>> median(np.array([1, 5, 2, 8, 3, 3, 9]))
+    array([1, 2, 5, 3, 3, 3, 3])
+    >>> median(np.array([[1, 5, 2, 8], [3, 3, 9, 0]]), axis=-1)
+    array([[1, 2, 5, 2],
+           [3, 3, 3, 0]])
+
     :param input_signal: array of values to be filtered
-    :param window_size: kernel size for the filter
-    :return: filtered output signal of same length as input_signal
+    :param window_size: kernel size for the filter (odd)
+    :param axis: axis along which the signal is filtered. If None, a
+        multidimensional input_signal is filtered with a multidimensional
+        kernel (`scipy.signal.medfilt`).
+    :return: filtered output signal of same shape and dtype as input_signal
     """
-    return medfilt(input_signal, window_size)
+    if axis is None:
+        return medfilt(input_signal, window_size)
+    input_signal = np.asarray(input_signal)
+    return np_kernel1d(
+        input_signal, window_size, kernel=np.median, axis=axis,
+        padding_mode='constant',
+    ).astype(input_signal.dtype, copy=False)
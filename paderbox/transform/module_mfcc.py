@@ -3,7 +3,7 @@ from paderbox.transform.module_stft import stft
 from paderbox.transform.module_fbank import logfbank
 from paderbox.array import segment_axis
 import scipy.signal
-from scipy.fftpack import dct
+from paderbox.transform.module_fft import get_fft_backend
 
 
 def mfcc(time_signal, sample_rate=16000,
@@ -49,7 +49,8 @@ def mfcc(time_signal, sample_rate=16000,
         time_signal, sample_rate, window_length, stft_shift,
         number_of_filters, stft_size, lowest_frequency,
         highest_frequency, preemphasis_factor, window)
-    feat = dct(feat, type=2, axis=-1, norm='ortho')[..., :numcep]
+    feat = get_fft_backend().dct(
+        feat, type=2, axis=-1, norm='ortho')[..., :numcep]
     feat = _lifter(feat, ceplifter)
 
     return feat
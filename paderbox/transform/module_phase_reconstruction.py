@@ -1,5 +1,10 @@
+import dataclasses
+
 import numpy as np
+from paderbox.array import segment_axis
+from paderbox.transform.module_fft import get_fft_backend
 from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_stft import _overlap_add
 
 
 def _griffin_lim_step(
@@ -130,3 +135,361 @@ def fast_griffin_lim(
             )
 
     return audio
+
+
+def batch_griffin_lim(
+    x,
+    stft: STFT,
+    *,
+    frames=None,
+    alpha=0.99,
+    iterations=100,
+    tol=None,
+    verbose=False,
+):
+    """Griffin-Lim phase reconstruction for a batch of magnitude spectrograms
+    with early stopping.
+
+    All items are processed together. An item stops, when its spectral
+    convergence (SC)
+
+        ||x - |STFT(ISTFT(y))|||_F / (||x||_F + 1e-5)
+
+    is smaller than tol or after `iterations` iterations. Stopped items are
+    removed from the work buffers, that are allocated once and reused in all
+    iterations. The items are independent, i.e. the result of an item does
+    not depend on the other items (except for the random initialization).
+
+    Args:
+        x: List of magnitude spectrograms with shape (*, frames_b, F) or a
+            zero padded batch with shape (B, *, max(frames), F).
+        stft: paderbox.transform.module_stft.STFT instance
+        frames: Number of frames of each item with shape (B,), if x is a
+            padded batch. Default: All items have x.shape[-2] frames.
+        alpha: Momentum of the fast Griffin-Lim algorithm (see
+            fast_griffin_lim). alpha=0 is the original Griffin-Lim algorithm.
+        iterations: Maximum number of iterations.
+        tol: Stop an item, when its SC is below tol. None disables early
+            stopping.
+        verbose: If True, print the number of active items and their mean SC
+            after each iteration.
+
+    Returns:
+        audio: If x is a list, a list of audio signals with shape
+            (*, num_samples_b), else the zero padded audio signals with shape
+            (B, *, max(num_samples)).
+        iterations: Number of iterations of each item with shape (B,).
+        sc: Spectral convergence of each item after the last iteration with
+            shape (B,).
+
+    >>> stft = STFT(200, 1024, window_length=800, fading=False, pad=True)
+    >>> t = np.arange(16_000) / 16_000
+    >>> sines = [np.sin(2*np.pi*f_0*t[:n]) for f_0, n in [(200, 16000), (400, 8000)]]
+    >>> x = [np.abs(stft(s)) for s in sines]
+    >>> [s.shape for s in x]
+    [(77, 513), (37, 513)]
+    >>> audio, iterations, sc = batch_griffin_lim(x, stft, iterations=5)
+    >>> [a.shape for a in audio], iterations
+    ([(16000,), (8000,)], array([5, 5]))
+    >>> audio, iterations, sc = batch_griffin_lim(x, stft, iterations=1000, tol=0.1)
+    >>> bool(np.all(sc < 0.1)), bool(np.all(iterations < 1000))
+    (True, True)
+    """
+    if not 0. <= alpha <= 1.:
+        raise ValueError(f'alpha must be in [0, 1], but is {alpha}.')
+
+    return_list = isinstance(x, (list, tuple))
+    if return_list:
+        if len(x) == 0:
+            raise ValueError('x is empty.')
+        frames = np.array([np.shape(x_)[-2] for x_ in x])
+        shape = np.shape(x[0])
+        padded = np.zeros((len(x), *shape[:-2], max(frames), shape[-1]))
+        for b, x_ in enumerate(x):
+            padded[b, ..., :frames[b], :] = x_
+        x = padded
+    else:
+        x = np.array(x, dtype=np.float64)
+        if frames is None:
+            frames = np.full(x.shape[0], x.shape[-2])
+        frames = np.asarray(frames)
+    if stft.dtype is not None:
+        x = x.astype(np.finfo(stft.dtype).dtype)
+
+    batch_size = x.shape[0]
+    num_samples = np.array([int(stft.frames_to_samples(f)) for f in frames])
+    independent = (1,) * (x.ndim - 3)
+    frame_mask = (
+        np.arange(x.shape[-2]) < frames[:, None]
+    ).reshape(batch_size, *independent, x.shape[-2], 1)
+    sample_mask = (
+        np.arange(int(stft.frames_to_samples(x.shape[-2])))
+        < num_samples[:, None]
+    ).reshape(batch_size, *independent, -1)
+    x_norm = np.linalg.norm(x.reshape(batch_size, -1), axis=-1) + 1e-5
+
+    # Work buffers, that are reused in all iterations. The active items are
+    # always in the front (i.e. [:active]), order maps them to the items.
+    angle = np.random.uniform(low=-np.pi, high=np.pi, size=x.shape)
+    reconstruction_stft = x * np.exp(1.0j * angle)
+    y = reconstruction_stft.copy()  # Stores accelerated STFT reconstruction
+    rec_stft_ = np.empty_like(y)
+    magnitude = np.empty_like(x)
+    order = np.arange(batch_size)
+    active = batch_size
+
+    audio_out = np.zeros(
+        (batch_size, *x.shape[1:-2], sample_mask.shape[-1]), dtype=x.dtype)
+    iterations_out = np.zeros(batch_size, dtype=int)
+    sc_out = np.full(batch_size, np.nan)
+
+    for n in range(1, iterations + 1):
+        x_, y_, magnitude_ = x[:active], y[:active], magnitude[:active]
+
+        # Discard magnitude part of the reconstruction and use the supplied
+        # magnitude spectrogram instead (y / |y| == exp(1j * angle(y))).
+        np.abs(y_, out=magnitude_)
+        np.divide(y_, magnitude_, out=y_, where=magnitude_ > 0)
+        y_[magnitude_ == 0] = 1
+        y_ *= x_
+        audio = stft.inverse(y_)
+        audio *= sample_mask[:active]
+        stft(audio, out=rec_stft_[:active])
+
+        # Spectral convergence
+        np.abs(rec_stft_[:active], out=magnitude_)
+        magnitude_ -= x_
+        magnitude_ *= frame_mask[:active]
+        sc = np.linalg.norm(
+            magnitude_.reshape(active, -1), axis=-1) / x_norm[:active]
+
+        # Momentum
+        np.subtract(rec_stft_[:active], reconstruction_stft[:active], out=y_)
+        y_ *= alpha
+        y_ += rec_stft_[:active]
+        reconstruction_stft, rec_stft_ = rec_stft_, reconstruction_stft
+
+        if verbose:
+            print(
+                f'Reconstruction iteration: {n}/{iterations} '
+                f'active: {active} mean SC: {10 * np.log10(np.mean(sc))} dB'
+            )
+
+        if n == iterations:
+            done = np.ones(active, dtype=bool)
+        elif tol is not None:
+            done = sc < tol
+        else:
+            continue
+
+        if np.any(done):
+            audio_out[order[:active][done]] = audio[done]
+            iterations_out[order[:active][done]] = n
+            sc_out[order[:active][done]] = sc[done]
+
+            keep = ~done
+            new_active = int(np.sum(keep))
+            for buffer in [
+                x, y, reconstruction_stft, frame_mask, sample_mask, x_norm,
+                order,
+            ]:
+                buffer[:new_active] = buffer[:active][keep]
+            active = new_active
+            if active == 0:
+                break
+
+    if return_list:
+        audio_out = [
+            audio_out[b, ..., :num_samples[b]] for b in range(batch_size)
+        ]
+    return audio_out, iterations_out, sc_out
+
+
+@dataclasses.dataclass
+class RTISILA:
+    """Real-time iterative spectrogram inversion with look-ahead [1].
+
+    Frame-synchronous phase reconstruction: The magnitude frames can be
+    supplied as they arrive. The phases of the last `look_ahead + 1` frames
+    are refined with `iterations` Griffin-Lim iterations after each new
+    frame, considering the already committed (fixed) frames. Afterwards, the
+    oldest frame is committed and its samples are obtained by overlap-add,
+    like in StreamingISTFT. Hence, the algorithmic delay is `look_ahead` frames
+    (plus the overlap of the window).
+
+    The phase of a new frame is initialized with the phase of the partial
+    reconstruction at its position.
+
+    [1]: Zhu, Xinglei, Gerald T. Beauregard, and Lonce L. Wyse. "Real-time
+        signal estimation from modified short-time Fourier transform
+        magnitude spectra." IEEE Transactions on Audio, Speech, and Language
+        Processing 15.5 (2007): 1645-1653.
+
+    Args:
+        stft: paderbox.transform.module_stft.STFT instance, that defines the
+            window, shift and fading.
+        look_ahead: Number of future frames, that are considered for the
+            phase of a frame.
+        iterations: Number of iterations after each new frame.
+
+    >>> stft = STFT(128, 512, fading='full')
+    >>> t = np.arange(8000) / 16000
+    >>> x = np.abs(stft(np.sin(2 * np.pi * 440 * t)))
+    >>> x.shape
+    (66, 257)
+    >>> rtisi = RTISILA(stft, look_ahead=3)
+    >>> signal = [rtisi(x_) for x_ in np.split(x, [1, 2, 10], axis=-2)]
+    >>> [s.shape for s in signal]
+    [(0,), (0,), (512,), (7168,)]
+    >>> signal.append(rtisi.flush())
+    >>> np.concatenate(signal).shape
+    (8064,)
+    """
+    stft: STFT
+    look_ahead: int = 3
+    iterations: int = 4
+
+    def __post_init__(self):
+        plan = self.stft._plan
+        if self.stft.shift > self.stft.window_length:
+            raise ValueError(
+                f'shift ({self.stft.shift}) has to be smaller than the '
+                f'window_length ({self.stft.window_length}).'
+            )
+        self._window = plan.window
+        self._synthesis_window = plan.synthesis_window
+        self._fading_pad_width = plan.fading_pad_width(self.stft.fading)
+        self.reset()
+
+    def reset(self):
+        """Drops the state, i.e. starts a new signal."""
+        # Magnitudes, complex estimates and the synthesized (windowed time
+        # domain) estimates of the frames, that are not committed,
+        # shape (..., frames, F) and (..., frames, window_length).
+        self._magnitude = None
+        self._estimate = None
+        self._frames = None
+        # Overlap-add of the committed frames in the region of the oldest
+        # buffered frame, shape (..., window_length - shift).
+        self._committed = None
+        # Number of fade-in samples, that are not yet dropped.
+        self._skip = self._fading_pad_width[0]
+
+    def _synthesize(self, stft_signal):
+        return self._synthesis_window * get_fft_backend().irfft(
+            stft_signal, n=self.stft.size)[..., :self.stft.window_length]
+
+    def _reconstruct(self, frames, start=0):
+        """Partial reconstruction of the committed and the buffered frames
+        and its STFT at the positions `start, ..., frames - 1` of the
+        buffered frames."""
+        shift, window_length = self.stft.shift, self.stft.window_length
+        time_signal = np.zeros((
+            *self._committed.shape[:-1],
+            (frames - 1) * shift + window_length,
+        ))
+        time_signal[..., :window_length - shift] = self._committed
+        buffered = self._frames.shape[-2]
+        if buffered > 0:
+            _overlap_add(
+                time_signal[..., :(buffered - 1) * shift + window_length],
+                self._frames,
+                shift,
+            )
+        time_signal_seg = segment_axis(
+            time_signal[..., start * shift:], window_length, shift, end='cut')
+        return get_fft_backend().rfft(
+            time_signal_seg * self._window, n=self.stft.size)
+
+    def _phase(self, reconstruction, magnitude):
+        # Same as magnitude * exp(1j * angle(reconstruction)).
+        reconstruction_magnitude = np.abs(reconstruction)
+        phase = np.divide(
+            reconstruction, reconstruction_magnitude,
+            out=np.ones_like(reconstruction),
+            where=reconstruction_magnitude > 0,
+        )
+        return magnitude * phase
+
+    def _commit(self):
+        """Commits the oldest buffered frame and returns its samples."""
+        shift, window_length = self.stft.shift, self.stft.window_length
+        contribution = self._frames[..., 0, :].copy()
+        contribution[..., :window_length - shift] += self._committed
+        self._committed = contribution[..., shift:]
+        self._estimate = self._estimate[..., 1:, :]
+        self._magnitude = self._magnitude[..., 1:, :]
+        self._frames = self._frames[..., 1:, :]
+
+        skip = min(self._skip, shift)
+        self._skip -= skip
+        return contribution[..., skip:shift]
+
+    def _push(self, magnitude):
+        """Adds one magnitude frame with shape (..., 1, F)."""
+        if self._committed is None:
+            self._committed = np.zeros(
+                (*magnitude.shape[:-2],
+                 self.stft.window_length - self.stft.shift))
+            self._magnitude = magnitude[..., :0, :]
+            self._estimate = np.zeros(magnitude[..., :0, :].shape, complex)
+            self._frames = np.zeros(
+                (*magnitude.shape[:-2], 0, self.stft.window_length))
+
+        # Only the new frame is initialized, the synthesized buffered frames
+        # are reused.
+        buffered = self._estimate.shape[-2]
+        estimate = self._phase(
+            self._reconstruct(buffered + 1, start=buffered), magnitude)
+        self._magnitude = np.concatenate([self._magnitude, magnitude], axis=-2)
+        self._estimate = np.concatenate([self._estimate, estimate], axis=-2)
+        self._frames = np.concatenate(
+            [self._frames, self._synthesize(estimate)], axis=-2)
+
+        for _ in range(self.iterations):
+            self._estimate = self._phase(
+                self._reconstruct(buffered + 1), self._magnitude)
+            self._frames = self._synthesize(self._estimate)
+
+    def __call__(self, magnitude):
+        """
+        Args:
+            magnitude: Magnitude frames with shape (..., frames, F). The
+                leading dimensions have to be the same for all blocks of a
+                signal.
+
+        Returns:
+            Time signal with shape (..., samples), that is completed by the
+            committed frames.
+
+        """
+        magnitude = np.asarray(magnitude)
+        assert magnitude.shape[-1] == self.stft.size // 2 + 1, magnitude.shape
+        signal = [np.zeros((*magnitude.shape[:-2], 0))]
+        for index in range(magnitude.shape[-2]):
+            self._push(magnitude[..., index:index + 1, :])
+            if self._estimate.shape[-2] > self.look_ahead:
+                signal.append(self._commit())
+        return np.concatenate(signal, axis=-1)
+
+    def flush(self):
+        """
+        Signals the end of the magnitude frames, commits the remaining
+        frames and returns the remaining samples without the fade-out.
+        Afterwards, the object is reset.
+
+        Returns:
+            Time signal with shape (..., samples).
+
+        """
+        if self._estimate is None:
+            return np.zeros((0,))
+        signal = []
+        while self._estimate.shape[-2] > 0:
+            signal.append(self._commit())
+        signal.append(self._committed[
+            ...,
+            self._skip:self._committed.shape[-1] - self._fading_pad_width[1]
+        ])
+        self.reset()
+        return np.concatenate(signal, axis=-1)
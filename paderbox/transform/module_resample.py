@@ -1,8 +1,13 @@
 """
 This module contains resampling methods.
 """
+import dataclasses
+import functools
+import math
 import subprocess
+
 import numpy as np
+import scipy.signal
 
 
 def resample_sox(signal: np.ndarray, *, in_rate, out_rate, normalize=True):
@@ -147,4 +152,261 @@ def resample_sox(signal: np.ndarray, *, in_rate, out_rate, normalize=True):
 
     return signal_resampled
 
+
+def _get_up_down(in_rate, out_rate):
+    """
+    Returns the reduced ratio (up, down) of the sample rates.
+
+    >>> _get_up_down(16000, 8000)
+    (1, 2)
+    >>> _get_up_down(44100, 16000)
+    (160, 441)
+    """
+    if in_rate != int(in_rate) or out_rate != int(out_rate):
+        raise ValueError(
+            f'The sample rates have to be integers, '
+            f'got in_rate={in_rate} and out_rate={out_rate}.'
+        )
+    in_rate, out_rate = int(in_rate), int(out_rate)
+    if in_rate <= 0 or out_rate <= 0:
+        raise ValueError(
+            f'The sample rates have to be positive, '
+            f'got in_rate={in_rate} and out_rate={out_rate}.'
+        )
+    gcd = math.gcd(in_rate, out_rate)
+    return out_rate // gcd, in_rate // gcd
+
+
+@functools.lru_cache(maxsize=32)
+def _get_polyphase_filter(up, down):
+    """
+    Designs the anti-aliasing lowpass for `resample_polyphase` (same design
+    as the default of `scipy.signal.resample_poly`).
+
+    The filter is prepended with zeros, such that the delay of the filter is
+    a multiple of `down`. The returned offset is the number of output
+    samples that have to be dropped at the beginning for the delay
+    compensation.
+
+    Returns:
+        filter: Read-only float64 array.
+        offset: Delay of the filter in output samples.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = scipy.signal.firwin(
+        2 * half_len + 1, 1 / max_rate, window=('kaiser', 5.0)
+    ) * up
+    n_pre_pad = down - half_len % down
+    h = np.concatenate([np.zeros(n_pre_pad), h])
+    h.setflags(write=False)
+    return h, (half_len + n_pre_pad) // down
+
+
+def resample_polyphase(
+        signal: np.ndarray, *, in_rate, out_rate, axis=-1,
+):
+    """Resample with a polyphase FIR filter (in-process alternative to sox).
+
+    The signal is upsampled by `up`, lowpass filtered and downsampled by
+    `down`, where `up / down` is the reduced ratio of `out_rate / in_rate`.
+    The lowpass is a Kaiser windowed sinc (the default design of
+    `scipy.signal.resample_poly`) and its delay is compensated. The filter
+    design is cached for each pair of sample rates.
+
+    In contrast to `resample_sox`, no subprocess is started, sox does not
+    need to be installed and an arbitrary number of channels is resampled in
+    one call. The values are not identical to sox, because sox uses a
+    different (longer) filter design. For the doctest example of
+    `resample_sox` the difference is below 3e-3 (see
+    tests/transform_tests/test_resample.py).
+
+    >>> signal = np.array([1, -1, 1, -1], dtype=np.float32)
+    >>> resample_polyphase(signal, in_rate=2, out_rate=1)
+    array([ 0.2844886 , -0.13314195], dtype=float32)
+
+    >>> resample_polyphase(signal, in_rate=1, out_rate=1)
+    array([ 1., -1.,  1., -1.], dtype=float32)
+
+    >>> signal = np.random.normal(size=(2, 3, 30))
+    >>> c = resample_polyphase(signal, in_rate=1, out_rate=2)
+    >>> c.shape
+    (2, 3, 60)
+    >>> np.testing.assert_allclose(
+    ...     resample_polyphase(signal[1, 2], in_rate=1, out_rate=2), c[1, 2])
+    >>> resample_polyphase(signal, in_rate=16000, out_rate=8000, axis=-2).shape
+    (2, 2, 30)
+
+    Args:
+        signal: Signal with arbitrary shape, time along `axis`.
+        in_rate: Sample rate of the signal (integer).
+        out_rate: Desired sample rate (integer).
+        axis: Time axis.
+
+    Returns: Resampled version with the same dtype as the input (float64 for
+        non float inputs). The length is `ceil(T * out_rate / in_rate)`.
+
+    """
+    signal = np.asarray(signal)
+    up, down = _get_up_down(in_rate, out_rate)
+    dtype = signal.dtype if signal.dtype.kind == 'f' else np.float64
+
+    if up == down == 1:
+        return signal.astype(dtype, copy=True)
+
+    h, offset = _get_polyphase_filter(up, down)
+    num_samples = signal.shape[axis]
+    num_out = -(-num_samples * up // down)  # ceil
+
+    resampled = scipy.signal.upfirdn(h, signal, up, down, axis=axis)
+    resampled = np.moveaxis(resampled, axis, -1)[..., offset:offset + num_out]
+    if resampled.shape[-1] < num_out:
+        # The filter is shorter than the delay compensation needs, the
+        # missing values are zero.
+        resampled = np.pad(
+            resampled,
+            [(0, 0)] * (resampled.ndim - 1)
+            + [(0, num_out - resampled.shape[-1])]
+        )
+    return np.moveaxis(resampled, -1, axis).astype(dtype, copy=False)
+
+
+@dataclasses.dataclass()
+class StreamingResampler:
+    """
+    Stateful `resample_polyphase` for signals that arrive in chunks (e.g.
+    live streams or long files that are read in blocks).
+
+    Each call consumes an arbitrary number of new samples and returns the
+    output samples that are completely determined by the samples so far.
+    The input samples that are still needed by the polyphase filter are kept
+    as state. The delay between input and output is approximately half the
+    filter length.
+
+    The concatenation of all returned samples (including `flush`) is
+    bit-exact to `resample_polyphase` applied to the concatenated chunks.
+
+    >>> resampler = StreamingResampler(in_rate=16000, out_rate=8000)
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> y = [resampler(c) for c in np.split(x, [10, 100, 5000], axis=-1)]
+    >>> [y_.shape for y_ in y]
+    [(2, 0), (2, 39), (2, 2450), (2, 1500)]
+    >>> y.append(resampler.flush())
+    >>> y[-1].shape
+    (2, 11)
+    >>> np.testing.assert_equal(
+    ...     np.concatenate(y, axis=-1),
+    ...     resample_polyphase(x, in_rate=16000, out_rate=8000))
+    """
+    in_rate: int
+    out_rate: int
+
+    def __post_init__(self):
+        self._up, self._down = _get_up_down(self.in_rate, self.out_rate)
+        if self._up == self._down == 1:
+            self._filter, self._offset = None, 0
+        else:
+            self._filter, self._offset = _get_polyphase_filter(
+                self._up, self._down)
+        self.reset()
+
+    def reset(self):
+        """Drops the buffered samples, i.e. starts a new signal."""
+        self._buffer = None
+        # Index of the first buffered sample in the input signal. It is
+        # always a multiple of down, so the buffer starts at a polyphase
+        # boundary.
+        self._buffer_start = 0
+        self._num_samples = 0
+        self._num_out = 0
+
+    def _resample(self, stop):
+        """Returns the output samples [self._num_out, stop)."""
+        buffer = self._buffer
+        dtype = buffer.dtype if buffer.dtype.kind == 'f' else np.float64
+        if self._filter is None:
+            start = self._num_out - self._buffer_start
+            resampled = buffer[..., start:start + stop - self._num_out]
+            return resampled.astype(dtype, copy=True)
+
+        # Output index n of the whole signal is index
+        # n + offset - buffer_start * up / down of the buffer.
+        shift = self._offset - self._buffer_start * self._up // self._down
+        start, stop = self._num_out + shift, stop + shift
+        resampled = scipy.signal.upfirdn(
+            self._filter, buffer, self._up, self._down, axis=-1
+        )[..., start:stop]
+        if resampled.shape[-1] < stop - start:
+            resampled = np.pad(
+                resampled,
+                [(0, 0)] * (resampled.ndim - 1)
+                + [(0, stop - start - resampled.shape[-1])]
+            )
+        return resampled.astype(dtype, copy=False)
+
+    def _drop_history(self):
+        """Removes the samples that are not needed for the next outputs."""
+        if self._filter is None:
+            needed = self._num_out
+        else:
+            # Smallest input index that contributes to the next output.
+            needed = (
+                (self._num_out + self._offset) * self._down
+                - len(self._filter)
+            ) // self._up + 1
+        start = max(needed // self._down * self._down, self._buffer_start)
+        self._buffer = self._buffer[..., start - self._buffer_start:]
+        self._buffer_start = start
+
+    def __call__(self, chunk):
+        """
+        Args:
+            chunk: time signal chunk with shape (..., samples). The leading
+                dimensions have to be the same for all chunks of a signal.
+
+        Returns:
+            Resampled signal with shape (..., samples), that contains all
+            output samples that do not depend on future input samples.
+
+        """
+        chunk = np.asarray(chunk)
+        if self._buffer is None:
+            self._buffer = chunk
+        else:
+            self._buffer = np.concatenate([self._buffer, chunk], axis=-1)
+        self._num_samples += chunk.shape[-1]
+
+        if self._filter is None:
+            stop = self._num_samples
+        else:
+            # The output n depends on the inputs up to
+            # floor((n + offset) * down / up).
+            stop = max(
+                (self._num_samples * self._up - 1) // self._down
+                - self._offset + 1,
+                self._num_out,
+            )
+        resampled = self._resample(stop)
+        self._num_out = stop
+        self._drop_history()
+        return resampled
+
+    def flush(self):
+        """
+        Signals the end of the signal and returns the remaining samples
+        (i.e. the delayed samples at the end). Afterwards, the object is
+        reset.
+
+        Returns:
+            Resampled signal with shape (..., samples).
+
+        """
+        if self._buffer is None:
+            return np.zeros((0,))
+        stop = -(-self._num_samples * self._up // self._down)  # ceil
+        resampled = self._resample(stop)
+        self.reset()
+        return resampled
+
+
 resample = resample_sox
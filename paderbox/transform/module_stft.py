@@ -1,18 +1,22 @@
 """
 This file contains the STFT function and related helper functions.
 """
+import os
 import string
+import types
 import typing
+import functools
 from math import ceil
 import dataclasses
 
 import numpy as np
-from numpy.fft import rfft, irfft
 from scipy import signal
 
 from paderbox.array import roll_zeropad
 from paderbox.array import segment_axis
+from paderbox.array import segment_axis_parts
 from paderbox.utils.mapping import Dispatcher
+from paderbox.transform.module_fft import get_fft_backend
 
 
 def stft(
@@ -26,6 +30,10 @@ def stft(
         fading: typing.Optional[typing.Union[bool, str]] = 'full',
         pad: bool = True,
         symmetric_window: bool = False,
+        block_frames: int = None,
+        out: np.ndarray = None,
+        dtype=None,
+        workers: int = None,
 ) -> np.array:
     """
     ToDo: Open points:
@@ -55,62 +63,158 @@ def stft(
         periodic. Since the implementation of the windows in scipy.signal have a
         curious behaviour for odd window_length. Use window(len+1)[:-1]. Since
         is equal to the behaviour of MATLAB.
+    :param block_frames: If not None, window and transform at most
+        block_frames frames at once and write them into the output.
+        This bounds the memory of the intermediate windowed frames and
+        yields the same result as without blocks.
+    :param out: Optional preallocated complex array with the shape of the
+        result. If given, the STFT signal is written into this array.
+    :param dtype: Precision of the calculation, e.g. np.float32 or
+        np.complex64 for single precision. The default (None) calculates in
+        double precision. With single precision, the time signal and the
+        window are converted to float32, a single precision FFT is used and
+        the STFT signal is complex64.
+    :param workers: Number of threads for the FFT (see scipy.fft). The
+        transforms of the frames and channels are distributed over the
+        threads. Negative values count from os.cpu_count(). The default
+        (None) uses the single-threaded numpy.fft.
     :return: Single channel complex STFT signal with dimensions
         AA x ... x AZ x T' times size/2+1 times BA x ... x BZ.
+
+    >>> x = np.random.normal(size=(2, 16000))
+    >>> X = stft(x, 512, 128, block_frames=10)
+    >>> X.shape
+    (2, 128, 257)
+    >>> np.testing.assert_equal(X, stft(x, 512, 128))
+    >>> out = np.empty((2, 128, 257), dtype=np.complex128)
+    >>> stft(x, 512, 128, out=out) is out
+    True
+    >>> stft(x.astype(np.float32), 512, 128, dtype=np.float32).dtype
+    dtype('complex64')
     """
-    time_signal = np.asarray(time_signal)
+    real_dtype = _get_real_dtype(dtype)
+    rfft, _ = _get_fft_functions(workers)
+    time_signal = _as_time_signal(time_signal, dtype)
 
     axis = axis % time_signal.ndim
 
     if window_length is None:
         window_length = size
 
-    # Pad with zeros to have enough samples for the window function to fade.
-    assert fading in [None, True, False, 'full', 'half'], fading
-    if fading not in [False, None]:
-        pad_width = np.zeros((time_signal.ndim, 2), dtype=int)
-        if fading == 'half':
-            pad_width[axis, 0] = (window_length - shift) // 2
-            pad_width[axis, 1] = ceil((window_length - shift) / 2)
-        else:
-            pad_width[axis, :] = window_length - shift
-        time_signal = np.pad(time_signal, pad_width, mode='constant')
-
-    window = _get_window(
+    plan = _get_stft_plan(
         window=window,
-        symmetric_window=symmetric_window,
         window_length=window_length,
+        shift=shift,
+        symmetric_window=symmetric_window,
+        dtype=real_dtype,
     )
+    window = plan.window
 
-    time_signal_seg = segment_axis(
+    # Pad with zeros to have enough samples for the window function to fade.
+    # The padding is applied only to the first and last frames, the other
+    # frames are a view on the time signal (i.e. the signal is not copied).
+    assert fading in [None, True, False, 'full', 'half'], fading
+    time_signal_parts = segment_axis_parts(
         time_signal,
         window_length,
         shift=shift,
         axis=axis,
-        end='pad' if pad else 'cut'
+        end='pad' if pad else 'cut',
+        pad_width=plan.fading_pad_width(fading),
     )
+    seg_shape = list(time_signal_parts[1].shape)
+    seg_shape[axis] = sum(p.shape[axis] for p in time_signal_parts)
 
-    letters = string.ascii_lowercase[:time_signal_seg.ndim]
-    mapping = letters + ',' + letters[axis + 1] + '->' + letters
+    mapping = plan.einsum_mapping(len(seg_shape), axis)
 
-    try:
-        # ToDo: Implement this more memory efficient
-        return rfft(
-            np.einsum(mapping, time_signal_seg, window),
-            n=size,
-            axis=axis + 1,
+    shape = list(seg_shape)
+    shape[axis + 1] = size // 2 + 1
+    if out is not None and out.shape != tuple(shape):
+        raise ValueError(
+            f'out.shape {out.shape} does not match the shape of the '
+            f'stft {tuple(shape)}.'
         )
+
+    try:
+        if block_frames is None and out is None:
+            return rfft(
+                _windowed_frames(
+                    time_signal_parts, window, axis, mapping,
+                    0, seg_shape[axis],
+                ),
+                n=size,
+                axis=axis + 1,
+            )
+
+        if out is None:
+            out = np.empty(
+                shape, dtype=np.result_type(real_dtype, np.complex64))
+
+        frames = seg_shape[axis]
+        if block_frames is None:
+            block_frames = max(frames, 1)
+        for start in range(0, frames, block_frames):
+            stop = min(start + block_frames, frames)
+            index = (slice(None),) * axis + (slice(start, stop),)
+            out[index] = rfft(
+                _windowed_frames(
+                    time_signal_parts, window, axis, mapping, start, stop),
+                n=size,
+                axis=axis + 1,
+            )
+        return out
     except ValueError as e:
         raise ValueError(
             f'Could not calculate the stft, something does not match.\n'
             f'mapping: {mapping}, '
-            f'time_signal_seg.shape: {time_signal_seg.shape}, '
+            f'time_signal_seg.shape: {tuple(seg_shape)}, '
             f'window.shape: {window.shape}, '
             f'size: {size}'
             f'axis+1: {axis+1}'
         ) from e
 
 
+def _windowed_frames(parts, window, axis, mapping, start, stop):
+    """
+    Applies the window to the frames [start, stop) of the segmented time
+    signal, that is split into parts (see `segment_axis_parts`).
+
+    >>> x = np.arange(10.)
+    >>> parts = segment_axis_parts(x, 4, 2, pad_width=(2, 2))
+    >>> _windowed_frames(parts, np.ones(4), 0, 'ab,b->ab', 1, 5)
+    array([[0., 1., 2., 3.],
+           [2., 3., 4., 5.],
+           [4., 5., 6., 7.],
+           [6., 7., 8., 9.]])
+    """
+    def index(start, stop):
+        return (slice(None),) * axis + (slice(start, stop),)
+
+    offset = 0
+    selected = []
+    for part in parts:
+        frames = part.shape[axis]
+        lo, hi = max(start - offset, 0), min(stop - offset, frames)
+        if lo < hi:
+            selected.append(part[index(lo, hi)])
+        offset += frames
+
+    if len(selected) == 1:
+        return np.einsum(mapping, selected[0], window)
+
+    shape = list(parts[1].shape)
+    shape[axis] = stop - start
+    windowed = np.empty(
+        shape, dtype=np.result_type(parts[1].dtype, window.dtype))
+    offset = 0
+    for part in selected:
+        frames = part.shape[axis]
+        np.einsum(
+            mapping, part, window, out=windowed[index(offset, offset + frames)])
+        offset += frames
+    return windowed
+
+
 def stft_with_kaldi_dimensions(
         time_signal,
         size: int = 512,
@@ -154,6 +258,481 @@ def stft_with_kaldi_dimensions(
     )
 
 
+def stft_batch(
+        time_signals,
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        window_length: int = None,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        dtype=None,
+        workers: int = None,
+        return_list: bool = False,
+):
+    """
+    Calculates the STFT of a list of signals with different lengths.
+
+    The frames of all signals are packed into one frame matrix and
+    transformed with a single FFT call, i.e. no FFTs are wasted on the
+    padding of short signals.
+
+    Args:
+        time_signals: List of time signals with shape (..., T_b). The leading
+            dimensions (e.g. channels) have to be equal for all signals.
+        size: See stft.
+        shift: See stft.
+        window: See stft.
+        window_length: See stft.
+        fading: See stft.
+        pad: See stft.
+        symmetric_window: See stft.
+        dtype: See stft.
+        workers: See stft.
+        return_list: If True, return a list of the STFT signals with shapes
+            (..., frames_b, size // 2 + 1). The list entries are views into
+            one packed buffer.
+
+    Returns:
+        If return_list is False, the zero padded STFT signals with shape
+        (B, ..., max(frames), size // 2 + 1) and the number of frames of each
+        signal with shape (B,). The number of frames is the same as for stft
+        (see `_num_stft_frames`).
+
+    >>> signals = [np.random.normal(size=(2, n)) for n in [8000, 3000, 12345]]
+    >>> X, frames = stft_batch(signals, 512, 128)
+    >>> X.shape
+    (3, 2, 100, 257)
+    >>> frames
+    array([ 66,  27, 100])
+    >>> np.testing.assert_equal(X[1, :, :27], stft(signals[1], 512, 128))
+    >>> [X.shape for X in stft_batch(signals, 512, 128, return_list=True)]
+    [(2, 66, 257), (2, 27, 257), (2, 100, 257)]
+    """
+    real_dtype = _get_real_dtype(dtype)
+    rfft, _ = _get_fft_functions(workers)
+
+    if window_length is None:
+        window_length = size
+
+    plan = _get_stft_plan(
+        window=window,
+        window_length=window_length,
+        shift=shift,
+        symmetric_window=symmetric_window,
+        dtype=real_dtype,
+    )
+
+    # Segment each signal like stft, i.e. only the first and last frames are
+    # padded (see segment_axis_parts).
+    assert fading in [None, True, False, 'full', 'half'], fading
+    time_signals_parts = []
+    frames = []
+    for time_signal in time_signals:
+        time_signal = _as_time_signal(time_signal, dtype)
+        frames.append(_num_stft_frames(
+            time_signal.shape[-1], window_length, shift, pad=pad,
+            fading=fading,
+        ))
+        time_signals_parts.append(segment_axis_parts(
+            time_signal, window_length, shift=shift, axis=-1,
+            end='pad' if pad else 'cut',
+            pad_width=plan.fading_pad_width(fading),
+        ))
+
+    if len(time_signals_parts) == 0:
+        raise ValueError('time_signals is empty.')
+    independent_shapes = [parts[1].shape[:-2] for parts in time_signals_parts]
+    independent_shape = independent_shapes[0]
+    if any(shape != independent_shape for shape in independent_shapes):
+        raise ValueError(
+            f'All signals need the same leading dimensions, got '
+            f'{independent_shapes}.'
+        )
+
+    frames = np.array(frames, dtype=int)
+    boundaries = np.concatenate([[0], np.cumsum(frames)])
+
+    packed = np.empty(
+        (*independent_shape, boundaries[-1], window_length), dtype=real_dtype)
+    mapping = plan.einsum_mapping(len(independent_shape) + 2,
+                                  len(independent_shape))
+    for start, parts in zip(boundaries[:-1], time_signals_parts):
+        for part in parts:
+            stop = start + part.shape[-2]
+            np.einsum(mapping, part, plan.window,
+                      out=packed[..., start:stop, :])
+            start = stop
+    packed = rfft(packed, n=size, axis=-1)
+
+    if return_list:
+        return [
+            packed[..., start:stop, :]
+            for start, stop in zip(boundaries[:-1], boundaries[1:])
+        ]
+
+    stft_signal = np.zeros(
+        (len(frames), *independent_shape, np.max(frames), size // 2 + 1),
+        dtype=packed.dtype,
+    )
+    for b, (start, stop) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        stft_signal[b, ..., :stop - start, :] = packed[..., start:stop, :]
+    return stft_signal, frames
+
+
+def stft_frame_range(
+        time_signal,
+        start: int,
+        stop: int,
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        axis=-1,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        window_length: int = None,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        offset: int = 0,
+        num_samples: int = None,
+        dtype=None,
+        workers: int = None,
+):
+    """
+    Calculates only the frames [start, stop) of the STFT, that stft would
+    yield for the full signal (same fading and pad semantics).
+
+    Only the samples that these frames need are read from time_signal, i.e.
+    the costs are proportional to the number of frames and not to the signal
+    length.
+
+    Args:
+        time_signal: Time signal with the time on `axis`. Either the full
+            signal or a part of it (e.g. a sliced `load_audio` read), see
+            `offset` and `num_samples`.
+        start: First frame. Negative values count from the end.
+        stop: Stop frame (exclusive). Negative values count from the end.
+        size: See stft.
+        shift: See stft.
+        axis: See stft.
+        window: See stft.
+        window_length: See stft.
+        fading: See stft.
+        pad: See stft.
+        symmetric_window: See stft.
+        offset: Index of the first sample of time_signal in the full signal.
+        num_samples: Number of samples of the full signal. Necessary to
+            know the number of frames, when time_signal is only a part of
+            the full signal. Default: offset + time_signal.shape[axis].
+        dtype: See stft.
+        workers: See stft.
+
+    Returns:
+        STFT signal with stop - start frames on axis.
+
+    >>> x = np.random.normal(size=(2, 16000))
+    >>> X = stft(x, 512, 128)
+    >>> X.shape
+    (2, 128, 257)
+    >>> np.testing.assert_equal(stft_frame_range(x, 10, 20, 512, 128), X[:, 10:20])
+    >>> np.testing.assert_equal(stft_frame_range(x, -5, None, 512, 128), X[:, -5:])
+
+    Only read the samples, that are necessary (e.g. with load_audio):
+
+    >>> sample_start, sample_stop = stft_frame_range_to_sample_range(
+    ...     10, 20, 512, 128, num_samples=16000)
+    >>> sample_start, sample_stop
+    (896, 2560)
+    >>> np.testing.assert_equal(stft_frame_range(
+    ...     x[:, sample_start:sample_stop], 10, 20, 512, 128,
+    ...     offset=sample_start, num_samples=16000,
+    ... ), X[:, 10:20])
+
+    A signal, that is shorter than the window, yields one (padded) frame:
+
+    >>> x = np.random.normal(size=(2, 200))
+    >>> X = stft(x, 512, 160, window_length=400, fading=False)
+    >>> X.shape
+    (2, 1, 257)
+    >>> np.testing.assert_equal(stft_frame_range(
+    ...     x, 0, None, 512, 160, window_length=400, fading=False), X)
+    >>> stft_frame_range_to_sample_range(
+    ...     0, None, 400, 160, fading=False, num_samples=200)
+    (0, 200)
+    """
+    real_dtype = _get_real_dtype(dtype)
+    rfft, _ = _get_fft_functions(workers)
+    time_signal = np.asarray(time_signal)
+
+    axis = axis % time_signal.ndim
+
+    if window_length is None:
+        window_length = size
+    if num_samples is None:
+        num_samples = offset + time_signal.shape[axis]
+
+    plan = _get_stft_plan(
+        window=window,
+        window_length=window_length,
+        shift=shift,
+        symmetric_window=symmetric_window,
+        dtype=real_dtype,
+    )
+
+    frames = _num_stft_frames(
+        num_samples, window_length, shift, pad=pad, fading=fading)
+    start, stop, _ = slice(start, stop).indices(frames)
+    stop = max(start, stop)
+
+    # Sample range of the frames in the full signal, including the fading
+    # zeros (negative indices and indices >= num_samples).
+    first, last = _stft_frame_range_bounds(
+        start, stop, window_length, shift, fading)
+    sample_start = min(max(first, 0), num_samples)
+    sample_stop = max(min(last, num_samples), sample_start)
+    if (
+            sample_start < offset
+            or sample_stop > offset + time_signal.shape[axis]
+    ):
+        raise ValueError(
+            f'The frames [{start}, {stop}) need the samples '
+            f'[{sample_start}, {sample_stop}), but time_signal contains only '
+            f'the samples [{offset}, {offset + time_signal.shape[axis]}).'
+        )
+
+    shape = list(time_signal.shape)
+    if stop == start:
+        shape[axis:axis + 1] = [0, size // 2 + 1]
+        return np.zeros(shape, dtype=np.result_type(real_dtype, np.complex64))
+    shape[axis] = last - first
+    buffer = np.zeros(shape, dtype=real_dtype)
+    buffer_index = [slice(None)] * buffer.ndim
+    buffer_index[axis] = slice(
+        sample_start - first, sample_stop - first)
+    signal_index = [slice(None)] * buffer.ndim
+    signal_index[axis] = slice(sample_start - offset, sample_stop - offset)
+    buffer[tuple(buffer_index)] = time_signal[tuple(signal_index)]
+
+    time_signal_seg = segment_axis(
+        buffer, window_length, shift=shift, axis=axis, end='cut')
+
+    mapping = plan.einsum_mapping(time_signal_seg.ndim, axis)
+    return rfft(
+        np.einsum(mapping, time_signal_seg, plan.window),
+        n=size,
+        axis=axis + 1,
+    )
+
+
+def stft_frame_range_to_sample_range(
+        start: int,
+        stop: int,
+        window_length: int,
+        shift: int,
+        *,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        num_samples: int = None,
+):
+    """
+    Calculates the sample range [sample_start, sample_stop), that the STFT
+    frames [start, stop) need (see stft_frame_range).
+
+    Args:
+        start: First frame. Negative values count from the end (needs
+            num_samples).
+        stop: Stop frame (exclusive).
+        window_length: See stft.
+        shift: See stft.
+        fading: See stft.
+        pad: See stft.
+        num_samples: Number of samples of the full signal. If not None, the
+            sample range is clipped to [0, num_samples].
+
+    Returns:
+        sample_start, sample_stop
+
+    >>> stft_frame_range_to_sample_range(0, 1, 512, 128)
+    (0, 128)
+    >>> stft_frame_range_to_sample_range(3, 5, 512, 128, fading=None)
+    (384, 1024)
+    >>> stft_frame_range_to_sample_range(120, None, 512, 128, num_samples=16000)
+    (14976, 16000)
+    """
+    if num_samples is not None:
+        frames = _num_stft_frames(
+            num_samples, window_length, shift, pad=pad, fading=fading)
+        start, stop, _ = slice(start, stop).indices(frames)
+        stop = max(start, stop)
+    elif start < 0 or stop is None or stop < 0:
+        raise ValueError(
+            f'Negative or missing frame indices ({start}, {stop}) need '
+            f'num_samples.'
+        )
+
+    first, last = _stft_frame_range_bounds(
+        start, stop, window_length, shift, fading)
+    sample_start = max(first, 0)
+    sample_stop = max(last, sample_start)
+    if num_samples is not None:
+        sample_start = min(sample_start, num_samples)
+        sample_stop = min(sample_stop, num_samples)
+    return sample_start, sample_stop
+
+
+def stft_to_npy(
+        source,
+        file,
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        window_length: int = None,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        block_frames: int = 4096,
+        channel=None,
+        dtype=None,
+        workers: int = None,
+):
+    """
+    Out-of-core STFT: Calculates the STFT of a long signal block by block and
+    writes the frames into a memory-mapped `.npy` file.
+
+    Only block_frames frames and the samples that they need are in memory
+    at the same time, independent of the signal length. The frames are
+    identical to `stft(load_audio(source), ...)`, because each block is
+    calculated with stft_frame_range, that carries the overlap across the
+    block boundaries.
+
+    Args:
+        source: Audio file (read block wise with `load_audio(start=, stop=)`)
+            or an array with the time on the last axis (e.g. np.memmap).
+        file: Path of the `.npy` file for the STFT signal.
+        size: See stft.
+        shift: See stft.
+        window: See stft.
+        window_length: See stft.
+        fading: See stft.
+        pad: See stft.
+        symmetric_window: See stft.
+        block_frames: Number of frames that are calculated at once.
+        channel: Channel selection, when source is an audio file. See
+            load_audio.
+        dtype: See stft.
+        workers: See stft.
+
+    Returns:
+        Memory-mapped STFT signal with shape (..., frames, size // 2 + 1).
+
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> x = np.random.normal(size=(2, 16000))
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     X = stft_to_npy(x, Path(tmp_dir) / 'stft.npy', 512, 128,
+    ...                     block_frames=10)
+    ...     print(X.shape)
+    ...     np.testing.assert_equal(X, stft(x, 512, 128))
+    ...     X = stft_to_npy(x[:, :200], Path(tmp_dir) / 'short.npy', 512, 160,
+    ...                     window_length=400, fading=False)
+    ...     print(X.shape)
+    (2, 128, 257)
+    (2, 1, 257)
+    """
+    real_dtype = _get_real_dtype(dtype)
+
+    if window_length is None:
+        window_length = size
+
+    if isinstance(source, (str, os.PathLike)):
+        import soundfile
+        from paderbox.io.audioread import load_audio
+        num_samples = soundfile.info(str(source)).frames
+
+        def read(start, stop):
+            return load_audio(source, start=start, stop=stop, channel=channel)
+    else:
+        num_samples = np.shape(source)[-1]
+
+        def read(start, stop):
+            return source[..., start:stop]
+
+    frames = _num_stft_frames(
+        num_samples, window_length, shift, pad=pad, fading=fading)
+    kwargs = dict(
+        size=size,
+        shift=shift,
+        window=window,
+        window_length=window_length,
+        fading=fading,
+        pad=pad,
+        symmetric_window=symmetric_window,
+        num_samples=num_samples,
+        dtype=real_dtype,
+        workers=workers,
+    )
+
+    stft_signal = None
+    for start in range(0, max(frames, 1), block_frames):
+        stop = min(start + block_frames, frames)
+        sample_start, sample_stop = stft_frame_range_to_sample_range(
+            start, stop, window_length, shift,
+            fading=fading, pad=pad, num_samples=num_samples,
+        )
+        block = stft_frame_range(
+            read(sample_start, sample_stop), start, stop,
+            offset=sample_start, **kwargs,
+        )
+        if stft_signal is None:
+            stft_signal = np.lib.format.open_memmap(
+                file, mode='w+', dtype=block.dtype,
+                shape=(*block.shape[:-2], frames, block.shape[-1]),
+            )
+        stft_signal[..., start:stop, :] = block
+    stft_signal.flush()
+    return stft_signal
+
+
+def _stft_frame_range_bounds(start, stop, window_length, shift, fading):
+    """
+    Sample range [first, last) of the frames [start, stop) in the signal
+    without the fading zeros, i.e. first may be negative and last may be
+    larger than the number of samples.
+
+    >>> _stft_frame_range_bounds(0, 2, 16, 4, 'full')
+    (-12, 8)
+    >>> _stft_frame_range_bounds(2, 2, 16, 4, None)
+    (8, 8)
+    """
+    first = start * shift - _fading_pad_width(window_length, shift, fading)[0]
+    if stop <= start:
+        return first, first
+    return first, first + (stop - start - 1) * shift + window_length
+
+
+def _fading_pad_width(window_length, shift, fading):
+    """
+    Number of zeros that are padded in front of and behind the signal for
+    the fading.
+
+    >>> _fading_pad_width(400, 160, 'full'), _fading_pad_width(400, 160, 'half')
+    ((240, 240), (120, 120))
+    >>> _fading_pad_width(400, 160, False)
+    (0, 0)
+    """
+    assert fading in [None, True, False, 'full', 'half'], fading
+    if fading in [None, False]:
+        return 0, 0
+    pad_width = window_length - shift
+    if fading == 'half':
+        return pad_width // 2, ceil(pad_width / 2)
+    else:
+        return pad_width, pad_width
+
+
 _window_dispatcher = Dispatcher({
     'blackman': signal.windows.blackman,
     'hann': signal.windows.hann,
@@ -172,13 +751,77 @@ _window_dispatcher = Dispatcher({
 })
 
 
-def _get_window(window, symmetric_window, window_length):
+def _get_real_dtype(dtype):
+    """Returns the real dtype for the precision of an STFT calculation.
+
+    >>> _get_real_dtype(None)
+    dtype('float64')
+    >>> _get_real_dtype(np.complex64)
+    dtype('float32')
+    >>> _get_real_dtype('float32')
+    dtype('float32')
+    """
+    if dtype is None:
+        return np.dtype(np.float64)
+    real_dtype = np.finfo(dtype).dtype
+    if real_dtype not in [np.float32, np.float64]:
+        raise TypeError(
+            f'Only single and double precision are supported, got {dtype}.')
+    return real_dtype
+
+
+def _as_time_signal(time_signal, dtype):
+    """
+    Converts the time signal to the precision of the calculation, if dtype
+    is given. Otherwise, the signal is used as it is, e.g. float32 or int16
+    signals are promoted by the (double precision) window.
+
+    >>> _as_time_signal([1, 2], None).dtype
+    dtype('int64')
+    >>> _as_time_signal([1, 2], np.float32).dtype
+    dtype('float32')
+    >>> _as_time_signal([1j, 2], np.float32)
+    Traceback (most recent call last):
+    ...
+    TypeError: Expected a real valued time signal, got complex128.
+    """
+    time_signal = np.asarray(time_signal)
+    if dtype is None:
+        return time_signal
+    if np.iscomplexobj(time_signal):
+        raise TypeError(
+            f'Expected a real valued time signal, got {time_signal.dtype}.')
+    return time_signal.astype(_get_real_dtype(dtype), copy=False)
+
+
+def _get_fft_functions(workers=None):
+    """Returns rfft and irfft of the current FFT backend (see module_fft).
+
+    The output precision follows the input precision. With the default
+    backend, numpy.fft is used for double precision (keeps the results of
+    older versions) and scipy.fft for single precision, because numpy.fft
+    calculates always in double precision.
+
+    numpy.fft is single-threaded. When workers is not None, the default
+    backend uses scipy.fft, that distributes the independent transforms
+    (e.g. frames, channels) over `workers` threads. Negative values count
+    from os.cpu_count(), e.g. -1 uses all cores.
+    """
+    backend = get_fft_backend()
+    return (
+        functools.partial(backend.rfft, workers=workers),
+        functools.partial(backend.irfft, workers=workers),
+    )
+
+
+def _get_window(window, symmetric_window, window_length, dtype=None):
     """Returns the window.
 
     Args:
         window: callable or str
         symmetric_window:
         window_length:
+        dtype: If not None, the dtype of the returned window.
 
     Returns:
         1D Array of length window_length.
@@ -187,6 +830,8 @@ def _get_window(window, symmetric_window, window_length):
     array([0. , 0.5, 1. , 0.5])
     >>> _get_window('hann', True, 4)  # uncommon stft window, common for filter
     array([0.  , 0.75, 0.75, 0.  ])
+    >>> _get_window('hann', False, 4, dtype=np.float32)
+    array([0. , 0.5, 1. , 0.5], dtype=float32)
     """
 
     if callable(window):
@@ -202,9 +847,153 @@ def _get_window(window, symmetric_window, window_length):
         # https://github.com/scipy/scipy/issues/4551
         window = window(window_length + 1)[:-1]
 
+    if dtype is not None:
+        window = window.astype(dtype, copy=False)
+
     return window
 
 
+@dataclasses.dataclass(frozen=True)
+class _STFTPlan:
+    """
+    Precomputed values of an STFT configuration, that are independent of the
+    signal. The arrays are read-only, because the plans are cached and
+    shared.
+
+    Attributes:
+        window: Analysis window with shape (window_length,).
+        window_length:
+        shift:
+        fading_pad_widths: The pad widths for each fading option, see
+            `fading_pad_width`.
+        einsum_mappings: The einsum mappings to apply the window, that
+            have been used so far, see `einsum_mapping`.
+    """
+    window: np.ndarray
+    window_length: int
+    shift: int
+    fading_pad_widths: typing.Mapping = None
+    einsum_mappings: dict = dataclasses.field(
+        default_factory=dict, repr=False, compare=False)
+    # The analysis window before the cast to the dtype.
+    _window_float64: np.ndarray = dataclasses.field(
+        default=None, repr=False, compare=False)
+
+    @classmethod
+    def create(cls, window, window_length, shift, symmetric_window, dtype):
+        analysis_window = _get_window(
+            window=window,
+            symmetric_window=symmetric_window,
+            window_length=window_length,
+        )
+        analysis_window.setflags(write=False)
+        return cls(
+            window=analysis_window.astype(dtype, copy=False),
+            window_length=window_length,
+            shift=shift,
+            fading_pad_widths=types.MappingProxyType({
+                fading: _fading_pad_width(window_length, shift, fading)
+                for fading in [None, True, False, 'full', 'half']
+            }),
+            _window_float64=analysis_window,
+        )
+
+    @functools.cached_property
+    def synthesis_window(self):
+        """
+        Biorthogonal synthesis window with shape (window_length,).
+
+        It is calculated on the first access, because only the inverse
+        transforms need it.
+
+        >>> plan = _get_stft_plan('hann', 4, 2)
+        >>> 'synthesis_window' in vars(plan)
+        False
+        >>> plan.synthesis_window
+        array([0., 1., 1., 1.])
+        >>> 'synthesis_window' in vars(plan)
+        True
+        """
+        synthesis_window = _biorthogonal_window_fastest(
+            self._window_float64, self.shift).astype(self.window.dtype)
+        synthesis_window.setflags(write=False)
+        return synthesis_window
+
+    def fading_pad_width(self, fading):
+        """
+        Number of zeros that are padded in front of and behind the signal
+        for the fading.
+
+        >>> plan = _get_stft_plan('blackman', 400, 160)
+        >>> plan.fading_pad_width('full'), plan.fading_pad_width('half')
+        ((240, 240), (120, 120))
+        >>> plan.fading_pad_width(False)
+        (0, 0)
+        """
+        try:
+            return self.fading_pad_widths[fading]
+        except KeyError:
+            raise AssertionError(fading) from None
+
+    def einsum_mapping(self, ndim, axis):
+        """
+        The einsum mapping to apply the window to the segmented time signal
+        with ndim dimensions and the frames on axis.
+
+        >>> plan = _get_stft_plan('blackman', 400, 160)
+        >>> plan.einsum_mapping(3, 1)
+        'abc,c->abc'
+        >>> plan.einsum_mappings[3, 1]
+        'abc,c->abc'
+        """
+        try:
+            return self.einsum_mappings[ndim, axis]
+        except KeyError:
+            letters = string.ascii_lowercase[:ndim]
+            mapping = letters + ',' + letters[axis + 1] + '->' + letters
+            self.einsum_mappings[ndim, axis] = mapping
+            return mapping
+
+
+@functools.lru_cache(maxsize=128)
+def _get_stft_plan_cached(window, window_length, shift, symmetric_window,
+                          dtype):
+    return _STFTPlan.create(
+        window, window_length, shift, symmetric_window, dtype)
+
+
+def _get_stft_plan(
+        window, window_length, shift, symmetric_window=False, dtype=None
+):
+    """
+    Returns the (cached) _STFTPlan, i.e. the analysis window and the
+    synthesis window.
+
+    The windows are pure functions of the arguments. Calculating them can be
+    a significant part of the runtime for short signals, hence the last plans
+    are cached. Windows that are not hashable (e.g. a np.ndarray) are not
+    cached.
+
+    >>> plan = _get_stft_plan('hann', 4, 2)
+    >>> plan.window
+    array([0. , 0.5, 1. , 0.5])
+    >>> plan is _get_stft_plan('hann', 4, 2)
+    True
+    >>> plan.window[0] = 1
+    Traceback (most recent call last):
+    ...
+    ValueError: assignment destination is read-only
+    """
+    dtype = _get_real_dtype(dtype)
+    try:
+        hash(window)
+    except TypeError:
+        return _STFTPlan.create(
+            window, window_length, shift, symmetric_window, dtype)
+    return _get_stft_plan_cached(
+        window, window_length, shift, symmetric_window, dtype)
+
+
 def _samples_to_stft_frames(
         samples,
         size,
@@ -284,6 +1073,29 @@ def _samples_to_stft_frames(
     return frames
 
 
+def _num_stft_frames(samples, window_length, shift, *, pad, fading):
+    """
+    Number of frames, that stft yields for a signal with samples samples.
+
+    In contrast to `_samples_to_stft_frames`, this considers that stft pads a
+    signal, that is shorter than the window, to one frame (pad=True).
+
+    >>> _num_stft_frames(200, 400, 160, pad=True, fading=False)
+    1
+    >>> _samples_to_stft_frames(200, 400, 160, pad=True, fading=False)
+    0
+    >>> stft(np.zeros(200), 512, 160, window_length=400, fading=False).shape
+    (1, 257)
+    >>> _num_stft_frames(200, 400, 160, pad=False, fading=False)
+    0
+    >>> _num_stft_frames(21, 16, 4, pad=True, fading='full')
+    9
+    """
+    frames = _samples_to_stft_frames(
+        samples, window_length, shift, pad=pad, fading=fading)
+    return max(frames, 1 if pad else 0)
+
+
 def _stft_frames_to_samples(
         frames, size, shift, fading=None
 ):
@@ -565,6 +1377,65 @@ def _biorthogonal_window_brute_force(analysis_window, shift,
 _biorthogonal_window_fastest = _biorthogonal_window_brute_force
 
 
+def _overlap_add_unbuffered(time_signal, frames, shift):
+    """
+    Reference implementation of `_overlap_add` with the unbuffered `np.add.at`.
+    """
+    time_signal_seg = segment_axis(
+        time_signal, frames.shape[-1], shift, end=None
+    )
+    np.add.at(time_signal_seg, ..., frames)
+
+
+def _overlap_add(time_signal, frames, shift):
+    """
+    Inplace overlap-add of `frames` with the hop size `shift` to
+    `time_signal`.
+
+    The frames are split into `ceil(window_length / shift)` phase groups,
+    i.e. the parts `frames[..., k * shift:(k + 1) * shift]`. Within one phase
+    group the parts do not overlap, hence they can be added with an ordinary
+    vectorized add. The phase groups are added in reversed order, so that
+    each sample accumulates its contributions in the order of the frames.
+    Hence, the result is numerically identical to the unbuffered
+    `np.add.at` (`_overlap_add_unbuffered`), which is used as fallback, when
+    there are fewer frames than phase groups.
+
+    Args:
+        time_signal: Array with shape
+            (..., frames * shift + window_length - shift)
+        frames: Array with shape (..., frames, window_length)
+        shift: Hop size in samples.
+
+    >>> frames = np.arange(1, 16).reshape(3, 5)
+    >>> time_signal = np.zeros(3 * 2 + 5 - 2, dtype=int)
+    >>> _overlap_add(time_signal, frames, 2)
+    >>> time_signal
+    array([ 1,  2,  9, 11, 24, 21, 23, 14, 15])
+    >>> time_signal = np.zeros(3 * 2 + 5 - 2, dtype=int)
+    >>> _overlap_add_unbuffered(time_signal, frames, 2)
+    >>> time_signal
+    array([ 1,  2,  9, 11, 24, 21, 23, 14, 15])
+    """
+    num_frames, window_length = frames.shape[-2:]
+    assert time_signal.shape[-1] == (
+        (num_frames - 1) * shift + window_length
+    ), (time_signal.shape, frames.shape, shift)
+
+    phase_groups = ceil(window_length / shift)
+    if num_frames < phase_groups:
+        return _overlap_add_unbuffered(time_signal, frames, shift)
+
+    for k in reversed(range(phase_groups)):
+        start = k * shift
+        stop = min(start + shift, window_length)
+        time_signal_seg = segment_axis(
+            time_signal[..., start:start + (num_frames - 1) * shift + stop - start],
+            stop - start, shift, end=None,
+        )
+        time_signal_seg += frames[..., start:stop]
+
+
 def istft(
         stft_signal,
         size: int=1024,
@@ -576,6 +1447,8 @@ def istft(
         symmetric_window: bool=False,
         num_samples: int=None,
         pad: bool=True,
+        dtype=None,
+        workers: int=None,
 ):
     """
     Calculated the inverse short time Fourier transform to exactly reconstruct
@@ -606,26 +1479,37 @@ def istft(
     :param pad: Necessary when num_samples is not None. This arguments is only
         for the forward transform nessesary and not for the inverse.
         Here it is used, to check that num_samples is valid.
+    :param dtype: Precision of the calculation, e.g. np.float32 or
+        np.complex64 for single precision. The default (None) calculates in
+        double precision. With single precision, the time signal is float32.
+    :param workers: Number of threads for the inverse FFT. See stft.
 
     :return: Single channel complex STFT signal
     :return: Single channel time signal.
+
+    >>> X = stft(np.random.normal(size=16000), 512, 128, dtype=np.float32)
+    >>> istft(X, 512, 128, dtype=np.float32).dtype
+    dtype('float32')
     """
     # Note: frame_axis and frequency_axis would make this function much more
     #       complicated
-    stft_signal = np.array(stft_signal)
+    real_dtype = _get_real_dtype(dtype)
+    _, irfft = _get_fft_functions(workers)
+    stft_signal = np.asarray(
+        stft_signal, dtype=np.result_type(real_dtype, np.complex64))
 
     assert stft_signal.shape[-1] == size // 2 + 1, str(stft_signal.shape)
 
     if window_length is None:
         window_length = size
 
-    window = _get_window(
+    window = _get_stft_plan(
         window=window,
-        symmetric_window=symmetric_window,
         window_length=window_length,
-    )
-
-    window = _biorthogonal_window_fastest(window, shift)
+        shift=shift,
+        symmetric_window=symmetric_window,
+        dtype=real_dtype,
+    ).synthesis_window
 
     # window = _biorthogonal_window_fastest(
     #     window, shift, use_amplitude_for_biorthogonal_window)
@@ -634,20 +1518,16 @@ def istft(
 
     time_signal = np.zeros(
         (*stft_signal.shape[:-2],
-         stft_signal.shape[-2] * shift + window_length - shift))
-
-    # Get the correct view to time_signal
-    time_signal_seg = segment_axis(
-        time_signal, window_length, shift, end=None
+         stft_signal.shape[-2] * shift + window_length - shift),
+        dtype=real_dtype,
     )
 
-    # Unbuffered inplace add
-    np.add.at(
-        time_signal_seg,
-        ...,
+    _overlap_add(
+        time_signal,
         window * np.real(
             irfft(stft_signal, n=size)
-        )[..., :window_length]
+        )[..., :window_length],
+        shift,
     )
     # The [..., :window_length] is the inverse of the window padding in rfft.
 
@@ -744,6 +1624,15 @@ class STFT:
     >>> x = stft(audio_data)
     >>> x.shape
     (53, 257)
+
+    With dtype=np.float32 all calculations are done in single precision:
+
+    >>> stft = STFT(160, 512, fading='full', dtype=np.float32)
+    >>> x = stft(audio_data)
+    >>> x.dtype
+    dtype('complex64')
+    >>> stft.inverse(x).dtype
+    dtype('float32')
     """
     shift: int
     size: int
@@ -752,17 +1641,28 @@ class STFT:
     symmetric_window: bool = False
     pad: bool = True
     fading: typing.Optional[typing.Union[bool, str]] = 'full'
-    
+    dtype: typing.Optional[np.dtype] = None
+    workers: typing.Optional[int] = None
+
     def __post_init__(self):
         if self.window_length is None:
             self.window_length = self.size
+        # Precompute the windows. stft and istft share the cached plan.
+        self._plan = _get_stft_plan(
+            window=self.window,
+            window_length=self.window_length,
+            shift=self.shift,
+            symmetric_window=self.symmetric_window,
+            dtype=self.dtype,
+        )
 
-    def __call__(self, x):
+    def __call__(self, x, out=None):
         """
         Performs stft
 
         Args:
             x: time signal
+            out: optional preallocated output, see stft
 
         Returns:
 
@@ -776,11 +1676,96 @@ class STFT:
             symmetric_window=self.symmetric_window,
             axis=-1,
             fading=self.fading,
-            pad=self.pad
+            pad=self.pad,
+            out=out,
+            dtype=self.dtype,
+            workers=self.workers,
         )  # (..., T, F)
 
         return x
 
+    def batch(self, x, return_list=False):
+        """
+        Performs stft on a list of time signals with different lengths.
+        See stft_batch.
+
+        Args:
+            x: list of time signals
+            return_list: If True, return a list of views into one packed
+                buffer, else the zero padded stft with shape
+                (B, ..., T_max, F) and the number of frames.
+
+        Returns:
+
+        >>> stft = STFT(160, 512, fading='full')
+        >>> X, frames = stft.batch([np.zeros(8000), np.zeros(4000)])
+        >>> X.shape, frames
+        ((2, 53, 257), array([53, 28]))
+        >>> stft.samples_to_frames(np.array([8000, 4000]))
+        array([53, 28])
+        """
+        return stft_batch(
+            x,
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            fading=self.fading,
+            pad=self.pad,
+            dtype=self.dtype,
+            workers=self.workers,
+            return_list=return_list,
+        )
+
+    def frame_range(self, x, start, stop, offset=0, num_samples=None):
+        """
+        Performs stft only for the frames [start, stop). See stft_frame_range.
+
+        Args:
+            x: time signal or a part of it that starts at sample `offset`
+            start: first frame
+            stop: stop frame (exclusive)
+            offset: index of the first sample of x in the full signal
+            num_samples: number of samples of the full signal
+
+        Returns:
+
+        >>> stft = STFT(160, 512, fading='full')
+        >>> x = np.random.normal(size=8000)
+        >>> start, stop = stft.frame_range_to_sample_range(20, 30)
+        >>> X = stft.frame_range(
+        ...     x[start:stop], 20, 30, offset=start, num_samples=8000)
+        >>> np.testing.assert_equal(X, stft(x)[20:30])
+        """
+        return stft_frame_range(
+            x,
+            start,
+            stop,
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            axis=-1,
+            fading=self.fading,
+            pad=self.pad,
+            offset=offset,
+            num_samples=num_samples,
+            dtype=self.dtype,
+            workers=self.workers,
+        )
+
+    def frame_range_to_sample_range(self, start, stop, num_samples=None):
+        """
+        Calculates the samples [sample_start, sample_stop), that the frames
+        [start, stop) need. See stft_frame_range_to_sample_range.
+        """
+        return stft_frame_range_to_sample_range(
+            start, stop, self.window_length, self.shift,
+            fading=self.fading, pad=self.pad, num_samples=num_samples,
+        )
+
     def inverse(self, x, num_samples=None):
         """
         Computes inverse stft
@@ -801,6 +1786,8 @@ class STFT:
             symmetric_window=self.symmetric_window,
             fading=self.fading,
             num_samples=num_samples,
+            dtype=self.dtype,
+            workers=self.workers,
         )
 
     def samples_to_frames(self, samples):
@@ -864,3 +1851,267 @@ class STFT:
         return _stft_frames_to_samples(
             frames, self.window_length, self.shift, fading=self.fading
         )
+
+
+@dataclasses.dataclass()
+class StreamingSTFT:
+    """
+    Stateful STFT for signals that arrive in chunks (e.g. online processing).
+
+    Each call consumes an arbitrary number of new samples and returns only the
+    frames that have been completed by these samples. The remaining samples
+    are kept as state until the next call. Hence, a frame is emitted as soon
+    as its last sample is available and the latency per chunk is bounded by
+    one shift. For shift > window_length with fading, the fading removes up
+    to `shift - window_length` samples at the end of the signal, hence these
+    samples are additionally held back until the end is known.
+
+    The concatenation of all returned frames (including `flush`) is bit-exact
+    to `STFT.__call__` with the same parameters applied to the concatenated
+    chunks.
+
+    >>> stft = STFT(160, 512, window_length=400, fading=False)
+    >>> streaming_stft = StreamingSTFT(160, 512, window_length=400, fading=False)
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> frames = [streaming_stft(c) for c in np.split(x, [160, 170, 5000], axis=-1)]
+    >>> [f.shape for f in frames]
+    [(2, 0, 257), (2, 0, 257), (2, 29, 257), (2, 19, 257)]
+    >>> frames.append(streaming_stft.flush())
+    >>> frames[-1].shape
+    (2, 1, 257)
+    >>> np.testing.assert_equal(np.concatenate(frames, axis=-2), stft(x))
+    """
+    shift: int
+    size: int
+    window_length: int = None
+    window: str = "blackman"
+    symmetric_window: bool = False
+    pad: bool = True
+    fading: typing.Optional[typing.Union[bool, str]] = 'full'
+
+    def __post_init__(self):
+        if self.window_length is None:
+            self.window_length = self.size
+        assert self.fading in [None, True, False, 'full', 'half'], self.fading
+        self._plan = _get_stft_plan(
+            window=self.window,
+            window_length=self.window_length,
+            shift=self.shift,
+            symmetric_window=self.symmetric_window,
+        )
+        self.reset()
+
+    def reset(self):
+        """Drops the buffered samples, i.e. starts a new signal."""
+        self._buffer = None
+        # For shift > window_length the fading pad widths are negative, i.e.
+        # samples are removed from the beginning and the end of the signal.
+        front, end = self._plan.fading_pad_width(self.fading)
+        # Number of samples, that have to be dropped from the next samples,
+        # because the next frame starts behind the buffer.
+        self._skip = max(-front, 0)
+        # Number of samples at the end of the buffer, that cannot be used
+        # before the end of the signal is known.
+        self._hold = max(-end, 0)
+        self._num_samples = 0
+        self._num_frames = 0
+
+    def _drop_skipped(self, buffer):
+        skip = min(self._skip, buffer.shape[-1])
+        self._skip -= skip
+        return buffer[..., skip:]
+
+    def _frames(self, buffer, frames):
+        buffer_seg = segment_axis(
+            buffer[..., :(frames - 1) * self.shift + self.window_length],
+            self.window_length, self.shift, end=None,
+        )
+        return get_fft_backend().rfft(
+            buffer_seg * self._plan.window, n=self.size, axis=-1)
+
+    def _empty(self, shape):
+        return np.zeros((*shape[:-1], 0, self.size // 2 + 1), dtype=complex)
+
+    def __call__(self, chunk):
+        """
+        Args:
+            chunk: time signal chunk with shape (..., samples). The leading
+                dimensions have to be the same for all chunks of a signal.
+
+        Returns:
+            Complex STFT frames that are completed by this chunk with shape
+            (..., frames, size // 2 + 1).
+
+        """
+        chunk = np.asarray(chunk)
+        if self._buffer is None:
+            pad_width = np.zeros((chunk.ndim, 2), dtype=int)
+            pad_width[-1, 0] = max(
+                self._plan.fading_pad_width(self.fading)[0], 0)
+            buffer = np.pad(
+                self._drop_skipped(chunk), pad_width, mode='constant')
+        else:
+            buffer = np.concatenate(
+                [self._buffer, self._drop_skipped(chunk)], axis=-1)
+        self._num_samples += chunk.shape[-1]
+
+        frames = max(0, _samples_to_stft_frames(
+            buffer.shape[-1] - self._hold, self.window_length, self.shift,
+            pad=False,
+        ))
+        if frames == 0:
+            stft_signal = self._empty(buffer.shape)
+        else:
+            stft_signal = self._frames(buffer, frames)
+        self._skip += max(frames * self.shift - buffer.shape[-1], 0)
+        self._buffer = buffer[..., frames * self.shift:]
+        self._num_frames += frames
+        return stft_signal
+
+    def flush(self):
+        """
+        Signals the end of the signal and returns the remaining frames, i.e.
+        the fade-out frames and the (zero padded) last frame, depending on
+        `fading` and `pad`. Afterwards, the object is reset.
+
+        Returns:
+            Complex STFT frames with shape (..., frames, size // 2 + 1).
+            When no chunk was passed since the last reset, the leading
+            dimensions are unknown and the shape is (0, size // 2 + 1).
+
+        """
+        if self._buffer is None:
+            return np.zeros((0, self.size // 2 + 1), dtype=complex)
+
+        pad_width = np.zeros((self._buffer.ndim, 2), dtype=int)
+        pad_width[-1, 1] = max(self._plan.fading_pad_width(self.fading)[1], 0)
+        buffer = self._drop_skipped(
+            np.pad(self._buffer, pad_width, mode='constant'))
+        buffer = buffer[..., :max(buffer.shape[-1] - self._hold, 0)]
+
+        # The remaining frames of `stft` (i.e. fade-out frames and the frame
+        # of `segment_axis(..., end='pad')`).
+        frames = _num_stft_frames(
+            self._num_samples, self.window_length, self.shift,
+            pad=self.pad, fading=self.fading,
+        ) - self._num_frames
+        pad_width[-1, 1] = max(
+            (frames - 1) * self.shift + self.window_length - buffer.shape[-1],
+            0,
+        )
+        buffer = np.pad(buffer, pad_width, mode='constant')
+
+        if frames <= 0:
+            stft_signal = self._empty(buffer.shape)
+        else:
+            stft_signal = self._frames(buffer, frames)
+        self.reset()
+        return stft_signal
+
+
+@dataclasses.dataclass()
+class StreamingISTFT:
+    """
+    Stateful inverse STFT (overlap-add) for frames that arrive in blocks.
+
+    Only the last `window_length - shift` samples of the overlap-add are kept
+    as state. All samples that can no longer be changed by future frames are
+    returned immediately. The synthesis window is calculated once.
+
+    The concatenation of all returned samples (including `flush`) is
+    bit-exact to `istft` (or `STFT.inverse`) with the same parameters
+    applied to the concatenated frames.
+
+    >>> stft = STFT(160, 512, window_length=400)
+    >>> streaming_istft = StreamingISTFT(160, 512, window_length=400)
+    >>> X = stft(np.random.normal(size=(2, 8000)))
+    >>> X.shape
+    (2, 52, 257)
+    >>> signal = [streaming_istft(X_) for X_ in np.split(X, [1, 2, 10], axis=-2)]
+    >>> [s.shape for s in signal]
+    [(2, 0), (2, 80), (2, 1280), (2, 6720)]
+    >>> signal.append(streaming_istft.flush())
+    >>> signal[-1].shape
+    (2, 0)
+    >>> np.testing.assert_equal(np.concatenate(signal, axis=-1), stft.inverse(X))
+    """
+    shift: int
+    size: int
+    window_length: int = None
+    window: str = "blackman"
+    symmetric_window: bool = False
+    fading: typing.Optional[typing.Union[bool, str]] = 'full'
+
+    def __post_init__(self):
+        if self.window_length is None:
+            self.window_length = self.size
+        assert self.fading in [None, True, False, 'full', 'half'], self.fading
+        self._plan = _get_stft_plan(
+            window=self.window,
+            window_length=self.window_length,
+            shift=self.shift,
+            symmetric_window=self.symmetric_window,
+        )
+        self.reset()
+
+    def reset(self):
+        """Drops the overlap-add state, i.e. starts a new signal."""
+        self._tail = None
+        self._skip = self._plan.fading_pad_width(self.fading)[0]
+
+    def __call__(self, stft_signal):
+        """
+        Args:
+            stft_signal: Complex STFT frames with shape
+                (..., frames, size // 2 + 1). The leading dimensions have to
+                be the same for all blocks of a signal.
+
+        Returns:
+            Time signal with shape (..., samples) that is completed by these
+            frames, i.e. `frames * shift` samples except for the fade-in.
+
+        """
+        stft_signal = np.asarray(stft_signal)
+        assert stft_signal.shape[-1] == self.size // 2 + 1, stft_signal.shape
+        frames = stft_signal.shape[-2]
+
+        time_signal = np.zeros(
+            (*stft_signal.shape[:-2],
+             frames * self.shift + self.window_length - self.shift))
+        if self._tail is not None:
+            time_signal[..., :self._tail.shape[-1]] = self._tail
+
+        _overlap_add(
+            time_signal,
+            self._plan.synthesis_window * np.real(
+                get_fft_backend().irfft(stft_signal, n=self.size)
+            )[..., :self.window_length],
+            self.shift,
+        )
+
+        self._tail = time_signal[..., frames * self.shift:]
+        time_signal = time_signal[..., :frames * self.shift]
+
+        skip = min(self._skip, time_signal.shape[-1])
+        self._skip -= skip
+        return time_signal[..., skip:]
+
+    def flush(self):
+        """
+        Signals the end of the STFT signal and returns the remaining samples
+        without the fade-out. Afterwards, the object is reset.
+
+        Returns:
+            Time signal with shape (..., samples).
+
+        """
+        if self._tail is None:
+            return np.zeros((0,))
+        time_signal = self._tail
+        time_signal = time_signal[
+            ...,
+            self._skip:
+            time_signal.shape[-1] - self._plan.fading_pad_width(self.fading)[1]
+        ]
+        self.reset()
+        return time_signal
@@ -1,13 +1,18 @@
-from numpy import array, zeros, argmin, inf, arange
+from numpy import array, zeros, full, argmin, inf, arange, copyto, errstate
+from numpy import asarray
 
 
 def dtw(x, y, dist, dist_to_cost=None, border=(inf, inf), penalty=(0, 0, 0),
-        weight=(1, 1, 1)):
+        weight=(1, 1, 1), band=None):
     """
     Computes Dynamic Time Warping (DTW) of two sequences.
     :param x: N1*M array or N1 element list
     :param y: N2*M array or N2 element list
     :param dist: distance function to calculate between elements of x and y
+                 or a metric name of scipy.spatial.distance.cdist
+                 (e.g. 'euclidean', 'sqeuclidean', 'cityblock', 'cosine').
+                 A metric name calculates the distance matrix vectorized,
+                 x and y are then interpreted as N*M arrays (1D as N*1).
     :param dist_to_cost: transformation from distance to cost matrix.
                          needs to be an in place operation
     :param border: cost to add for steps along the border: (repeat x, repeat y)
@@ -18,20 +23,66 @@ def dtw(x, y, dist, dist_to_cost=None, border=(inf, inf), penalty=(0, 0, 0),
                         'for levensthein': add distances only at diagonal
                                         step. always add penalty
                                         --> set (0, 1, 0)
+    :param band: width of the Sakoe-Chiba band. If not None, only the pairs
+                 (i, j) with -band - max(N1 - N2, 0) <= j - i
+                 <= band + max(N2 - N1, 0) are considered, i.e. the band
+                 always contains a path from (0, 0) to (N1 - 1, N2 - 1).
+                 The distances outside of the band are inf.
     :return: minimum cost, distance matrix, accumulated cost matrix, wrap path
+
+    >>> x = [1, 1, 2, 2, 3, 4]
+    >>> y = [1.1, 1.2, 1, 2, 3, 4]
+    >>> cost, _, _, path = dtw(x, y, 'sqeuclidean')
+    >>> round(cost, 4)
+    0.05
+    >>> path
+    (array([0, 0, 1, 2, 3, 4, 5]), array([0, 1, 2, 3, 3, 4, 5]))
+    >>> cost, C, _, _ = dtw(x, y, 'sqeuclidean', band=1)
+    >>> round(cost, 4)
+    0.05
+    >>> C[0]
+    array([0.01, 0.04,  inf,  inf,  inf,  inf])
     """
 
     # init (boundary condition: start at (0,0) --> set boundaries to border)
     r, c = len(x), len(y)
-    D0 = zeros((r + 1, c + 1))
+    if band is None:
+        lower, upper = -r, c
+        D0 = zeros((r + 1, c + 1))
+    else:
+        lower = -band - max(r - c, 0)
+        upper = band + max(c - r, 0)
+        D0 = full((r + 1, c + 1), inf)
+        D0[0, 0] = 0
     D0[0, 1:] = arange(1, c + 1) * border[0]
     D0[1:, 0] = arange(1, r + 1) * border[1]
 
     # calculate distance matrix
     D1 = D0[1:, 1:] # operate on view for easy indexing
-    for i in range(r):
-        for j in range(c):
-            D1[i, j] = dist(x[i], y[j])
+    if isinstance(dist, str):
+        from scipy.spatial.distance import cdist
+        x, y = [v[:, None] if v.ndim == 1 else v for v in map(asarray, (x, y))]
+        if band is None:
+            D1[...] = cdist(x, y, metric=dist)
+        else:
+            # Blocks of rows, such that only a small multiple of the band is
+            # calculated.
+            rows = upper - lower + 1
+            for start in range(0, r, rows):
+                stop = min(start + rows, r)
+                first = max(start + lower, 0)
+                last = min(stop + upper, c)
+                block = cdist(x[start:stop], y[first:last], metric=dist)
+                j_minus_i = (
+                    arange(first, last)[None, :]
+                    - arange(start, stop)[:, None]
+                )
+                block[(j_minus_i < lower) | (j_minus_i > upper)] = inf
+                D1[start:stop, first:last] = block
+    else:
+        for i in range(r):
+            for j in range(max(i + lower, 0), min(i + upper + 1, c)):
+                D1[i, j] = dist(x[i], y[j])
 
     # copy for output, since we are going to overwrite D0 and D1
     C = D1.copy()
@@ -39,15 +90,12 @@ def dtw(x, y, dist, dist_to_cost=None, border=(inf, inf), penalty=(0, 0, 0),
     # normalize distance matrix
     if dist_to_cost is not None:
         dist_to_cost(D1)
+        if band is not None:
+            # The elements outside of the band have to stay unreachable.
+            _fill_outside_band(D1, lower, upper, inf)
 
     # calculate accumulative distance matrix
-    # note: we again operate on view
-    # --> use D0 instead of i and/or j minus 1
-    for i in range(r):
-        for j in range(c):
-            D1[i, j] += min(weight[1] * D0[i, j] + penalty[1],
-                            weight[2] * D0[i, j+1] + penalty[2],
-                            weight[0] * D0[i+1, j] + penalty[0])
+    _accumulate(D0, penalty, weight, None if band is None else (lower, upper))
 
     # traceback
     path = _traceback(D0, penalty)
@@ -55,6 +103,84 @@ def dtw(x, y, dist, dist_to_cost=None, border=(inf, inf), penalty=(0, 0, 0),
     return D1[-1, -1], C, D1, path
 
 
+def _fill_outside_band(D1, lower, upper, value):
+    """
+    Sets the elements of D1 with j - i < lower or j - i > upper to value.
+
+    >>> D1 = zeros((3, 4))
+    >>> _fill_outside_band(D1, -1, 1, inf)
+    >>> D1
+    array([[ 0.,  0., inf, inf],
+           [ 0.,  0.,  0., inf],
+           [inf,  0.,  0.,  0.]])
+    """
+    for i in range(D1.shape[0]):
+        D1[i, :max(i + lower, 0)] = value
+        D1[i, max(i + upper + 1, 0):] = value
+
+
+def _accumulate(D0, penalty=(0, 0, 0), weight=(1, 1, 1), band=None):
+    """
+    Accumulates the cost matrix D0 (including boundary conditions) inplace:
+
+        D0[i, j] += min(weight[1] * D0[i-1, j-1] + penalty[1],
+                        weight[2] * D0[i-1, j] + penalty[2],
+                        weight[0] * D0[i, j-1] + penalty[0])
+
+    for i, j >= 1. Like in the builtin min, a NaN term (e.g. 0 * inf for the
+    weight 0 on the border) is ignored, unless it is the first one.
+    The elements of an anti-diagonal (i + j = const) depend only on the
+    previous two anti-diagonals, hence each anti-diagonal is calculated at
+    once. In the flat matrix an anti-diagonal is a slice with the step c
+    (number of columns minus one) and the neighbours are at fixed offsets.
+
+    When band is given as (lower, upper), only the elements with
+    lower <= j - i <= upper are accumulated. The elements next to the band
+    have to be inf.
+
+    >>> D0 = zeros((3, 4))
+    >>> D0[0, 1:], D0[1:, 0] = inf, inf
+    >>> D0[1:, 1:] = [[1, 2, 3], [4, 5, 6]]
+    >>> _accumulate(D0)
+    >>> D0
+    array([[ 0., inf, inf, inf],
+           [inf,  1.,  3.,  6.],
+           [inf,  5.,  6.,  9.]])
+    >>> D0[1:, 1:] = [[1, 2, inf], [inf, 5, 6]]
+    >>> _accumulate(D0, band=(0, 1))
+    >>> D0
+    array([[ 0., inf, inf, inf],
+           [inf,  1.,  3., inf],
+           [inf, inf,  6.,  9.]])
+    """
+    assert D0.flags.c_contiguous, 'D0 has to be C-contiguous'
+    rows, columns = D0.shape
+    r, c = rows - 1, columns - 1
+    lower, upper = (-r, c) if band is None else band
+    flat = D0.reshape(-1)
+    for s in range(2, r + c + 1):
+        # Rows i of the anti-diagonal i + j = s with 1 <= i <= r,
+        # 1 <= j <= c and lower <= j - i <= upper.
+        first_row = max(1, s - c, -((upper - s) // 2))
+        last_row = min(r, s - 1, (s - lower) // 2)
+        if first_row > last_row:
+            continue
+        start = first_row * columns + s - first_row
+        stop = last_row * columns + s - last_row + 1
+        with errstate(invalid='ignore'):
+            cost = (
+                weight[1] * flat[start - columns - 1:stop - columns - 1:c]
+                + penalty[1]
+            )
+            for candidate in [
+                weight[2] * flat[start - columns:stop - columns:c]
+                + penalty[2],
+                weight[0] * flat[start - 1:stop - 1:c] + penalty[0],
+            ]:
+                copyto(cost, candidate, where=candidate < cost)
+        flat[start:stop:c] += cost
+
+
 def _traceback(D, penalty=(0, 0, 0)):
     """
     compute traceback through distance matrix starting from the end of both
@@ -0,0 +1,81 @@
+"""
+Compares the FFT backends (see paderbox.transform.module_fft) on stft and
+istft.
+
+Each backend is first checked against the 'default' backend (within
+tolerance), then the throughput is reported as seconds of audio per second
+of compute.
+
+Usage:
+    python benchmark_fft_backends.py
+    PADERBOX_FFTW_WISDOM=~/.fftw_wisdom python benchmark_fft_backends.py
+"""
+import os
+import socket
+import timeit
+
+import numpy as np
+
+import paderbox as pb
+from paderbox.transform.module_fft import fft_backend
+
+
+SIZE = 1024
+SHIFT = 256
+SAMPLE_RATE = 16000
+
+
+def measure(fn, repeats=3):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+def available_backends():
+    backends = ['default', 'numpy', 'scipy']
+    try:
+        import pyfftw  # noqa
+        backends.append('pyfftw')
+    except ImportError:
+        print('pyfftw is not installed, skip the pyfftw backend.')
+    return backends
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('os.cpu_count()', os.cpu_count())
+    print()
+
+    channels, seconds = 8, 10
+    x = np.random.normal(size=(channels, SAMPLE_RATE * seconds))
+    audio_seconds = channels * seconds
+
+    print(f'{"backend":>8} {"dtype":>8} {"workers":>7} '
+          f'{"stft [x RT]":>11} {"istft [x RT]":>12}')
+    for dtype, rtol in [(np.float64, 1e-10), (np.float32, 1e-4)]:
+        X_ref = pb.transform.stft(x, SIZE, SHIFT, dtype=dtype)
+        x_ref = pb.transform.istft(X_ref, SIZE, SHIFT, dtype=dtype)
+        for name in available_backends():
+            for workers in [None, -1]:
+                with fft_backend(name):
+                    X = pb.transform.stft(
+                        x, SIZE, SHIFT, dtype=dtype, workers=workers)
+                    x_hat = pb.transform.istft(
+                        X, SIZE, SHIFT, dtype=dtype, workers=workers)
+                    np.testing.assert_allclose(X, X_ref, rtol=rtol, atol=rtol)
+                    np.testing.assert_allclose(
+                        x_hat, x_ref, rtol=rtol, atol=rtol)
+
+                    t_stft = measure(lambda: pb.transform.stft(
+                        x, SIZE, SHIFT, dtype=dtype, workers=workers))
+                    t_istft = measure(lambda: pb.transform.istft(
+                        X, SIZE, SHIFT, dtype=dtype, workers=workers))
+                print(
+                    f'{name:>8} {np.dtype(dtype).name:>8} {str(workers):>7} '
+                    f'{audio_seconds / t_stft:11.1f} '
+                    f'{audio_seconds / t_istft:12.1f}'
+                )
+        print()
+
+    wisdom = os.environ.get('PADERBOX_FFTW_WISDOM')
+    if wisdom and 'pyfftw' in available_backends():
+        pb.transform.get_fft_backend('pyfftw').save_wisdom()
+        print('Saved FFTW wisdom to', wisdom)
@@ -0,0 +1,64 @@
+"""
+Compares the overlap-add of the istft with the unbuffered np.add.at
+implementation (`_overlap_add_unbuffered`), which was used before.
+
+Both implementations yield bit-exact identical results.
+
+8 channels, 60 s at 16 kHz, time in seconds per call (numpy 1.26):
+
+window_length=1024, shift=256
+  _overlap_add_unbuffered 0.3898428710000796
+  _overlap_add 0.09668430900001113
+
+window_length=512, shift=128
+  _overlap_add_unbuffered 0.3656564913333871
+  _overlap_add 0.10908628199998323
+
+window_length=400, shift=160
+  _overlap_add_unbuffered 0.20029390866663258
+  _overlap_add 0.1187408249999559
+"""
+import numpy as np
+import timeit
+import os
+import socket
+
+from paderbox.transform.module_stft import _overlap_add
+from paderbox.transform.module_stft import _overlap_add_unbuffered
+
+
+C = 8
+T = 16000 * 60
+SIZE = 1024
+SHIFT = 256
+
+
+def setup(window_length=SIZE, shift=SHIFT):
+    frames = (T - window_length + shift) // shift
+    x = np.random.normal(size=(C, frames, window_length))
+    time_signal = np.zeros((C, frames * shift + window_length - shift))
+    return time_signal, x, shift
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('OMP_NUM_THREADS', os.environ.get('OMP_NUM_THREADS'))
+    print('MKL_NUM_THREADS', os.environ.get('MKL_NUM_THREADS'))
+    print()
+    repeats = 3
+
+    for window_length, shift in [(1024, 256), (512, 128), (400, 160)]:
+        print(f'window_length={window_length}, shift={shift}')
+        time_signal, x, shift = setup(window_length, shift)
+        ref = time_signal.copy()
+        _overlap_add_unbuffered(ref, x, shift)
+        out = time_signal.copy()
+        _overlap_add(out, x, shift)
+        np.testing.assert_equal(out, ref)
+
+        for fn in [_overlap_add_unbuffered, _overlap_add]:
+            t = timeit.Timer(
+                lambda: fn(time_signal, x, shift),
+            )
+            print(f'  {fn.__name__}', min(t.repeat(repeat=3, number=repeats)) / repeats)
+        print()
@@ -0,0 +1,53 @@
+"""
+Compares the running max kernel (van Herk/Gil-Werman, see
+paderbox.array.kernel._running_max_min) with the reduction over a
+segment_axis view, that was used before, for several kernel sizes.
+
+Both implementations are checked to give identical results. The cost of the
+segment_axis implementation grows linearly with the kernel size, while the
+running max has a constant cost per sample.
+
+Usage:
+    python benchmark_max_kernel.py
+"""
+import os
+import socket
+import timeit
+
+import numpy as np
+
+import paderbox as pb
+from paderbox.array.kernel import np_kernel1d
+
+
+def segment_axis_max_kernel1d(x, kernel_size):
+    shift = kernel_size // 2
+    x = pb.array.pad_axis(x, (shift, shift), axis=-1, mode='edge')
+    return np.amax(
+        pb.array.segment_axis(x, kernel_size, 1, axis=-1, end='pad'), axis=-1)
+
+
+def measure(fn, repeats=3):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('os.cpu_count()', os.cpu_count())
+    print()
+
+    # e.g. 8 channels of VAD scores with 10 ms frames for one hour
+    x = np.random.normal(size=(8, 360_000))
+
+    print(f'{"kernel_size":>11} {"segment_axis [s]":>16} '
+          f'{"running [s]":>11} {"speedup":>7}')
+    for kernel_size in [3, 11, 51, 101, 301, 501, 1001]:
+        np.testing.assert_equal(
+            np_kernel1d(x, kernel_size, kernel=np.amax),
+            segment_axis_max_kernel1d(x, kernel_size),
+        )
+        t_segment = measure(lambda: segment_axis_max_kernel1d(x, kernel_size))
+        t_running = measure(
+            lambda: np_kernel1d(x, kernel_size, kernel=np.amax))
+        print(f'{kernel_size:11} {t_segment:16.3f} {t_running:11.3f} '
+              f'{t_segment / t_running:7.1f}')
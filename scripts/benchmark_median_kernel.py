@@ -0,0 +1,58 @@
+"""
+Compares the running median (two heaps, see
+paderbox.array.kernel._running_median) with the median over a segment_axis
+view for several kernel sizes. np_kernel1d switches to the running median
+for `kernel_size >= paderbox.array.kernel._running_median_min_kernel_size`,
+this benchmark is the basis for that threshold.
+
+Both implementations are checked to give identical results. The cost of the
+segment_axis implementation grows linearly with the kernel size (np.median
+uses a partition of each window), while the running median needs
+O(log(kernel_size)) comparisons per sample, but is a Python loop.
+
+Usage:
+    python benchmark_median_kernel.py
+"""
+import os
+import socket
+import timeit
+
+import numpy as np
+
+import paderbox as pb
+from paderbox.array.kernel import _running_median
+
+
+def segment_axis_median_kernel1d(x, kernel_size):
+    return np.median(
+        pb.array.segment_axis(x, kernel_size, 1, axis=-1, end='cut'),
+        axis=-1,
+    )
+
+
+def measure(fn, repeats=3):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('os.cpu_count()', os.cpu_count())
+    print('running median threshold',
+          pb.array.kernel._running_median_min_kernel_size)
+    print()
+
+    # e.g. 8 channels of VAD scores with 10 ms frames for ten minutes
+    x = np.random.normal(size=(8, 60_000))
+
+    print(f'{"kernel_size":>11} {"segment_axis [s]":>16} '
+          f'{"running [s]":>11} {"speedup":>7}')
+    for kernel_size in [3, 11, 21, 31, 41, 51, 71, 101, 301, 1001]:
+        np.testing.assert_equal(
+            _running_median(x, kernel_size),
+            segment_axis_median_kernel1d(x, kernel_size),
+        )
+        t_segment = measure(
+            lambda: segment_axis_median_kernel1d(x, kernel_size))
+        t_running = measure(lambda: _running_median(x, kernel_size))
+        print(f'{kernel_size:11} {t_segment:16.3f} {t_running:11.3f} '
+              f'{t_segment / t_running:7.2f}')
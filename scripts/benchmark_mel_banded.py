@@ -0,0 +1,61 @@
+"""
+Dense vs. banded application of the mel filter bank in MelTransform.
+
+The triangular mel filters are non-zero only on a few frequency bins.
+BandedFilterbank applies each filter only on its band, which skips most of
+the multiply-adds of the dense matrix product `x @ fbanks`.
+
+Usage:
+    python benchmark_mel_banded.py
+"""
+import socket
+import timeit
+
+import numpy as np
+
+from paderbox.transform.module_fbank import MelTransform
+from paderbox.transform.module_fbank import HzWarping
+from paderbox.utils.random_utils import Uniform
+
+
+def measure(fn, repeats=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print()
+    print(f'{"F":>5} {"N":>4} {"warped":>6} '
+          f'{"dense [s]":>10} {"banded [s]":>10} {"speed-up":>8} '
+          f'{"max rel. diff":>13}')
+    for stft_size, number_of_filters in [(512, 40), (1024, 80), (2048, 128)]:
+        x = np.random.uniform(size=(16, 500, stft_size // 2 + 1))
+        for warped in [False, True]:
+            if warped:
+                warping_fn = HzWarping(
+                    warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+                    boundary_frequency_ratio_sampling_fn=Uniform(
+                        low=.6, high=.7),
+                    highest_frequency=8000,
+                )
+            else:
+                warping_fn = None
+            results = {}
+            times = {}
+            for banded in [False, True]:
+                mel_transform = MelTransform(
+                    16000, stft_size, number_of_filters, log=False,
+                    warping_fn=warping_fn, banded=banded,
+                )
+                np.random.seed(0)
+                results[banded] = mel_transform(x)
+                times[banded] = measure(lambda: mel_transform(x))
+            diff = np.max(
+                np.abs(results[True] - results[False])
+                / np.maximum(np.abs(results[False]), 1e-300)
+            )
+            print(
+                f'{stft_size // 2 + 1:5} {number_of_filters:4} '
+                f'{str(warped):>6} {times[False]:10.4f} {times[True]:10.4f} '
+                f'{times[False] / times[True]:8.2f} {diff:13.2e}'
+            )
@@ -0,0 +1,68 @@
+"""
+Compares the padding of segment_axis (np.pad of the whole signal) with
+segment_axis_parts (only the first and last frames are padded) for long
+signals, i.e. the time and the peak memory of the segmentation (with the
+fading pad of the stft) and the resulting time of the stft.
+
+Usage:
+    python benchmark_segment_axis_parts.py
+"""
+import os
+import socket
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import paderbox as pb
+
+
+SIZE = 512
+SHIFT = 160
+WINDOW_LENGTH = 400
+
+
+def segment_with_pad(x):
+    pad = WINDOW_LENGTH - SHIFT
+    x = np.pad(x, [(0, 0), (pad, pad)])
+    return pb.array.segment_axis(x, WINDOW_LENGTH, SHIFT, end='pad')
+
+
+def segment_parts(x):
+    pad = WINDOW_LENGTH - SHIFT
+    return pb.array.segment_axis_parts(
+        x, WINDOW_LENGTH, SHIFT, end='pad', pad_width=(pad, pad))
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn, repeats=3):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('os.cpu_count()', os.cpu_count())
+    print()
+
+    print(f'{"seconds":>7} {"pad [ms]":>9} {"parts [ms]":>10} '
+          f'{"pad [MB]":>8} {"parts [MB]":>10} {"stft [ms]":>9}')
+    for seconds in [10, 60, 600]:
+        x = np.random.normal(size=(2, 16000 * seconds))
+        np.testing.assert_equal(
+            np.concatenate(segment_parts(x), axis=-2), segment_with_pad(x))
+        print(
+            f'{seconds:7} '
+            f'{measure(lambda: segment_with_pad(x)) * 1000:9.2f} '
+            f'{measure(lambda: segment_parts(x)) * 1000:10.2f} '
+            f'{peak_memory(lambda: segment_with_pad(x)) / 1e6:8.2f} '
+            f'{peak_memory(lambda: segment_parts(x)) / 1e6:10.2f} '
+            f'{measure(lambda: pb.transform.stft(x, SIZE, SHIFT, window_length=WINDOW_LENGTH, block_frames=1000)) * 1000:9.1f}'
+        )
@@ -0,0 +1,59 @@
+"""
+Scaling of the multi-threaded FFT (`workers` argument) of stft and istft with
+the number of channels and the signal length.
+
+The speed-up is relative to the default single-threaded numpy.fft
+(workers=None). With few channels and short signals, the thread overhead
+dominates; the speed-up grows with the number of independent transforms
+(channels x frames).
+
+Usage:
+    python benchmark_stft_workers.py
+"""
+import os
+import socket
+import timeit
+
+import numpy as np
+
+import paderbox as pb
+
+
+SIZE = 1024
+SHIFT = 256
+SAMPLE_RATE = 16000
+
+
+def measure(fn, repeats=3):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('os.cpu_count()', os.cpu_count())
+    print('OMP_NUM_THREADS', os.environ.get('OMP_NUM_THREADS'))
+    print('MKL_NUM_THREADS', os.environ.get('MKL_NUM_THREADS'))
+    print()
+
+    workers_list = [None, 1, 2, 4, 8, -1]
+
+    print(f'{"channels":>8} {"seconds":>7} {"workers":>7} '
+          f'{"stft [s]":>9} {"speed-up":>8} {"istft [s]":>9} {"speed-up":>8}')
+    for channels in [1, 8, 32]:
+        for seconds in [1, 10, 60]:
+            x = np.random.normal(size=(channels, SAMPLE_RATE * seconds))
+            X = pb.transform.stft(x, SIZE, SHIFT)
+            reference = None
+            for workers in workers_list:
+                t_stft = measure(lambda: pb.transform.stft(
+                    x, SIZE, SHIFT, workers=workers))
+                t_istft = measure(lambda: pb.transform.istft(
+                    X, SIZE, SHIFT, workers=workers))
+                if reference is None:
+                    reference = t_stft, t_istft
+                print(
+                    f'{channels:8} {seconds:7} {str(workers):>7} '
+                    f'{t_stft:9.4f} {reference[0] / t_stft:8.2f} '
+                    f'{t_istft:9.4f} {reference[1] / t_istft:8.2f}'
+                )
+            print()
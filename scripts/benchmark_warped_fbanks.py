@@ -0,0 +1,61 @@
+"""
+Time per call of MelTransform with VTLP-style warping (one warped filter
+bank per example), for the dense construction (banded=False), the
+construction in banded form (banded=True) and a pool of pre-sampled warped
+filter banks (warp_pool_size).
+
+With few frames per example, the construction of the warped filter banks
+dominates the runtime of the dense implementation.
+
+Usage:
+    python benchmark_warped_fbanks.py
+"""
+import socket
+import timeit
+
+import numpy as np
+
+from paderbox.transform.module_fbank import MelTransform
+from paderbox.transform.module_fbank import HzWarping
+from paderbox.utils.random_utils import Uniform
+
+
+def measure(fn, repeats=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print()
+    warping_fn = HzWarping(
+        warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+        boundary_frequency_ratio_sampling_fn=Uniform(low=.6, high=.7),
+        highest_frequency=8000,
+    )
+    configurations = {
+        'dense': dict(banded=False),
+        'banded': dict(banded=True),
+        'pool': dict(banded=True, warp_pool_size=1000),
+    }
+    print(f'{"F":>5} {"N":>4} {"batch":>5} {"frames":>6} '
+          + ' '.join(f'{name + " [s]":>10}' for name in configurations)
+          + f' {"speed-up":>8} {"pool":>8}')
+    for stft_size, number_of_filters in [(512, 40), (1024, 80)]:
+        for batch_size, frames in [(16, 100), (64, 100), (256, 10)]:
+            x = np.random.uniform(
+                size=(batch_size, 1, frames, stft_size // 2 + 1))
+            times = {}
+            for name, kwargs in configurations.items():
+                mel_transform = MelTransform(
+                    16000, stft_size, number_of_filters,
+                    warping_fn=warping_fn, **kwargs,
+                )
+                mel_transform(x)  # Build the pool
+                times[name] = measure(lambda: mel_transform(x))
+            print(
+                f'{stft_size // 2 + 1:5} {number_of_filters:4} '
+                f'{batch_size:5} {frames:6} '
+                + ' '.join(f'{t:10.4f}' for t in times.values())
+                + f' {times["dense"] / times["banded"]:8.2f}'
+                + f' {times["dense"] / times["pool"]:8.2f}'
+            )
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+
+import paderbox as pb
+from paderbox.array.kernel import StreamingMedianKernel1d
+from paderbox.array.kernel import max_kernel1d
+from paderbox.array.kernel import median_kernel1d
+from paderbox.array.kernel import min_kernel1d
+from paderbox.array.kernel import np_kernel1d
+
+
+def _reference_kernel1d(x, kernel_size, kernel, axis, padding_mode,
+                        pad_position):
+    # The O(n * kernel_size) implementation with segment_axis.
+    if 0 <= axis < x.ndim:
+        axis = axis - x.ndim
+    shift = kernel_size // 2
+    if pad_position == 'pre':
+        x = pb.array.pad_axis(x, (shift, shift), axis=axis, mode=padding_mode)
+    y = kernel(
+        pb.array.segment_axis(x, kernel_size, 1, axis=axis, end='pad'),
+        axis=axis)
+    if pad_position == 'post':
+        y = pb.array.pad_axis(y, (shift, shift), axis=axis, mode=padding_mode)
+    return y
+
+
+@pytest.mark.parametrize('kernel', [np.amax, np.amin, np.max, np.min])
+@pytest.mark.parametrize('pad_position', ['pre', 'post', None])
+@pytest.mark.parametrize('padding_mode', ['edge', 'constant', 'reflect'])
+@pytest.mark.parametrize('dtype', [np.float64, np.float32, np.int64, bool])
+def test_running_max_min(kernel, pad_position, padding_mode, dtype):
+    rng = np.random.RandomState(0)
+    x = (rng.normal(size=(3, 4, 47)) * 5).astype(dtype)
+    for axis in [-1, 0, 1, -3]:
+        for kernel_size in [1, 3, 5, 45, 47, 49]:
+            actual = np_kernel1d(
+                x, kernel_size, kernel=kernel, axis=axis,
+                padding_mode=padding_mode, pad_position=pad_position,
+            )
+            expected = _reference_kernel1d(
+                x, kernel_size, kernel, axis, padding_mode, pad_position)
+            assert actual.dtype == expected.dtype
+            np.testing.assert_array_equal(actual, expected)
+
+
+def test_running_max_min_nan():
+    x = np.arange(20.)
+    x[7] = np.nan
+    for kernel in [np.amax, np.amin]:
+        np.testing.assert_array_equal(
+            np_kernel1d(x, 5, kernel=kernel),
+            _reference_kernel1d(x, 5, kernel, -1, 'edge', 'pre'),
+        )
+
+
+def test_max_min_kernel1d_arguments():
+    x = np.random.normal(size=(30, 2))
+    np.testing.assert_array_equal(
+        max_kernel1d(x, 5, axis=0, pad_position=None),
+        np.stack([np.amax(x[i:i + 5], axis=0) for i in range(26)]),
+    )
+    np.testing.assert_array_equal(
+        min_kernel1d(x, 5, axis=0, pad_position='post', padding_mode='constant'),
+        np.pad(
+            np.stack([np.amin(x[i:i + 5], axis=0) for i in range(26)]),
+            [(2, 2), (0, 0)],
+        ),
+    )
+
+
+@pytest.mark.parametrize('pad_position', ['pre', 'post', None])
+@pytest.mark.parametrize('padding_mode', ['edge', 'constant', 'reflect'])
+@pytest.mark.parametrize('dtype', [np.float64, np.float32, np.int64, bool])
+def test_running_median(pad_position, padding_mode, dtype, monkeypatch):
+    # Use the running median also for the small kernel sizes of this test.
+    monkeypatch.setattr(pb.array.kernel, '_running_median_min_kernel_size', 5)
+    rng = np.random.RandomState(0)
+    x = (rng.normal(size=(3, 4, 47)) * 5).astype(dtype)
+    for axis in [-1, 0, 1, -3]:
+        for kernel_size in [1, 3, 5, 45, 47]:
+            actual = median_kernel1d(
+                x, kernel_size, axis=axis,
+                padding_mode=padding_mode, pad_position=pad_position,
+            )
+            expected = _reference_kernel1d(
+                x, kernel_size, np.median, axis, padding_mode, pad_position)
+            assert actual.dtype == expected.dtype
+            np.testing.assert_array_equal(actual, expected)
+
+
+def test_running_median_nan():
+    x = np.arange(100.)
+    x[[3, 7, 8, 60]] = np.nan
+    threshold = pb.array.kernel._running_median_min_kernel_size
+    for kernel_size in [5, 31, threshold]:
+        np.testing.assert_array_equal(
+            median_kernel1d(x, kernel_size),
+            _reference_kernel1d(x, kernel_size, np.median, -1, 'edge', 'pre'),
+        )
+
+
+def test_running_median_threshold(monkeypatch):
+    # Small kernels use the vectorized median of a segment_axis view.
+    calls = []
+    running_median = pb.array.kernel._running_median
+    monkeypatch.setattr(
+        pb.array.kernel, '_running_median',
+        lambda *args, **kwargs: calls.append(args) or running_median(
+            *args, **kwargs),
+    )
+    x = np.random.normal(size=(2, 100))
+    median_kernel1d(x, 3)
+    assert len(calls) == 0
+    median_kernel1d(x, pb.array.kernel._running_median_min_kernel_size)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize('padding_mode', ['edge', 'constant', None])
+@pytest.mark.parametrize('kernel_size', [1, 3, 11, 61])
+def test_streaming_median(padding_mode, kernel_size):
+    rng = np.random.RandomState(1)
+    x = rng.normal(size=(2, 3, 200))
+    x[0, 1, 20] = np.nan
+    expected = np_kernel1d(
+        x, kernel_size, kernel=np.median,
+        padding_mode=padding_mode or 'edge',
+        pad_position='pre' if padding_mode else None,
+    )
+    for boundaries in [[], [0, 1, 1, 2, 100], rng.randint(0, 200, size=30)]:
+        streaming_median = StreamingMedianKernel1d(kernel_size, padding_mode)
+        actual = [
+            streaming_median(chunk)
+            for chunk in np.split(x, np.sort(boundaries), axis=-1)
+        ]
+        actual.append(streaming_median.flush())
+        actual = np.concatenate(actual, axis=-1)
+        assert actual.dtype == expected.dtype
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_streaming_median_state_is_bounded():
+    streaming_median = StreamingMedianKernel1d(11)
+    for _ in range(50):
+        streaming_median(np.random.normal(size=(2, 7)))
+    assert [len(h) for h in streaming_median._history] == [10, 10]
+    assert [len(w) for w in streaming_median._windows] == [10, 10]
+
+
+def test_median_window_is_bounded():
+    # The lazily removed values of a monotonic signal never reach the top of
+    # a heap, they are dropped by the rebuild.
+    window = pb.array.kernel._MedianWindow(range(10))
+    for value in range(10, 10_000):
+        window.insert(value)
+        assert window.median() == value - 5
+        window.remove(value - 10)
+    assert len(window) == 10
+    assert len(window._low) + len(window._high) <= 2 * 10 + 16
+
+
+@pytest.mark.parametrize('kernel_size', [3, 161])
+@pytest.mark.parametrize('pad_position', ['pre', None])
+def test_median_empty(kernel_size, pad_position):
+    y = median_kernel1d(
+        np.zeros((2, 0), dtype=int), kernel_size, pad_position=pad_position)
+    assert y.shape == (2, 0)
+    assert y.dtype == np.float64
+
@@ -60,3 +60,275 @@ class TestSTFTMethods(unittest.TestCase):
         tc.assert_almost_equal(
             mels, transform.module_fbank.hz2mel(hz, htk_mel=False),
         )
+
+
+class TestMelFeatureExtractor(unittest.TestCase):
+    def composed(self, x, extractor):
+        stft = transform.STFT(
+            extractor.stft_shift, extractor.stft_size,
+            window_length=extractor.window_length, fading=extractor.fading,
+            dtype=extractor.dtype,
+        )
+        mel_transform = transform.module_fbank.MelTransform(
+            extractor.sample_rate, extractor.stft_size,
+            extractor.number_of_filters, log=extractor.log,
+        )
+        feature = mel_transform(transform.stft_to_spectrogram(stft(x)))
+        if extractor.number_of_cepstral_coefficients is not None:
+            from paderbox.transform.module_fft import get_fft_backend
+            feature = get_fft_backend().dct(
+                feature, type=2, axis=-1, norm='ortho')
+            feature = feature[..., :extractor.number_of_cepstral_coefficients]
+        return feature
+
+    def test_matches_composed(self):
+        x = np.random.normal(size=(3, 12345))
+        for kwargs in [
+            dict(),
+            dict(log=False),
+            dict(number_of_cepstral_coefficients=13),
+            dict(fading=None),
+            dict(dtype=np.float32),
+        ]:
+            for block_frames in [1, 7, 64, 256]:
+                with self.subTest(block_frames=block_frames, **kwargs):
+                    extractor = transform.MelFeatureExtractor(
+                        16000, 512, 160, 40, window_length=400,
+                        block_frames=block_frames, **kwargs,
+                    )
+                    feature = extractor(x)
+                    expected = self.composed(x, extractor)
+                    tc.assert_equal(feature.shape, expected.shape)
+                    tc.assert_equal(feature.dtype, expected.dtype)
+                    if block_frames % 64 == 0:
+                        tc.assert_equal(feature, expected)
+                    else:
+                        # The BLAS matrix product of the mel filter bank
+                        # may round differently for small blocks.
+                        tc.assert_allclose(
+                            feature, expected, rtol=1e-12, atol=1e-12)
+
+    def test_short_signal(self):
+        for num_samples in [0, 200, 399]:
+            x = np.random.normal(size=(2, num_samples))
+            for fading in ['full', False]:
+                for pad in [True, False]:
+                    with self.subTest(
+                            num_samples=num_samples, fading=fading, pad=pad):
+                        extractor = transform.MelFeatureExtractor(
+                            16000, 512, 160, 40, window_length=400,
+                            fading=fading, pad=pad, log=False,
+                        )
+                        stft = transform.STFT(
+                            160, 512, window_length=400, fading=fading,
+                            pad=pad,
+                        )
+                        mel_transform = transform.module_fbank.MelTransform(
+                            16000, 512, 40, log=False)
+                        tc.assert_equal(
+                            extractor(x),
+                            mel_transform(
+                                transform.stft_to_spectrogram(stft(x))),
+                        )
+
+    def test_out(self):
+        x = np.random.normal(size=8000)
+        extractor = transform.MelFeatureExtractor(16000, 512, 160, 40)
+        out = np.empty((53, 40))
+        tc.assert_equal(extractor(x, out=out) is out, True)
+        with self.assertRaises(ValueError):
+            extractor(x, out=np.empty((10, 40)))
+
+    def test_mfcc_requires_log(self):
+        with self.assertRaises(ValueError):
+            transform.MelFeatureExtractor(
+                16000, 512, 160, 40, log=False,
+                number_of_cepstral_coefficients=13)
+
+
+class TestBandedFilterbank(unittest.TestCase):
+    def test_matches_dense(self):
+        from paderbox.transform.module_fbank import BandedFilterbank
+        for stft_size, number_of_filters in [(512, 40), (1024, 80), (64, 30)]:
+            fbanks = transform.module_fbank.MelTransform(
+                16000, stft_size, number_of_filters).fbanks
+            x = np.random.uniform(size=(2, 50, stft_size // 2 + 1))
+            banded = BandedFilterbank(fbanks)
+            tc.assert_allclose(banded(x), x @ fbanks, rtol=1e-12, atol=1e-300)
+            tc.assert_array_less(
+                np.sum(banded.stop - banded.start), fbanks.size / 4)
+
+    def test_batched_and_empty_filters(self):
+        from paderbox.transform.module_fbank import BandedFilterbank
+        fbanks = np.random.uniform(size=(3, 1, 20, 6))
+        fbanks[..., :5, :] = 0
+        fbanks[..., 12:, 1] = 0
+        fbanks[..., 2] = 0
+        x = np.random.uniform(size=(3, 4, 7, 20))
+        banded = BandedFilterbank(fbanks)
+        tc.assert_equal(banded.start[:3], [5, 5, 0])
+        tc.assert_equal(banded.stop[:3], [20, 12, 0])
+        tc.assert_allclose(banded(x), x @ fbanks, rtol=1e-12)
+
+    def test_mel_transform(self):
+        from paderbox.utils.random_utils import Uniform
+        warping_fn = transform.module_fbank.HzWarping(
+            warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+            boundary_frequency_ratio_sampling_fn=Uniform(low=.6, high=.7),
+            highest_frequency=8000,
+        )
+        x = np.random.uniform(size=(3, 2, 40, 257))
+        for kwargs in [
+            dict(),
+            dict(warping_fn=warping_fn),
+            dict(warping_fn=warping_fn, independent_axis=(0, 1, 2)),
+        ]:
+            with self.subTest(**kwargs):
+                results = []
+                for banded in [True, False]:
+                    np.random.seed(0)
+                    mel_transform = transform.module_fbank.MelTransform(
+                        16000, 512, 40, banded=banded, **kwargs)
+                    results.append(mel_transform(x))
+                # The warped filter banks are normalized in single
+                # precision.
+                tc.assert_allclose(
+                    results[0], results[1],
+                    rtol=1e-5 if 'warping_fn' in kwargs else 1e-12,
+                )
+                tc.assert_equal(
+                    mel_transform.inverse(results[0]).shape, x.shape)
+
+
+    def test_default_is_dense(self):
+        x = np.random.uniform(size=(3, 40, 257))
+        mel_transform = transform.module_fbank.MelTransform(
+            16000, 512, 40, log=False)
+        tc.assert_equal(mel_transform(x), x @ mel_transform.fbanks)
+
+    def test_banded_fbanks_cache(self):
+        MelTransform = transform.module_fbank.MelTransform
+        self.assertIs(
+            MelTransform(16000, 512, 40, banded=True).banded_fbanks,
+            MelTransform(16000, 512, 40, log=False).banded_fbanks,
+        )
+        self.assertIsNot(
+            MelTransform(16000, 512, 40).banded_fbanks,
+            MelTransform(16000, 512, 40, eps=1e-10).banded_fbanks,
+        )
+
+
+class TestFbankCache(unittest.TestCase):
+    def test_free_functions_hit_cache(self):
+        module_fbank = transform.module_fbank
+        module_fbank.fbank_cache_clear()
+        x = np.random.normal(size=8000)
+        first = transform.fbank(x)
+        info = module_fbank.fbank_cache_info()
+        tc.assert_equal((info.hits, info.misses), (0, 1))
+        tc.assert_equal(transform.logfbank(x), np.log(first + 1e-18))
+        transform.fbank(x, number_of_filters=40)
+        info = module_fbank.fbank_cache_info()
+        tc.assert_equal((info.hits, info.misses), (1, 2))
+
+    def test_clear_banded_fbanks(self):
+        from paderbox.transform.module_fbank import MelTransform
+        banded = MelTransform(16000, 512, 40).banded_fbanks
+        self.assertIs(MelTransform(16000, 512, 40).banded_fbanks, banded)
+        transform.module_fbank.fbank_cache_clear()
+        tc.assert_equal(transform.module_fbank.fbank_cache_info().currsize, 0)
+        self.assertIsNot(MelTransform(16000, 512, 40).banded_fbanks, banded)
+
+    def test_cached_matches_uncached(self):
+        get_fbanks = transform.module_fbank.get_fbanks
+        for kwargs in [
+            dict(),
+            dict(lowest_frequency=50, highest_frequency=7000),
+            dict(htk_mel=False),
+            dict(size=(2, 3)),
+            dict(highest_frequency=-1000),
+        ]:
+            with self.subTest(**kwargs):
+                cached = get_fbanks(16000, 512, 40, **kwargs)
+                uncached = transform.module_fbank._get_fbanks(
+                    16000, 512, 40,
+                    kwargs.get('lowest_frequency', 0.),
+                    kwargs.get('highest_frequency', None),
+                    kwargs.get('htk_mel', True),
+                    None,
+                    kwargs.get('size', ()),
+                )
+                tc.assert_equal(cached, uncached)
+                self.assertFalse(cached.flags.writeable)
+                self.assertIs(cached, get_fbanks(16000, 512, 40, **kwargs))
+
+    def test_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        get_fbanks = transform.module_fbank.get_fbanks
+        expected = get_fbanks(16000, 256, 20)
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(
+                lambda _: get_fbanks(16000, 256, 20), range(100)))
+        for result in results:
+            tc.assert_equal(result, expected)
+
+
+class TestWarpedFilterbanks(unittest.TestCase):
+    def setUp(self):
+        from paderbox.utils.random_utils import Uniform
+        self.warping_fns = [
+            transform.module_fbank.HzWarping(
+                warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+                boundary_frequency_ratio_sampling_fn=Uniform(
+                    low=.6, high=.7),
+                highest_frequency=8000,
+            ),
+            transform.module_fbank.MelWarping(
+                warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+                boundary_frequency_ratio_sampling_fn=Uniform(
+                    low=.6, high=.7),
+                highest_frequency=8000,
+            ),
+        ]
+
+    def test_banded_matches_dense(self):
+        from paderbox.transform.module_fbank import get_banded_fbanks
+        from paderbox.transform.module_fbank import get_fbanks
+        for warping_fn in self.warping_fns + [None]:
+            for size in [(), (5,), (2, 3)]:
+                with self.subTest(warping_fn=warping_fn, size=size):
+                    np.random.seed(1)
+                    dense = get_fbanks(
+                        16000, 512, 40, warping_fn=warping_fn, size=size)
+                    np.random.seed(1)
+                    banded = get_banded_fbanks(
+                        16000, 512, 40, warping_fn=warping_fn, size=size)
+                    tc.assert_equal(banded.shape, (*size, 257, 40))
+                    tc.assert_equal(
+                        banded.todense(), dense.swapaxes(-2, -1))
+
+    def test_normalization(self):
+        from paderbox.transform.module_fbank import get_banded_fbanks
+        banded = get_banded_fbanks(
+            16000, 512, 40, warping_fn=self.warping_fns[0], size=(4,),
+            dtype=np.float32, eps=1e-18,
+        )
+        tc.assert_equal(banded.dtype, np.float32)
+        tc.assert_allclose(banded.todense().sum(axis=-2), 1, rtol=1e-6)
+
+    def test_pool(self):
+        mel_transform = transform.module_fbank.MelTransform(
+            16000, 512, 40, warping_fn=self.warping_fns[0],
+            banded=True, warp_pool_size=8, log=False,
+        )
+        x = np.random.uniform(size=(20, 1, 30, 257))
+        y = mel_transform(x)
+        pool = mel_transform.warped_fbank_pool.todense()
+        tc.assert_equal(pool.shape, (8, 257, 40))
+        for b in range(20):
+            candidates = x[b] @ pool  # (8, 30, 40)
+            errors = np.abs(candidates - y[b]).max(axis=(-2, -1))
+            tc.assert_array_less(np.min(errors), 1e-10)
+        with self.assertRaises(ValueError):
+            transform.module_fbank.MelTransform(16000, 512, 40,
+                                                warp_pool_size=8)
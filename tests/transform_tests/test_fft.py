@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import paderbox.testing as tc
+import paderbox.transform as transform
+from paderbox.transform.module_fft import FFTBackend
+from paderbox.transform.module_fft import NumpyFFTBackend
+from paderbox.transform.module_fft import fft_backend
+from paderbox.transform.module_fft import get_fft_backend
+from paderbox.transform.module_fft import register_fft_backend
+
+
+def available_backends():
+    backends = ['default', 'numpy', 'scipy']
+    try:
+        import pyfftw  # noqa
+        backends.append('pyfftw')
+    except ImportError:
+        pass
+    return backends
+
+
+class TestFFTBackend(unittest.TestCase):
+    def test_backends_agree(self):
+        x = np.random.normal(size=(2, 8001))
+        X = transform.stft(x, 512, 128)
+        x_hat = transform.istft(X, 512, 128, num_samples=8001)
+        for name in available_backends():
+            for dtype, rtol in [(None, 1e-10), (np.float32, 1e-4)]:
+                with self.subTest(backend=name, dtype=dtype):
+                    with fft_backend(name):
+                        X_backend = transform.stft(x, 512, 128, dtype=dtype)
+                        x_hat_backend = transform.istft(
+                            X_backend, 512, 128, num_samples=8001,
+                            dtype=dtype)
+                    tc.assert_equal(
+                        X_backend.dtype,
+                        np.complex64 if dtype else np.complex128)
+                    tc.assert_allclose(X_backend, X, rtol=rtol, atol=rtol)
+                    tc.assert_allclose(
+                        x_hat_backend, x_hat, rtol=rtol, atol=rtol)
+
+    def test_default_is_numpy(self):
+        x = np.random.normal(size=(2, 8001))
+        X = transform.stft(x, 512, 128)
+        with fft_backend('numpy'):
+            tc.assert_equal(transform.stft(x, 512, 128), X)
+
+    def test_mfcc(self):
+        x = np.random.normal(size=8000)
+        feat = transform.mfcc(x)
+        for name in available_backends():
+            with self.subTest(backend=name):
+                with fft_backend(name):
+                    tc.assert_allclose(transform.mfcc(x), feat, atol=1e-8)
+
+    def test_context_and_environment(self):
+        default = get_fft_backend()
+        with mock.patch.dict(os.environ, {'PADERBOX_FFT_BACKEND': 'scipy'}):
+            tc.assert_equal(get_fft_backend().name, 'scipy')
+            with fft_backend('numpy'):
+                tc.assert_equal(get_fft_backend().name, 'numpy')
+            tc.assert_equal(get_fft_backend().name, 'scipy')
+        tc.assert_equal(get_fft_backend(), default)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_fft_backend('unknown')
+        with self.assertRaises(ValueError):
+            with fft_backend('unknown'):
+                pass
+
+    def test_register(self):
+        calls = []
+
+        class CountingBackend(NumpyFFTBackend):
+            name = 'counting'
+
+            def rfft(self, x, n=None, axis=-1, workers=None):
+                calls.append(n)
+                return super().rfft(x, n=n, axis=axis, workers=workers)
+
+        register_fft_backend('counting', CountingBackend)
+        with fft_backend('counting') as backend:
+            assert isinstance(backend, FFTBackend), backend
+            transform.stft(np.random.normal(size=1000), 256, 64)
+        tc.assert_equal(calls, [256])
+
+
+class TestPyFFTWBackend(unittest.TestCase):
+    def setUp(self):
+        try:
+            import pyfftw  # noqa
+        except ImportError:
+            raise unittest.SkipTest('pyfftw is not installed')
+
+    def test_wisdom_roundtrip(self):
+        from paderbox.transform.module_fft import PyFFTWBackend
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            wisdom_file = Path(tmp_dir) / 'wisdom.pkl'
+            backend = PyFFTWBackend(wisdom_file=wisdom_file)
+            backend.rfft(np.random.normal(size=(4, 512)))
+            backend.save_wisdom()
+            assert wisdom_file.exists(), wisdom_file
+            PyFFTWBackend(wisdom_file=wisdom_file)
@@ -1,11 +1,15 @@
 import unittest
 
+import numpy as np
+import scipy.signal
+
 from paderbox.io import load_audio
 # from scipy import signal
 
 import paderbox.testing as tc
 from paderbox.testing.testfile_fetcher import get_file_path
 import paderbox.transform as transform
+from paderbox.transform.module_filter import median
 # from pymatbridge import Matlab
 
 
@@ -43,3 +47,33 @@ class TestSTFTMethods(unittest.TestCase):
         y_both = transform.preemphasis_with_offset_compensation(y)
 
         tc.assert_almost_equal(y_ref, y_both)
+
+
+class TestMedianFilter(unittest.TestCase):
+    def test_medfilt(self):
+        rng = np.random.RandomState(0)
+        for dtype in [np.float64, np.float32, np.int64]:
+            for size in [1, 2, 50, 301]:
+                for window_size in [1, 3, 7, 51]:
+                    x = (rng.normal(size=size) * 5).astype(dtype)
+                    y = median(x, window_size)
+                    tc.assert_equal(y.dtype, dtype)
+                    tc.assert_equal(y, scipy.signal.medfilt(x, window_size))
+
+    def test_axis(self):
+        x = np.random.normal(size=(3, 40))
+        tc.assert_equal(
+            median(x, 5, axis=0),
+            np.stack([scipy.signal.medfilt(c, 5) for c in x.T], axis=-1),
+        )
+        tc.assert_equal(
+            median(x, 5, axis=-1),
+            np.stack([scipy.signal.medfilt(c, 5) for c in x]),
+        )
+        # Without axis, a multidimensional kernel is used.
+        tc.assert_equal(median(x, 3), scipy.signal.medfilt(x, 3))
+
+    def test_nan(self):
+        x = np.arange(20.)
+        x[[3, 7, 8]] = np.nan
+        tc.assert_equal(median(x, 3), scipy.signal.medfilt(x, 3))
@@ -19,3 +19,28 @@ class TestSTFTMethods(unittest.TestCase):
 
         tc.assert_equal(y_filtered.shape, (291, 13))
         tc.assert_isreal(y_filtered)
+
+
+class TestDCT(unittest.TestCase):
+    def test_mfcc_uses_backend_dct(self):
+        import numpy as np
+        import scipy.fftpack
+        from paderbox.transform.module_fft import fft_backend
+        from paderbox.transform.module_fft import ScipyFFTBackend
+        from paderbox.transform.module_mfcc import _lifter
+
+        class Backend(ScipyFFTBackend):
+            calls = 0
+
+            def dct(self, *args, **kwargs):
+                Backend.calls += 1
+                return super().dct(*args, **kwargs)
+
+        x = np.random.normal(size=(2, 8000))
+        feat = transform.logfbank(x, number_of_filters=26)
+        expected = _lifter(scipy.fftpack.dct(
+            feat, type=2, axis=-1, norm='ortho')[..., :13], 22)
+        tc.assert_equal(transform.mfcc(x), expected)
+        with fft_backend(Backend()):
+            transform.mfcc(x)
+        tc.assert_equal(Backend.calls, 1)
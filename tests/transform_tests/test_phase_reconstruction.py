@@ -0,0 +1,156 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform.module_phase_reconstruction import batch_griffin_lim
+from paderbox.transform.module_phase_reconstruction import fast_griffin_lim
+from paderbox.transform.module_stft import STFT
+
+
+def zero_phase(low, high, size):
+    return np.zeros(size)
+
+
+class TestBatchGriffinLim(unittest.TestCase):
+    def setUp(self):
+        self.stft = STFT(128, 512, fading='full')
+        self.x = [
+            np.abs(self.stft(np.random.normal(size=shape)))
+            for shape in [(4000,), (2500,), (3333,)]
+        ]
+
+    @mock.patch('numpy.random.uniform', zero_phase)
+    def test_matches_fast_griffin_lim(self):
+        audio, iterations, sc = batch_griffin_lim(
+            self.x, self.stft, iterations=10)
+        tc.assert_equal(iterations, [10, 10, 10])
+        for x, a in zip(self.x, audio):
+            expected = fast_griffin_lim(x, self.stft, iterations=10)
+            tc.assert_equal(a.shape, expected.shape)
+            tc.assert_allclose(a, expected, rtol=1e-7, atol=1e-7)
+
+    @mock.patch('numpy.random.uniform', zero_phase)
+    def test_items_are_independent(self):
+        audio, _, sc = batch_griffin_lim(self.x, self.stft, iterations=10)
+        for x, a, s in zip(self.x, audio, sc):
+            a_single, _, s_single = batch_griffin_lim(
+                [x], self.stft, iterations=10)
+            tc.assert_allclose(a, a_single[0], rtol=1e-7, atol=1e-7)
+            tc.assert_allclose(s, s_single[0], rtol=1e-7)
+
+    @mock.patch('numpy.random.uniform', zero_phase)
+    def test_padded_batch(self):
+        frames = np.array([x.shape[-2] for x in self.x])
+        padded = np.zeros((3, max(frames), 257))
+        for b, x in enumerate(self.x):
+            padded[b, :frames[b]] = x
+        audio, _, _ = batch_griffin_lim(self.x, self.stft, iterations=5)
+        audio_padded, _, _ = batch_griffin_lim(
+            padded, self.stft, frames=frames, iterations=5)
+        tc.assert_equal(
+            audio_padded.shape, (3, self.stft.frames_to_samples(frames[0])))
+        for b, a in enumerate(audio):
+            tc.assert_allclose(audio_padded[b, :a.shape[-1]], a, atol=1e-10)
+            tc.assert_equal(audio_padded[b, a.shape[-1]:], 0)
+
+    def test_early_stopping(self):
+        audio, iterations, sc = batch_griffin_lim(
+            self.x, self.stft, iterations=300, tol=0.1)
+        tc.assert_array_less(sc, 0.1)
+        tc.assert_array_less(iterations, 300)
+        tc.assert_equal(
+            [a.shape for a in audio],
+            [(self.stft.frames_to_samples(x.shape[-2]),) for x in self.x],
+        )
+
+    def test_multichannel(self):
+        x = np.abs(self.stft(np.random.normal(size=(2, 4000))))
+        audio, iterations, sc = batch_griffin_lim(
+            [x, x[:, :20]], self.stft, iterations=3)
+        tc.assert_equal(
+            audio[0].shape, (2, self.stft.frames_to_samples(x.shape[-2])))
+        tc.assert_equal(audio[1].shape[0], 2)
+        tc.assert_equal(sc.shape, (2,))
+
+
+class TestRTISILA(unittest.TestCase):
+    def setUp(self):
+        from paderbox.transform.module_phase_reconstruction import RTISILA
+        self.RTISILA = RTISILA
+        self.stft = STFT(128, 512, fading='full')
+        t = np.arange(8000) / 16000
+        self.signal = (
+            np.sin(2 * np.pi * 440 * t) * np.sin(2 * np.pi * 3 * t)
+            + 0.5 * np.sin(2 * np.pi * 1234 * t ** 2)
+        )
+        self.x = np.abs(self.stft(self.signal))
+
+    def spectral_convergence(self, audio):
+        return (
+            np.linalg.norm(np.abs(self.stft(audio)) - self.x)
+            / np.linalg.norm(self.x)
+        )
+
+    def reconstruct(self, x, blocks, **kwargs):
+        rtisi = self.RTISILA(self.stft, **kwargs)
+        signal = [rtisi(x_) for x_ in np.split(x, blocks, axis=-2)]
+        signal.append(rtisi.flush())
+        return np.concatenate(signal, axis=-1)
+
+    def test_block_invariance(self):
+        expected = self.reconstruct(self.x, [])
+        tc.assert_equal(
+            expected.shape, (self.stft.frames_to_samples(self.x.shape[-2]),))
+        for blocks in [[1, 2, 3], [10, 20], list(range(1, 66))]:
+            tc.assert_equal(self.reconstruct(self.x, blocks), expected)
+
+    def test_delay(self):
+        look_ahead = 3
+        rtisi = self.RTISILA(self.stft, look_ahead=look_ahead)
+        skip = self.stft.window_length - self.stft.shift
+        for frames in range(1, 20):
+            samples = rtisi(self.x[frames - 1:frames]).shape[-1]
+            expected = np.clip(
+                (frames - look_ahead) * self.stft.shift - skip,
+                0, self.stft.shift,
+            )
+            tc.assert_equal(samples, expected)
+
+    def test_quality(self):
+        sc_initial = self.spectral_convergence(
+            self.reconstruct(self.x, [], look_ahead=0, iterations=0))
+        sc = self.spectral_convergence(
+            self.reconstruct(self.x, [], look_ahead=3, iterations=8))
+        tc.assert_array_less(sc, sc_initial / 4)
+        tc.assert_array_less(sc, 0.1)
+
+    def test_multichannel(self):
+        x = np.stack([self.x, self.x[:, ::-1]])
+        audio = self.reconstruct(x, [5])
+        tc.assert_equal(audio.shape, (2, 8064))
+        tc.assert_allclose(audio[0], self.reconstruct(self.x, []), atol=1e-10)
+
+    def test_reset(self):
+        rtisi = self.RTISILA(self.stft)
+        first = np.concatenate([rtisi(self.x), rtisi.flush()])
+        second = np.concatenate([rtisi(self.x), rtisi.flush()])
+        tc.assert_equal(first, second)
+
+    def test_synthesis_once_per_estimate(self):
+        # The synthesized frames are reused for the commit and the
+        # initialization of the next frame.
+        iterations = 3
+        rtisi = self.RTISILA(self.stft, iterations=iterations)
+        synthesize = rtisi._synthesize
+        calls = []
+
+        def counting_synthesize(stft_signal):
+            calls.append(stft_signal.shape[-2])
+            return synthesize(stft_signal)
+
+        rtisi._synthesize = counting_synthesize
+        rtisi(self.x)
+        rtisi.flush()
+        tc.assert_equal(len(calls), self.x.shape[-2] * (iterations + 1))
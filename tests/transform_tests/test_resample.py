@@ -0,0 +1,136 @@
+import unittest
+
+import numpy as np
+import scipy.signal
+
+import paderbox.testing as tc
+from paderbox.transform.module_resample import StreamingResampler
+from paderbox.transform.module_resample import resample_polyphase
+from paderbox.transform.module_resample import _get_polyphase_filter
+
+
+class TestResamplePolyphase(unittest.TestCase):
+    def test_sox_reference(self):
+        # Reference values from the doctest of resample_sox (SoX v14.4.2).
+        # SoX uses a longer filter, hence the values are only close. The
+        # deviation of the polyphase filter is approximately 2e-3.
+        signal = np.array([1, -1, 1, -1], dtype=np.float32)
+        tc.assert_allclose(
+            resample_polyphase(signal, in_rate=2, out_rate=1),
+            np.array([0.28615332, -0.13513082], dtype=np.float32),
+            atol=3e-3,
+        )
+        tc.assert_equal(
+            resample_polyphase(signal, in_rate=1, out_rate=1), signal)
+
+    def test_sine(self):
+        # A sine far below the Nyquist frequency is resampled nearly
+        # perfectly (apart from the borders).
+        for in_rate, out_rate in [(16000, 8000), (8000, 16000),
+                                  (44100, 16000), (16000, 48000)]:
+            with self.subTest(in_rate=in_rate, out_rate=out_rate):
+                t_in = np.arange(in_rate) / in_rate
+                t_out = np.arange(out_rate) / out_rate
+                signal = np.sin(2 * np.pi * 1000 * t_in)
+                resampled = resample_polyphase(
+                    signal, in_rate=in_rate, out_rate=out_rate)
+                tc.assert_equal(resampled.shape, (out_rate,))
+                border = out_rate // 100
+                tc.assert_allclose(
+                    resampled[border:-border],
+                    np.sin(2 * np.pi * 1000 * t_out)[border:-border],
+                    atol=1e-2,
+                )
+
+    def test_scipy_resample_poly(self):
+        signal = np.random.normal(size=(3, 2, 1001))
+        for up, down in [(1, 2), (2, 1), (160, 441), (3, 2)]:
+            with self.subTest(up=up, down=down):
+                tc.assert_allclose(
+                    resample_polyphase(signal, in_rate=down, out_rate=up),
+                    scipy.signal.resample_poly(signal, up, down, axis=-1),
+                    atol=1e-12,
+                )
+
+    def test_multichannel_and_axis(self):
+        signal = np.random.normal(size=(4, 3, 500)).astype(np.float32)
+        resampled = resample_polyphase(signal, in_rate=3, out_rate=2)
+        tc.assert_equal(resampled.shape, (4, 3, 334))
+        tc.assert_equal(resampled.dtype, np.float32)
+        for index in np.ndindex(4, 3):
+            tc.assert_allclose(
+                resample_polyphase(signal[index], in_rate=3, out_rate=2),
+                resampled[index], rtol=1e-6,
+            )
+        tc.assert_allclose(
+            resample_polyphase(
+                signal.swapaxes(-1, 0), in_rate=3, out_rate=2, axis=0
+            ).swapaxes(-1, 0),
+            resampled, rtol=1e-6,
+        )
+
+    def test_filter_cache(self):
+        _get_polyphase_filter.cache_clear()
+        signal = np.random.normal(size=100)
+        resample_polyphase(signal, in_rate=16000, out_rate=8000)
+        resample_polyphase(signal, in_rate=32000, out_rate=16000)
+        tc.assert_equal(_get_polyphase_filter.cache_info().hits, 1)
+        h, _ = _get_polyphase_filter(1, 2)
+        assert not h.flags.writeable
+
+    def test_invalid_rates(self):
+        with self.assertRaises(ValueError):
+            resample_polyphase(np.zeros(10), in_rate=16000.5, out_rate=8000)
+        with self.assertRaises(ValueError):
+            resample_polyphase(np.zeros(10), in_rate=0, out_rate=8000)
+
+
+class TestStreamingResampler(unittest.TestCase):
+    def check(self, signal, in_rate, out_rate, boundaries):
+        resampler = StreamingResampler(in_rate, out_rate)
+        resampled = [
+            resampler(chunk)
+            for chunk in np.split(signal, boundaries, axis=-1)
+        ]
+        resampled.append(resampler.flush())
+        tc.assert_equal(
+            np.concatenate(resampled, axis=-1),
+            resample_polyphase(signal, in_rate=in_rate, out_rate=out_rate),
+        )
+
+    def test_bit_exact(self):
+        rng = np.random.RandomState(0)
+        for in_rate, out_rate in [(16000, 8000), (8000, 16000),
+                                  (44100, 16000), (3, 2), (16000, 16000)]:
+            for dtype in [np.float64, np.float32]:
+                with self.subTest(
+                        in_rate=in_rate, out_rate=out_rate, dtype=dtype):
+                    signal = rng.normal(size=(2, 3001)).astype(dtype)
+                    self.check(signal, in_rate, out_rate, [1, 2, 500, 501])
+                    self.check(signal, in_rate, out_rate, [])
+                    self.check(
+                        signal, in_rate, out_rate,
+                        np.sort(rng.randint(0, 3001, size=20)),
+                    )
+
+    def test_short_signal(self):
+        signal = np.random.normal(size=5)
+        self.check(signal, 16000, 8000, [1, 1, 3])
+        self.check(signal[:0], 16000, 8000, [])
+
+    def test_state_is_bounded(self):
+        resampler = StreamingResampler(16000, 8000)
+        for _ in range(100):
+            resampler(np.random.normal(size=(2, 160)))
+        assert resampler._buffer.shape[-1] <= 160 + 44, resampler._buffer.shape
+
+    def test_reset(self):
+        signal = np.random.normal(size=(2, 1000))
+        resampler = StreamingResampler(16000, 8000)
+        resampler(np.random.normal(size=(2, 100)))
+        resampler.reset()
+        resampled = [resampler(signal), resampler.flush()]
+        tc.assert_equal(
+            np.concatenate(resampled, axis=-1),
+            resample_polyphase(signal, in_rate=16000, out_rate=8000),
+        )
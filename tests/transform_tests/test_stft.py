@@ -371,3 +371,507 @@ class TestSTFTModule(unittest.TestCase):
 
     def test_against_scipy_with_fixed_parameters(self):
         pass
+
+
+class TestStreamingSTFT(unittest.TestCase):
+    def check_streaming_stft(self, x, chunk_sizes, **kwargs):
+        from paderbox.transform.module_stft import STFT, StreamingSTFT
+        X = STFT(**kwargs)(x)
+
+        streaming_stft = StreamingSTFT(**kwargs)
+        boundaries = np.cumsum(chunk_sizes)
+        boundaries = boundaries[boundaries < x.shape[-1]]
+        frames = [
+            streaming_stft(chunk)
+            for chunk in np.split(x, boundaries, axis=-1)
+        ]
+        frames.append(streaming_stft.flush())
+
+        # Bit-exact and each frame is emitted as early as possible
+        tc.assert_equal(np.concatenate(frames, axis=-2), X)
+        for chunk_frames in frames[:-1]:
+            assert chunk_frames.shape[-2] <= max(chunk_sizes) // kwargs['shift'] + 1
+
+    def test_streaming_stft(self):
+        x = np.random.normal(size=(2, 3, 4001))
+        for fading in [False, 'full', 'half']:
+            for pad in [True, False]:
+                for chunk_sizes in [[160], [1], [37, 1000, 3]]:
+                    self.check_streaming_stft(
+                        x, chunk_sizes * x.shape[-1], shift=160, size=512,
+                        window_length=400, fading=fading, pad=pad,
+                    )
+
+    def test_streaming_stft_shift_larger_than_window(self):
+        x = np.random.normal(size=(2, 400))
+        for fading in [False, None, 'full', 'half']:
+            for pad in [True, False]:
+                for chunk_sizes in [[400], [1], [7], [61, 3]]:
+                    self.check_streaming_stft(
+                        x, chunk_sizes * x.shape[-1], shift=60, size=64,
+                        window_length=50, fading=fading, pad=pad,
+                    )
+
+    def test_streaming_stft_short_signal(self):
+        x = np.random.normal(size=100)
+        for fading in [False, 'full', 'half']:
+            self.check_streaming_stft(
+                x, [7] * 100, shift=160, size=512, fading=fading,
+            )
+
+    def test_streaming_stft_flush_without_input(self):
+        from paderbox.transform.module_stft import StreamingSTFT
+        streaming_stft = StreamingSTFT(shift=64, size=256)
+        tc.assert_equal(streaming_stft.flush().shape, (0, 129))
+
+    def test_streaming_stft_reset(self):
+        from paderbox.transform.module_stft import STFT, StreamingSTFT
+        streaming_stft = StreamingSTFT(shift=64, size=256, fading=False)
+        x = np.random.normal(size=1000)
+        _ = streaming_stft(x[:500]), streaming_stft.flush()
+        X = np.concatenate([streaming_stft(x), streaming_stft.flush()])
+        tc.assert_equal(X, STFT(shift=64, size=256, fading=False)(x))
+
+
+class TestStreamingISTFT(unittest.TestCase):
+    def test_streaming_istft(self):
+        from paderbox.transform.module_stft import STFT, StreamingISTFT
+        x = np.random.normal(size=(2, 3, 4001))
+        for fading in [False, 'full', 'half']:
+            for window_length, shift in [(400, 160), (512, 128), (151, 50)]:
+                kwargs = dict(
+                    shift=shift, size=512, window_length=window_length,
+                    fading=fading,
+                )
+                stft = STFT(**kwargs)
+                X = stft(x)
+                streaming_istft = StreamingISTFT(**kwargs)
+                for blocks in [[1], [3, 1, 10]]:
+                    boundaries = np.cumsum(blocks * X.shape[-2])
+                    boundaries = boundaries[boundaries < X.shape[-2]]
+                    signal = []
+                    for X_ in np.split(X, boundaries, axis=-2):
+                        signal.append(streaming_istft(X_))
+                        # All samples of the frames except the overlap
+                        assert signal[-1].shape[-1] <= X_.shape[-2] * shift
+                        # Only the overlap is kept as state
+                        assert streaming_istft._tail.shape[-1] == window_length - shift
+                    signal.append(streaming_istft.flush())
+                    tc.assert_equal(
+                        np.concatenate(signal, axis=-1), stft.inverse(X))
+
+
+class TestOverlapAdd(unittest.TestCase):
+    def test_overlap_add_equals_add_at(self):
+        from paderbox.transform.module_stft import _overlap_add
+        from paderbox.transform.module_stft import _overlap_add_unbuffered
+        for window_length, shift in [
+            (1024, 256), (400, 160), (151, 50), (64, 1), (64, 64), (32, 40),
+        ]:
+            for frames in [0, 1, 2, 3, 100]:
+                x = np.random.normal(size=(2, 3, frames, window_length))
+                shape = (2, 3, max(frames - 1, 0) * shift + window_length)
+                if frames == 0:
+                    if shift > window_length:
+                        continue
+                    shape = (2, 3, window_length - shift)
+                actual = np.zeros(shape)
+                desired = np.zeros(shape)
+                _overlap_add(actual, x, shift)
+                _overlap_add_unbuffered(desired, x, shift)
+                # Bit-exact, not only close
+                tc.assert_equal(actual, desired)
+
+
+class TestBlockedSTFT(unittest.TestCase):
+    def test_block_frames(self):
+        x = np.random.normal(size=(2, 3, 4001))
+        for axis, x_ in [(-1, x), (0, np.moveaxis(x, -1, 0)),
+                         (1, np.moveaxis(x, -1, 1))]:
+            for fading in [False, 'full']:
+                for pad in [False, True]:
+                    X = stft(x_, 512, 160, window_length=400, axis=axis,
+                             fading=fading, pad=pad)
+                    for block_frames in [1, 7, 1000]:
+                        X_blocked = stft(
+                            x_, 512, 160, window_length=400, axis=axis,
+                            fading=fading, pad=pad, block_frames=block_frames,
+                        )
+                        tc.assert_equal(X_blocked, X)
+
+    def test_out(self):
+        x = np.random.normal(size=(2, 4001))
+        X = stft(x, 512, 160)
+        out = np.zeros_like(X)
+        tc.assert_equal(stft(x, 512, 160, out=out, block_frames=3), X)
+        tc.assert_equal(out, X)
+
+        with self.assertRaisesRegex(ValueError, 'does not match the shape'):
+            stft(x, 512, 160, out=out[:, 1:])
+
+
+class TestSinglePrecision(unittest.TestCase):
+    def test_stft_istft_float32(self):
+        x = np.random.normal(size=(2, 4001)).astype(np.float32)
+        for dtype in [np.float32, np.complex64, 'float32']:
+            X = stft(x, 512, 160, window_length=400, dtype=dtype)
+            tc.assert_equal(X.dtype, np.complex64)
+            tc.assert_allclose(
+                X, stft(x, 512, 160, window_length=400),
+                rtol=1e-4, atol=1e-4,
+            )
+            x_hat = istft(X, 512, 160, window_length=400, dtype=dtype,
+                          num_samples=x.shape[-1])
+            tc.assert_equal(x_hat.dtype, np.float32)
+            tc.assert_allclose(x_hat, x, rtol=1e-4, atol=1e-4)
+
+    def test_no_dtype_keeps_signal(self):
+        import warnings
+        x = np.random.normal(size=(2, 4001)).astype(np.float32)
+        tc.assert_equal(stft(x, 512, 160), stft(x.astype(np.float64), 512, 160))
+        z = x + 1j * x
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            stft(z, 512, 160)
+        assert any(
+            issubclass(w.category, np.ComplexWarning) for w in caught
+        ), caught
+        with self.assertRaises(TypeError):
+            stft(z, 512, 160, dtype=np.float32)
+
+    def test_blocked_stft_float32(self):
+        x = np.random.normal(size=(2, 4001)).astype(np.float32)
+        X = stft(x, 512, 160, dtype=np.float32)
+        tc.assert_equal(stft(x, 512, 160, dtype=np.float32, block_frames=3), X)
+
+    def test_default_is_double_precision(self):
+        x = np.random.normal(size=(2, 4001)).astype(np.float32)
+        X = stft(x, 512, 160)
+        tc.assert_equal(X.dtype, np.complex128)
+        tc.assert_equal(istft(X, 512, 160).dtype, np.float64)
+
+    def test_spectrogram_float32(self):
+        from paderbox.transform.module_stft import spectrogram
+        x = np.random.normal(size=4001).astype(np.float32)
+        tc.assert_equal(
+            spectrogram(x, 512, 160, dtype=np.float32).dtype, np.float32)
+
+    def test_invalid_dtype(self):
+        with self.assertRaises(TypeError):
+            stft(np.zeros(1000), 512, 160, dtype=np.float16)
+
+
+class TestSTFTPlan(unittest.TestCase):
+    def test_plan_is_cached_and_read_only(self):
+        from paderbox.transform.module_stft import _get_stft_plan
+        from paderbox.transform.module_stft import _get_window
+        plan = _get_stft_plan('hann', 400, 160)
+        assert plan is _get_stft_plan('hann', 400, 160)
+        assert plan is not _get_stft_plan('hann', 400, 160, dtype=np.float32)
+        assert plan is not _get_stft_plan('hann', 400, 100)
+
+        tc.assert_equal(plan.window, _get_window('hann', False, 400))
+        tc.assert_equal(
+            plan.synthesis_window,
+            _biorthogonal_window_fastest(_get_window('hann', False, 400), 160)
+        )
+        for array in [plan.window, plan.synthesis_window]:
+            with self.assertRaises(ValueError):
+                array[0] = 1
+
+    def test_stft_uses_plan(self):
+        from paderbox.transform.module_stft import STFT, _get_stft_plan
+        stft_ = STFT(160, 512, window_length=400, window='hann')
+        assert stft_._plan is _get_stft_plan('hann', 400, 160)
+
+        x = np.random.normal(size=4000)
+        X = stft_(x)
+        # The cached windows are not modified by the transforms
+        tc.assert_equal(stft_(x), X)
+        tc.assert_equal(stft_.inverse(X), stft_.inverse(X))
+
+    def test_unhashable_window(self):
+        from paderbox.transform.module_stft import _get_stft_plan
+
+        class Window:
+            __hash__ = None
+
+            def __call__(self, window_length):
+                return signal.windows.hann(window_length)
+
+        x = np.random.normal(size=4000)
+        plan = _get_stft_plan(Window(), 400, 160)
+        tc.assert_equal(plan.window, _get_stft_plan('hann', 400, 160).window)
+        tc.assert_equal(
+            stft(x, 512, 160, window_length=400, window=Window()),
+            stft(x, 512, 160, window_length=400, window='hann'),
+        )
+
+    def test_forward_does_not_compute_synthesis_window(self):
+        import warnings
+        from paderbox.transform.module_stft import STFT, _get_stft_plan
+        # The biorthogonal window of hann with shift == window_length
+        # divides by zero, but the forward transform does not need it.
+        x = np.random.normal(size=4000)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            stft(x, 512, 512, window='hann', dtype=np.float32)
+            STFT(512, 512, window='hann', dtype=np.float32)(x)
+        plan = _get_stft_plan('hann', 512, 512, dtype=np.float32)
+        assert 'synthesis_window' not in vars(plan)
+
+    def test_plan_carries_pad_widths_and_mapping(self):
+        from paderbox.transform.module_stft import _get_stft_plan
+        plan = _get_stft_plan('hann', 400, 160)
+        assert plan.fading_pad_widths['full'] == (240, 240)
+        assert plan.fading_pad_widths['half'] == (120, 120)
+        assert plan.fading_pad_widths[False] == (0, 0)
+        with self.assertRaises(TypeError):
+            plan.fading_pad_widths['full'] = (0, 0)
+        with self.assertRaises(AssertionError):
+            plan.fading_pad_width('quarter')
+
+        stft(np.random.normal(size=(2, 4000)), 512, 160, window_length=400,
+             window='hann')
+        assert plan.einsum_mappings[3, 1] == 'abc,c->abc'
+        assert plan.einsum_mapping(3, 1) is plan.einsum_mappings[3, 1]
+
+
+class TestSTFTBatch(unittest.TestCase):
+    def test_stft_batch_equals_stft(self):
+        from paderbox.transform.module_stft import STFT, stft_batch
+        signals = [
+            np.random.normal(size=(3, n)) for n in [100, 400, 401, 4001, 333]
+        ]
+        for fading in [False, 'full', 'half']:
+            for pad in [True, False]:
+                stft_ = STFT(160, 512, window_length=400, fading=fading,
+                             pad=pad)
+                # Signals shorter than the window have no frame without
+                # padding.
+                X, frames = stft_.batch(signals)
+                X_list = stft_.batch(signals, return_list=True)
+                for b, signal_ in enumerate(signals):
+                    X_ref = stft_(signal_)
+                    tc.assert_equal(frames[b], X_ref.shape[-2])
+                    tc.assert_equal(X[b, :, :frames[b]], X_ref)
+                    tc.assert_equal(X[b, :, frames[b]:], 0)
+                    tc.assert_equal(X_list[b], X_ref)
+
+    def test_frames_follow_samples_to_frames(self):
+        from paderbox.transform.module_stft import STFT
+        lengths = np.array([1000, 1234, 4000, 16000])
+        signals = [np.random.normal(size=n) for n in lengths]
+        for fading in [False, 'full', 'half']:
+            for pad in [True, False]:
+                stft_ = STFT(160, 512, window_length=400, fading=fading,
+                             pad=pad)
+                _, frames = stft_.batch(signals)
+                tc.assert_equal(frames, stft_.samples_to_frames(lengths))
+
+    def test_shift_larger_than_window(self):
+        from paderbox.transform.module_stft import stft_batch
+        x = np.random.normal(size=(2, 1000))
+        signals = [x, x[:, :150], x[:, :3]]
+        for fading in [False, 'full', 'half']:
+            for pad in [True, False]:
+                X, frames = stft_batch(
+                    signals, 8, 10, window_length=8, fading=fading, pad=pad)
+                for b, signal_ in enumerate(signals):
+                    X_ref = stft(signal_, 8, 10, window_length=8,
+                                 fading=fading, pad=pad)
+                    tc.assert_equal(frames[b], X_ref.shape[-2])
+                    tc.assert_equal(X[b, :, :frames[b]], X_ref)
+
+    def test_list_is_view_into_packed_buffer(self):
+        from paderbox.transform.module_stft import stft_batch
+        signals = [np.random.normal(size=n) for n in [1000, 2000]]
+        X_list = stft_batch(signals, 512, 128, return_list=True)
+        assert X_list[0].base is not None
+        assert X_list[0].base is X_list[1].base
+
+    def test_different_leading_dimensions(self):
+        from paderbox.transform.module_stft import stft_batch
+        with self.assertRaises(ValueError):
+            stft_batch([np.zeros((2, 1000)), np.zeros((3, 1000))], 512, 128)
+
+
+class TestSTFTWorkers(unittest.TestCase):
+    def test_workers(self):
+        from paderbox.transform.module_stft import STFT
+        x = np.random.normal(size=(4, 2, 8001))
+        for dtype, rtol in [(None, 1e-10), (np.float32, 1e-4)]:
+            stft_ = STFT(160, 512, window_length=400, dtype=dtype)
+            X = stft_(x)
+            for workers in [1, 2, -1]:
+                stft_workers = STFT(160, 512, window_length=400, dtype=dtype,
+                                    workers=workers)
+                X_workers = stft_workers(x)
+                tc.assert_equal(X_workers.dtype, X.dtype)
+                tc.assert_allclose(X_workers, X, rtol=rtol, atol=rtol)
+                x_hat = stft_workers.inverse(X_workers, num_samples=8001)
+                tc.assert_equal(x_hat.dtype, stft_.inverse(X).dtype)
+                tc.assert_allclose(x_hat, x, rtol=rtol, atol=rtol)
+
+
+class TestSTFTFrameRange(unittest.TestCase):
+    def test_equal_to_slice_of_full_stft(self):
+        from paderbox.transform.module_stft import stft_frame_range
+        from paderbox.transform.module_stft import \
+            stft_frame_range_to_sample_range
+        x = np.random.normal(size=(2, 3001))
+        for fading in ['full', 'half', None]:
+            for pad in [True, False]:
+                for window_length, shift in [(512, 128), (400, 160)]:
+                    X = stft(x, 512, shift, window_length=window_length,
+                             fading=fading, pad=pad)
+                    frames = X.shape[-2]
+                    for start, stop in [
+                        (0, 1), (0, frames), (3, 7), (frames - 2, frames),
+                        (-3, None), (5, 5), (frames, frames + 3),
+                    ]:
+                        kwargs = dict(
+                            window_length=window_length, fading=fading,
+                            pad=pad,
+                        )
+                        with self.subTest(
+                                fading=fading, pad=pad, shift=shift,
+                                start=start, stop=stop):
+                            expected = X[:, start:stop]
+                            tc.assert_equal(stft_frame_range(
+                                x, start, stop, 512, shift, **kwargs,
+                            ), expected)
+
+                            sample_start, sample_stop = \
+                                stft_frame_range_to_sample_range(
+                                    start, stop, window_length, shift,
+                                    fading=fading, pad=pad, num_samples=3001,
+                                )
+                            tc.assert_equal(stft_frame_range(
+                                x[:, sample_start:sample_stop], start, stop,
+                                512, shift, **kwargs,
+                                offset=sample_start, num_samples=3001,
+                            ), expected)
+
+    def test_short_signal(self):
+        from paderbox.transform.module_stft import stft_frame_range
+        for num_samples in [0, 1, 200, 240, 399]:
+            x = np.random.normal(size=(2, num_samples))
+            for fading in ['full', 'half', None]:
+                for pad in [True, False]:
+                    with self.subTest(
+                            num_samples=num_samples, fading=fading, pad=pad):
+                        X = stft(x, 512, 160, window_length=400,
+                                 fading=fading, pad=pad)
+                        tc.assert_equal(stft_frame_range(
+                            x, 0, None, 512, 160, window_length=400,
+                            fading=fading, pad=pad,
+                        ), X)
+
+    def test_axis(self):
+        from paderbox.transform.module_stft import stft_frame_range
+        x = np.random.normal(size=(3000, 2))
+        X = stft(x, 256, 64, axis=0)
+        tc.assert_equal(
+            stft_frame_range(x, 4, 9, 256, 64, axis=0), X[4:9])
+
+    def test_missing_samples(self):
+        from paderbox.transform.module_stft import stft_frame_range
+        x = np.random.normal(size=3000)
+        with self.assertRaises(ValueError):
+            stft_frame_range(
+                x[1000:2000], 10, 20, 256, 64, offset=1000, num_samples=3000)
+
+    def test_load_audio(self):
+        import tempfile
+        from pathlib import Path
+        from paderbox.io import dump_audio
+        from paderbox.transform.module_stft import STFT
+        x = np.random.uniform(-0.5, 0.5, size=16000)
+        stft_ = STFT(160, 512, window_length=400)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / 'audio.wav'
+            dump_audio(x, file, normalize=False)
+            x = load_audio(file)
+            X = stft_(x)
+            start, stop = stft_.frame_range_to_sample_range(
+                40, 60, num_samples=16000)
+            x_part = load_audio(file, start=start, stop=stop)
+        tc.assert_equal(stft_.frame_range(
+            x_part, 40, 60, offset=start, num_samples=16000), X[40:60])
+
+
+class TestSTFTToNpy(unittest.TestCase):
+    def test_audio_file(self):
+        import tempfile
+        from pathlib import Path
+        from paderbox.io import dump_audio
+        from paderbox.transform.module_stft import stft_to_npy
+        x = np.random.uniform(-0.5, 0.5, size=(3, 20001))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            dump_audio(x, tmp_dir / 'audio.wav', normalize=False)
+            x = load_audio(tmp_dir / 'audio.wav')
+            for fading in ['full', 'half', None]:
+                for dtype in [None, np.float32]:
+                    with self.subTest(fading=fading, dtype=dtype):
+                        X = stft_to_npy(
+                            tmp_dir / 'audio.wav', tmp_dir / 'stft.npy',
+                            512, 160, window_length=400, fading=fading,
+                            block_frames=7, dtype=dtype,
+                        )
+                        expected = stft(x, 512, 160, window_length=400,
+                                        fading=fading, dtype=dtype)
+                        tc.assert_equal(X, expected)
+                        tc.assert_equal(
+                            np.load(tmp_dir / 'stft.npy'), expected)
+            X = stft_to_npy(
+                tmp_dir / 'audio.wav', tmp_dir / 'stft.npy', 512, 160,
+                channel=1,
+            )
+            tc.assert_equal(X, stft(x[1], 512, 160))
+
+    def test_short_signal(self):
+        import tempfile
+        from pathlib import Path
+        from paderbox.transform.module_stft import stft_to_npy
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for num_samples in [0, 200, 399]:
+                x = np.random.normal(size=(2, num_samples))
+                for fading in ['full', None]:
+                    for pad in [True, False]:
+                        with self.subTest(num_samples=num_samples,
+                                          fading=fading, pad=pad):
+                            X = stft_to_npy(
+                                x, Path(tmp_dir) / 'stft.npy', 512, 160,
+                                window_length=400, fading=fading, pad=pad,
+                            )
+                            tc.assert_equal(X, stft(
+                                x, 512, 160, window_length=400,
+                                fading=fading, pad=pad,
+                            ))
+
+    def test_bounded_reads(self):
+        import tempfile
+        from pathlib import Path
+        from paderbox.transform.module_stft import stft_to_npy
+
+        class Source:
+            def __init__(self, x):
+                self.x = x
+                self.shape = x.shape
+                self.max_read = 0
+
+            def __getitem__(self, item):
+                data = self.x[item]
+                self.max_read = max(self.max_read, data.shape[-1])
+                return data
+
+        source = Source(np.random.normal(size=100000))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            X = stft_to_npy(
+                source, Path(tmp_dir) / 'stft.npy', 512, 128,
+                block_frames=10,
+            )
+            tc.assert_equal(X, stft(source.x, 512, 128))
+        tc.assert_equal(source.max_read, 9 * 128 + 512)
@@ -18,3 +18,115 @@ class TestDTW(unittest.TestCase):
         assert_equal(path[0], res_path[0])
         assert_equal(path[1], res_path[1])
         self.assertAlmostEqual(dist_min, 0.049999999999999996)
+
+    def test_dtw_cdist_metric(self):
+        x = np.random.normal(size=(20, 3))
+        y = np.random.normal(size=(15, 3))
+        for penalty, weight in [
+            ((0, 0, 0), (1, 1, 1)),
+            ((0.1, 0, 0.1), (1, 2, 1)),
+        ]:
+            with self.subTest(penalty=penalty, weight=weight):
+                expected = dtw(
+                    x, y, lambda a, b: np.sqrt(np.sum((a - b) ** 2)),
+                    penalty=penalty, weight=weight,
+                )
+                actual = dtw(
+                    x, y, 'euclidean', penalty=penalty, weight=weight)
+                np.testing.assert_allclose(actual[0], expected[0])
+                np.testing.assert_allclose(actual[1], expected[1])
+                np.testing.assert_allclose(actual[2], expected[2])
+                assert_equal(actual[3][0], expected[3][0])
+                assert_equal(actual[3][1], expected[3][1])
+
+    def test_dtw_band(self):
+        x = np.random.normal(size=(20, 3))
+        y = np.random.normal(size=(15, 3))
+
+        full = dtw(x, y, 'euclidean')
+        wide = dtw(x, y, 'euclidean', band=20)
+        np.testing.assert_allclose(wide[2], full[2])
+
+        for band in [0, 2]:
+            dist_min, C, _, (p, q) = dtw(x, y, 'euclidean', band=band)
+            assert np.isfinite(dist_min)
+            assert dist_min >= full[0]
+            assert np.all(q - p >= -band - 5), (p, q)
+            assert np.all(q - p <= band), (p, q)
+            assert np.isinf(C[band + 6, 0])
+
+    def test_dtw_band_dist_to_cost(self):
+        x = np.random.normal(size=(20, 3))
+        y = np.random.normal(size=(15, 3))
+
+        # The cost of the distance inf is finite, but the path has to stay
+        # in the band.
+        dist_min, _, _, (p, q) = dtw(
+            x, y, 'euclidean', lambda D: np.exp(-D, out=D), band=2)
+        assert np.isfinite(dist_min)
+        assert np.all(q - p >= -7), (p, q)
+        assert np.all(q - p <= 2), (p, q)
+
+        _, _, D, _ = dtw(
+            x, y, 'euclidean', lambda D: np.exp(-D, out=D), band=2)
+        j_minus_i = np.arange(15)[None, :] - np.arange(20)[:, None]
+        outside = (j_minus_i < -7) | (j_minus_i > 2)
+        assert np.all(np.isinf(D[outside]))
+        assert np.all(np.isfinite(D[~outside]))
+
+    def test_dtw_band_matches_callable(self):
+        x = np.random.normal(size=(37, 3))
+        y = np.random.normal(size=(40, 3))
+        for band in [0, 1, 7]:
+            with self.subTest(band=band):
+                expected = dtw(
+                    x, y, lambda a, b: np.sum(np.abs(a - b)), band=band)
+                actual = dtw(x, y, 'cityblock', band=band)
+                np.testing.assert_allclose(actual[1], expected[1])
+                np.testing.assert_allclose(actual[2], expected[2])
+                assert_equal(actual[3], expected[3])
+
+    def test_accumulate_requires_c_contiguous(self):
+        from paderbox.utils.dtw import _accumulate
+        D0 = np.asfortranarray(np.zeros((3, 4)))
+        with self.assertRaises(AssertionError):
+            _accumulate(D0)
+
+    def test_weight_and_penalty_match_builtin_min(self):
+        x = np.random.normal(size=12)
+        y = np.random.normal(size=9)
+
+        def reference(penalty, weight):
+            # Accumulation with the builtin min, that ignores the NaN of
+            # 0 * inf, if it is not the first term.
+            D0 = np.zeros((13, 10))
+            D0[0, 1:], D0[1:, 0] = np.inf, np.inf
+            D0[1:, 1:] = np.abs(x[:, None] - y[None, :])
+            with np.errstate(invalid='ignore'):
+                for i in range(1, 13):
+                    for j in range(1, 10):
+                        D0[i, j] += min(
+                            weight[1] * D0[i - 1, j - 1] + penalty[1],
+                            weight[2] * D0[i - 1, j] + penalty[2],
+                            weight[0] * D0[i, j - 1] + penalty[0],
+                        )
+            return D0[1:, 1:]
+
+        for penalty, weight in [
+            ((0, 0, 0), (0, 1, 0)),  # levenshtein
+            ((1, 0, 1), (0, 1, 0)),
+            ((0.1, 0, 0.1), (1, 2, 1)),
+            ((0.5, 0, 0.5), (1, 1, 1)),
+        ]:
+            with self.subTest(penalty=penalty, weight=weight):
+                dist_min, _, D, _ = dtw(
+                    x, y, lambda a, b: abs(a - b),
+                    penalty=penalty, weight=weight,
+                )
+                expected = reference(penalty, weight)
+                assert np.isfinite(dist_min)
+                assert_equal(D, expected)
+                assert_equal(dtw(
+                    x, y, 'cityblock', penalty=penalty, weight=weight)[2],
+                    expected,
+                )
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 import paderbox.testing as tc
 from paderbox.array import morph
+from paderbox.array import compile_morph
 
 
 T, B, F = 40, 6, 50
@@ -192,3 +193,49 @@ class TestMorph(unittest.TestCase):
                 A,
                 reduce=np.sum
             ), np.sum(A, axis=-1))
+
+
+class TestMorphPlan(unittest.TestCase):
+    def test_same_as_morph(self):
+        for operation, array, shape_hints in [
+            ('T,B,F->F,B*T', A, {}),
+            ('T, 1, B, F -> T*B*F', A2, {}),
+            ('t*b*f->f, t*b', A3, dict(f=F, t=T)),
+            ('...a*b->...ab', A, dict(a=F // 2, b=2)),
+            ('T11B1F->1,F,B*T', A4, {}),
+        ]:
+            with self.subTest(operation=operation):
+                plan = compile_morph(operation, **shape_hints)
+                tc.assert_equal(
+                    plan(array), morph(operation, array, **shape_hints))
+                # Apply many
+                tc.assert_equal(plan(array * 2), 2 * plan(array))
+
+    def test_cache(self):
+        plan = compile_morph('t b f -> t b*f')
+        assert plan is compile_morph('t b f -> t b*f')
+        assert plan is not compile_morph('t b f -> t*b f')
+        assert compile_morph('t*b f -> t b f', t=T) is compile_morph(
+            't*b f -> t b f', t=T)
+        assert compile_morph('t*b f -> t b f', t=T) is not compile_morph(
+            't*b f -> t b f', b=B)
+
+    def test_ellipsis_ndim(self):
+        plan = compile_morph('...F->F...')
+        tc.assert_equal(plan(A).shape, (F, T, B))
+        tc.assert_equal(plan(A[0]).shape, (F, B))
+        tc.assert_equal(plan(A2).shape, (F, T, 1, B))
+
+    def test_view_or_copy(self):
+        _, is_view = compile_morph('T,B,F->T,B*F').apply(A)
+        assert is_view
+        _, is_view = compile_morph('T,B,F->F,T,B').apply(A)
+        assert is_view
+        _, is_view = compile_morph('T,B,F->T,F*B').apply(A)
+        assert not is_view
+        _, is_view = compile_morph('...F->...', reduce=np.mean).apply(A)
+        assert not is_view
+
+    def test_reduce(self):
+        plan = compile_morph('T,B,F->F,B', reduce=np.sum)
+        tc.assert_equal(plan(A), np.sum(A, axis=0).T)
@@ -1,9 +1,11 @@
+import tracemalloc
 import unittest
 
 import numpy as np
 from numpy.testing import assert_equal
 
 from paderbox.array.segment import segment_axis
+from paderbox.array.segment import segment_axis_parts
 
 
 class TestSegment(unittest.TestCase):
@@ -60,3 +62,59 @@ class TestSegment(unittest.TestCase):
             segment_axis(np.ones((2, 3, 4, 5, 6)), axis=2, length=3, shift=2,
                          end='pad').shape,
             (2, 3, 2, 3, 5, 6))
+
+
+class TestSegmentParts(unittest.TestCase):
+    def check(self, x, length, shift, axis=-1, end='pad',
+              pad_mode='constant', pad_width=(0, 0)):
+        parts = segment_axis_parts(
+            x, length, shift, axis=axis, end=end, pad_mode=pad_mode,
+            pad_width=pad_width,
+        )
+        npad = np.zeros((x.ndim, 2), dtype=int)
+        npad[axis] = pad_width
+        expected = segment_axis(
+            np.pad(x, npad, mode=pad_mode), length, shift, axis=axis,
+            end=end, pad_mode=pad_mode,
+        )
+        assert_equal(
+            np.concatenate(parts, axis=axis % x.ndim), expected)
+        return parts
+
+    def test_same_as_segment_axis(self):
+        x = np.random.normal(size=(2, 3, 41))
+        for length, shift in [(1, 1), (3, 1), (8, 3), (8, 8), (41, 5)]:
+            for end in ['pad', 'cut']:
+                for pad_mode in ['constant', 'edge', 'reflect', 'symmetric']:
+                    for pad_width in [(0, 0), (7, 0), (0, 7), (2, 5)]:
+                        for axis in [-1, 2]:
+                            self.check(
+                                x, length, shift, axis=axis, end=end,
+                                pad_mode=pad_mode, pad_width=pad_width)
+        for axis in [0, 1, -2]:
+            self.check(x, 2, 1, axis=axis, pad_width=(1, 1))
+
+    def test_short_signal(self):
+        for size in [0, 1, 2, 5]:
+            parts = self.check(np.arange(size), 8, 2, pad_width=(3, 3))
+            assert_equal(parts[1].shape, (0, 8))
+
+    def test_body_is_view(self):
+        x = np.random.normal(size=(2, 1001))
+        head, body, tail = self.check(x, 16, 4, pad_width=(12, 12))
+        assert np.shares_memory(body, x)
+        assert_equal(head.shape, (2, 3, 16))
+        assert_equal(tail.shape, (2, 4, 16))
+        assert_equal(body.shape, (2, 247, 16))
+
+    def test_memory_is_flat(self):
+        x = np.random.normal(size=1_000_000)
+        tracemalloc.start()
+        try:
+            segment_axis_parts(x, 400, 160, pad_width=(240, 240))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # segment_axis(np.pad(x, ...), end='pad') needs two copies of x
+        # (8 MB each).
+        assert peak < 100_000, peak
@@ -28,3 +28,93 @@ class TestUnstackContext(unittest.TestCase):
         )
 
         np.testing.assert_allclose(unstacked, A)
+
+    def test_identity_operation_step_width(self):
+        for step_width in [2, 3]:
+            with self.subTest(step_width=step_width):
+                stacked = stack_context(
+                    A, left_context=2, right_context=3, step_width=step_width)
+                unstacked = unstack_context(
+                    stacked, mode='center', left_context=2, right_context=3,
+                    step_width=step_width)
+                np.testing.assert_allclose(unstacked, A[::step_width])
+
+    def test_mean(self):
+        stacked = stack_context(A, left_context=2, right_context=3)
+        unstacked = unstack_context(
+            stacked, mode='mean', left_context=2, right_context=3)
+        np.testing.assert_allclose(unstacked, A)
+
+    def test_mean_dtype(self):
+        for dtype, expected in [
+            (np.int8, np.float64),
+            (np.float32, np.float32),
+            (np.complex64, np.complex64),
+        ]:
+            stacked = stack_context(A.real.astype(dtype), 1, 1)
+            unstacked = unstack_context(stacked, 'mean', 1, 1)
+            assert unstacked.dtype == expected, (dtype, unstacked.dtype)
+
+
+class TestStackContext(unittest.TestCase):
+    @staticmethod
+    def reference(x, left_context, right_context, step_width):
+        x = np.pad(
+            x, ((left_context, right_context), (0, 0), (0, 0)),
+            mode='symmetric')
+        window_size = left_context + right_context + 1
+        return np.stack([
+            x[t:t + window_size].transpose(1, 0, 2).reshape(x.shape[1], -1)
+            for t in range(0, x.shape[0] - window_size + 1, step_width)
+        ])
+
+    def test_values(self):
+        for left_context, right_context, step_width in [
+            (0, 0, 1), (2, 3, 1), (2, 3, 2), (1, 0, 3), (0, 4, 5),
+        ]:
+            with self.subTest(left_context=left_context,
+                              right_context=right_context,
+                              step_width=step_width):
+                np.testing.assert_equal(
+                    stack_context(A, left_context, right_context, step_width),
+                    self.reference(A, left_context, right_context, step_width)
+                )
+
+    def test_read_only_view(self):
+        stacked = stack_context(A, left_context=2, right_context=3)
+        assert not stacked.flags.writeable
+        assert stacked.base is not None
+
+        # Without context and batch major data, the input is not copied.
+        x = A.transpose(1, 0, 2).copy().transpose(1, 0, 2)
+        stacked = stack_context(x)
+        assert np.shares_memory(stacked, x)
+        np.testing.assert_equal(stacked, x)
+
+    def test_fortran_order_single_copy(self):
+        from unittest import mock
+        from paderbox.array.context import _pad_time_axis
+        x = np.asfortranarray(np.random.normal(size=(100, 1, 20)))
+        pad = np.pad
+        padded_lengths = []
+
+        def recording_pad(array, *args, **kwargs):
+            padded_lengths.append(array.shape[1])
+            return pad(array, *args, **kwargs)
+
+        for pad_mode in ['symmetric', 'constant', 'edge', 'reflect']:
+            with self.subTest(pad_mode=pad_mode):
+                with mock.patch.object(np, 'pad', recording_pad):
+                    padded = _pad_time_axis(
+                        x.transpose(1, 0, 2), 3, 2, pad_mode, {})
+                # Only the borders are padded with np.pad, that would keep
+                # the Fortran order.
+                assert padded.flags.c_contiguous
+                assert max(padded_lengths) <= 6, padded_lengths
+                np.testing.assert_equal(
+                    padded,
+                    np.pad(x.transpose(1, 0, 2), ((0, 0), (3, 2), (0, 0)),
+                           mode=pad_mode),
+                )
+        np.testing.assert_equal(
+            stack_context(x, 2, 3), self.reference(x, 2, 3, 1))
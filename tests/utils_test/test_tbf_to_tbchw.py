@@ -19,3 +19,9 @@ class TestTBFtoTBCHW(unittest.TestCase):
     def test_shape_right_context(self):
         x = tbf_to_tbchw(self.data, 0, 3, 1)
         self.assertEqual(x.shape, (30, 2, 1, 5, 4))
+
+    def test_no_context_is_writable_copy(self):
+        x = tbf_to_tbchw(self.data, 0, 0, 1)
+        self.assertEqual(x.shape, (30, 2, 1, 5, 1))
+        assert x.flags.writeable
+        assert not np.shares_memory(x, self.data)